@@ -0,0 +1,149 @@
+"""
+Import time budget check: every module is imported in a fresh interpreter with ``-X importtime``
+and without ``DATABASE_URL``/``API_DESCRIPTION`` in environment (modules must not read settings on import).
+
+Budgets are relative to import time of the `REFERENCE` stdlib module measured in the same run,
+so the check doesn't depend on machine speed. Fails if cumulative import time of a module exceeds its budget
+or if module pulls in dependencies of other extras, e.g. middleware must not import httpx.
+
+    PYTHONPATH=src python benchmarks/import_time.py [--repeat 5] [--scale 1.0] [-o import_time.json]
+    PYTHONPATH=src python -m pytest benchmarks/import_time.py  # IMPORT_TIME_SCALE=1.5 on noisy runners
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+REFERENCE = "asyncio"
+
+# cumulative import time budgets in `REFERENCE` import times, scaled with --scale on noisy runners
+BUDGETS = {
+    "fastapi_core.controllers.dependencies": 2.5,
+    "fastapi_core.controllers.healthcheck": 2.5,
+    "fastapi_core.controllers.metrics": 2.5,
+    "fastapi_core.controllers.profiler": 2.5,
+    "fastapi_core.database.sessions": 22,
+    "fastapi_core.gateways.base": 17.5,
+    "fastapi_core.gateways.clients": 17.5,
+    "fastapi_core.logging.configure": 2.5,
+    "fastapi_core.mappers.base": 25,
+    "fastapi_core.middleware.database": 17.5,
+    "fastapi_core.middleware.exceptions": 2.5,
+    "fastapi_core.middleware.logger": 3,
+    "fastapi_core.middleware.metrics": 0.5,
+    "fastapi_core.middleware.profiler": 3,
+    "fastapi_core.middleware.stack": 2.5,
+    "fastapi_core.repositories.base": 19,
+    "fastapi_core.repositories.pagination": 11,
+    "fastapi_core.schemas.base": 6,
+    "fastapi_core.services.base": 2,
+}
+
+# packages of other extras that must not be imported with module
+FORBIDDEN = {
+    "fastapi_core.controllers.healthcheck": ("sqlalchemy", "httpx", "pydantic_settings", "fastapi"),
+    "fastapi_core.controllers.metrics": ("sqlalchemy", "httpx", "pydantic_settings", "fastapi"),
+    "fastapi_core.controllers.profiler": ("sqlalchemy", "httpx", "pydantic_settings", "fastapi", "pyinstrument"),
+    "fastapi_core.controllers.dependencies": ("sqlalchemy", "httpx", "pydantic_settings", "fastapi"),
+    "fastapi_core.middleware.exceptions": ("sqlalchemy", "httpx", "pydantic_settings", "fastapi"),
+    "fastapi_core.middleware.logger": ("sqlalchemy", "httpx", "pydantic_settings", "fastapi"),
+    "fastapi_core.middleware.metrics": ("sqlalchemy", "httpx", "pydantic_settings", "fastapi"),
+    "fastapi_core.middleware.profiler": ("sqlalchemy", "httpx", "pydantic_settings", "fastapi"),
+    "fastapi_core.middleware.stack": ("sqlalchemy", "httpx", "pydantic_settings", "fastapi", "loguru", "pyinstrument"),
+    "fastapi_core.middleware.database": ("httpx", "pydantic_settings"),
+    "fastapi_core.repositories.base": ("httpx", "pydantic", "pydantic_settings", "loguru"),
+    "fastapi_core.services.base": ("sqlalchemy", "httpx", "pydantic_settings", "fastapi"),
+    "fastapi_core.gateways.base": ("sqlalchemy",),
+}
+
+SETTINGS_ENV = ("DATABASE_URL", "API_DESCRIPTION")
+
+
+def measure(module: str) -> tuple[float, set[str]]:
+    """
+    :returns: cumulative import time of `module` (ms) and top level packages imported with it
+    """
+    env = {key: value for key, value in os.environ.items() if key not in SETTINGS_ENV}
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, env=env
+    )
+    if process.returncode:
+        raise RuntimeError(f"import {module} failed:\n{process.stderr.splitlines()[-1]}")
+
+    cumulative, packages = None, set()
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:") :].split("|")
+        packages.add(name.strip().split(".")[0])
+        if name.strip() == module:
+            cumulative = int(cumulative_us) / 1000
+    return cumulative, packages
+
+
+def check(repeat: int = 5, scale: float = 1.0) -> tuple[dict, list[str]]:
+    """
+    :param repeat: imports per module, the fastest one is used
+    :param scale: budgets multiplier
+    :returns: results per module and failure messages
+    """
+    reference = min(measure(REFERENCE)[0] for _ in range(repeat))
+    print(f"{REFERENCE:<42} {reference:8.1f}ms (budget unit)")
+
+    results, failures = {}, []
+    for module, budget in BUDGETS.items():
+        try:
+            runs = [measure(module) for _ in range(repeat)]
+        except RuntimeError as e:
+            failures.append(str(e))
+            print(f"{module:<42} {'FAILED':>10}")
+            continue
+
+        elapsed = min(cumulative for cumulative, _ in runs)
+        budget_ms = budget * scale * reference
+        forbidden = sorted(runs[0][1].intersection(FORBIDDEN.get(module, ())))
+        results[module] = {
+            "ms": elapsed,
+            "relative": elapsed / reference,
+            "budget": budget * scale,
+            "forbidden_imports": forbidden,
+        }
+
+        status = ""
+        if elapsed > budget_ms:
+            status = "OVER BUDGET"
+            failures.append(
+                f"{module} import takes {elapsed / reference:.1f} x {REFERENCE} import, budget is {budget * scale:g}"
+            )
+        if forbidden:
+            status = f"IMPORTS {', '.join(forbidden)}"
+            failures.append(f"{module} imports {', '.join(forbidden)}")
+        print(f"{module:<42} {elapsed:8.1f}ms / {budget_ms:5.0f}ms {status}")
+    return results, failures
+
+
+def test_import_time():
+    _, failures = check(repeat=3, scale=float(os.environ.get("IMPORT_TIME_SCALE", 1.0)))
+    assert not failures, "\n".join(failures)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="imports per module, the fastest one is used")
+    parser.add_argument("--scale", type=float, default=1.0, help="budgets multiplier")
+    parser.add_argument("-o", "--output", help="JSON results file")
+    args = parser.parse_args()
+
+    results, failures = check(args.repeat, args.scale)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if failures:
+        print("\n".join(failures), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Core middleware stack benchmark: ``app.middleware("http")`` functions vs pure ASGI ``add_core_middleware``.
+
+All four layers are enabled (exceptions, logger context, profiler, transactions),
+requests are sent in-process via ``httpx.ASGITransport``, every request opens a database session.
+
+    python benchmarks/middleware_stack.py [--requests 2000] [--concurrency 32]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from fastapi_core.middleware.database import transactional_middleware_factory
+from fastapi_core.middleware.exceptions import json_exceptions_wrapper_middleware
+from fastapi_core.middleware.logger import logger_context_middleware
+from fastapi_core.middleware.profiler import profile_request_middleware
+from fastapi_core.middleware.stack import add_core_middleware
+
+
+def create_app(create_async_session: async_sessionmaker[AsyncSession], asgi: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/")
+    async def endpoint(request: Request):
+        await request.state.session.execute(text("SELECT 1"))
+        return {"status": "ok"}
+
+    if asgi:
+        add_core_middleware(app, create_async_session=create_async_session, profiling=True)
+    else:
+        app.middleware("http")(transactional_middleware_factory(create_async_session))
+        app.middleware("http")(profile_request_middleware)
+        app.middleware("http")(logger_context_middleware)
+        app.middleware("http")(json_exceptions_wrapper_middleware)
+
+    return app
+
+
+def with_anonymous_user(app: FastAPI):
+    # logger context middleware reads scope["user"], normally set by AuthenticationMiddleware
+    async def wrapper(scope, receive, send):
+        scope["user"] = None
+        await app(scope, receive, send)
+
+    return wrapper
+
+
+async def run(app, requests: int, concurrency: int) -> tuple[list[float], float]:
+    latencies = []
+    transport = httpx.ASGITransport(app=with_anonymous_user(app))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for _ in range(100):  # warmup
+            await client.get("/")
+
+        queue = iter(range(requests))
+
+        async def worker():
+            for _ in queue:
+                started = time.perf_counter()
+                response = await client.get("/")
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 200
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return latencies, requests / elapsed
+
+
+def percentile(values: list[float], q: float) -> float:
+    return statistics.quantiles(values, n=100)[int(q) - 1]
+
+
+async def main(requests: int, concurrency: int):
+    logger.remove()
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    create_async_session = async_sessionmaker(engine, expire_on_commit=False)
+
+    for name, asgi in (("call_next", False), ("pure ASGI", True)):
+        latencies, throughput = await run(create_app(create_async_session, asgi), requests, concurrency)
+        print(
+            f"{name:>10}: {throughput:8.1f} req/s, "
+            f"p50 {percentile(latencies, 50) * 1000:.2f}ms, p99 {percentile(latencies, 99) * 1000:.2f}ms"
+        )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,99 @@
+"""
+``BaseGateway.parse_response_as`` benchmark: ``TypeAdapter`` built per call vs shared cached adapter,
+and whole body parsing vs item by item ``BaseGateway.iter_response_as`` for large JSON arrays.
+
+    python benchmarks/parse_response.py [--calls 20000] [--items 100000]
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+
+import httpx
+from pydantic import BaseModel, TypeAdapter
+
+from fastapi_core.gateways.base import BaseGateway
+
+
+class Address(BaseModel):
+    city: str
+    street: str
+
+
+class User(BaseModel):
+    id: int
+    name: str
+    tags: list[str]
+    address: Address
+
+
+def make_response(content: bytes) -> httpx.Response:
+    return httpx.Response(200, stream=httpx.ByteStream(content), request=httpx.Request("GET", "http://test"))
+
+
+def user(i: int) -> dict:
+    return {"id": i, "name": f"user {i}", "tags": ["a", "b"], "address": {"city": "c", "street": "s"}}
+
+
+def bench_per_call(calls: int):
+    response = httpx.Response(200, content=json.dumps(user(1)).encode(), request=httpx.Request("GET", "http://test"))
+
+    started = time.perf_counter()
+    for _ in range(calls):
+        TypeAdapter(User).validate_json(response.content)
+    uncached = (time.perf_counter() - started) / calls
+
+    started = time.perf_counter()
+    for _ in range(calls):
+        BaseGateway.parse_response_as(User, response)
+    cached = (time.perf_counter() - started) / calls
+
+    print(f"per call: new TypeAdapter {uncached * 1e6:.1f}us, cached {cached * 1e6:.1f}us, x{uncached / cached:.1f}")
+
+
+async def bench_bulk(items: int):
+    content = json.dumps([user(i) for i in range(items)]).encode()
+    chunks = [content[i : i + 65536] for i in range(0, len(content), 65536)]
+
+    async def whole():
+        response = make_response(b"".join(chunks))
+        await response.aread()
+        return len(BaseGateway.parse_response_as(list[User], response))
+
+    async def streamed():
+        response = httpx.Response(200, stream=ChunksStream(chunks), request=httpx.Request("GET", "http://test"))
+        count = 0
+        async for _ in BaseGateway.iter_response_as(User, response):
+            count += 1
+        return count
+
+    for name, func in (("whole body", whole), ("streamed", streamed)):
+        started = time.perf_counter()
+        assert await func() == items
+        elapsed = time.perf_counter() - started
+
+        # memory is measured by separate run, tracing slows down allocations a lot
+        tracemalloc.start()
+        await func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:>10}: {items} items in {elapsed * 1000:.0f}ms, peak memory {peak / 2**20:.1f}MiB")
+
+
+class ChunksStream(httpx.AsyncByteStream):
+    def __init__(self, chunks: list[bytes]):
+        self.chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--items", type=int, default=100000)
+    args = parser.parse_args()
+    bench_per_call(args.calls)
+    asyncio.run(bench_bulk(args.items))
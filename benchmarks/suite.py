@@ -0,0 +1,531 @@
+"""
+Core request path benchmark suite, runs entirely in-process: ASGI apps via ``httpx.ASGITransport``,
+in-memory SQLite via aiosqlite, gateways via ``httpx.MockTransport``.
+
+Every scenario is run `--repeat` times, the fastest run is reported (the least disturbed by noise):
+throughput and latency percentiles of a single operation.
+
+    python benchmarks/suite.py run [-k mapped] [--iterations 2000] [-o results.json]
+    python benchmarks/suite.py compare baseline.json results.json [--threshold 10] [--metric ops_per_second]
+
+``compare`` exits with code 1 if any scenario is worse than baseline by more than `--threshold` percent,
+``run --baseline baseline.json`` does the same right after the run.
+"""
+import argparse
+import asyncio
+import datetime
+import fnmatch
+import json
+import platform
+import statistics
+import sys
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncContextManager, AsyncIterator, Awaitable, Callable
+
+import httpx
+from fastapi import Depends, FastAPI
+from loguru import logger
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import String, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from fastapi_core.controllers.dependencies import get_service
+from fastapi_core.database.cache import InMemoryCacheBackend, QueryCache, invalidate_tables
+from fastapi_core.gateways.base import BaseGateway, get_async_client
+from fastapi_core.gateways.cache import HTTPCache
+from fastapi_core.mappers.base import mapped, mapped_stream
+from fastapi_core.repositories.base import BaseRepository
+from fastapi_core.repositories.pagination import KeysetPagination
+from fastapi_core.services.base import BaseServiceWithSession
+from fastapi_core.services.loaders import DataLoader
+from fastapi_core.settings.database import DatabaseSettings
+from fastapi_core.settings.registry import settings_registry
+
+from middleware_stack import create_app, with_anonymous_user
+from parse_response import User as UserSchema, make_response, user
+
+Operation = Callable[[], Awaitable]
+Scenario = Callable[[], AsyncContextManager[Operation]]
+
+SCENARIOS: dict[str, Scenario] = {}
+METRICS = {
+    # metric: whether higher is better
+    "ops_per_second": True,
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+}
+
+
+def scenario(name: str) -> Callable[[Scenario], Scenario]:
+    def decorator(func: Scenario) -> Scenario:
+        SCENARIOS[name] = asynccontextmanager(func)
+        return func
+
+    return decorator
+
+
+class Base(DeclarativeBase):
+    ...
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(64))
+    description: Mapped[str] = mapped_column(String(256))
+
+
+class ItemSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+
+
+items_cache = QueryCache(InMemoryCacheBackend(maxsize=1024), ttl=300)
+
+
+class ItemRepository(BaseRepository[Item]):
+    @mapped(Item, ItemSchema)
+    def get_item(self, item_id: int):
+        return select(Item).where(Item.id == item_id)
+
+    @mapped(Item, list[ItemSchema])
+    def get_items(self, limit: int):
+        return select(Item).order_by(Item.id).limit(limit)
+
+    @mapped(Item, list[ItemSchema], projection=True)
+    def get_items_projected(self, limit: int):
+        return select(Item).order_by(Item.id).limit(limit)
+
+    @mapped(Item, list[ItemSchema])
+    def get_items_by_ids(self, item_ids: list[int]):
+        return select(Item).where(Item.id.in_(item_ids))
+
+    @mapped(Item, ItemSchema, cache=items_cache)
+    def get_cached_item(self, item_id: int):
+        return select(Item).where(Item.id == item_id)
+
+    @mapped_stream(Item, ItemSchema, chunk_size=100)
+    def stream_items(self):
+        return select(Item).order_by(Item.id)
+
+
+class ItemService(BaseServiceWithSession):
+    ...
+
+
+@asynccontextmanager
+async def database(rows: int = 0) -> AsyncIterator[async_sessionmaker[AsyncSession]]:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        if rows:
+            await connection.execute(
+                Item.__table__.insert(), [{"id": i, "name": f"item {i}", "description": "-" * 100} for i in range(rows)]
+            )
+    try:
+        yield async_sessionmaker(engine, expire_on_commit=False)
+    finally:
+        await engine.dispose()
+
+
+def asgi_client(app) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=with_anonymous_user(app)), base_url="http://test")
+
+
+def _add_middleware_stack_scenario(name: str, asgi: bool):
+    async def run() -> AsyncIterator[Operation]:
+        async with database() as create_async_session:
+            async with asgi_client(create_app(create_async_session, asgi)) as client:
+                yield lambda: client.get("/")
+
+    scenario(f"middleware_stack[{name}]")(run)
+
+
+_add_middleware_stack_scenario("call_next", asgi=False)
+_add_middleware_stack_scenario("asgi", asgi=True)
+
+
+@scenario("get_service")
+async def get_service_scenario() -> AsyncIterator[Operation]:
+    app = FastAPI()
+
+    @app.get("/")
+    async def endpoint(service: ItemService = Depends(get_service(ItemService))):
+        return {"status": "ok"}
+
+    async def with_session(scope, receive, send):
+        scope.setdefault("state", {})["session"] = None
+        await app(scope, receive, send)
+
+    async with asgi_client(with_session) as client:
+        yield lambda: client.get("/")
+
+
+@scenario("mapped[one]")
+async def mapped_one() -> AsyncIterator[Operation]:
+    async with database(rows=1000) as create_async_session:
+
+        async def operation():
+            async with create_async_session() as session:
+                await ItemRepository(session).get_item(500)
+
+        yield operation
+
+
+def _add_mapped_list_scenario(rows: int):
+    async def run() -> AsyncIterator[Operation]:
+        async with database(rows=rows) as create_async_session:
+
+            async def operation():
+                async with create_async_session() as session:
+                    assert len(await ItemRepository(session).get_items(rows)) == rows
+
+            yield operation
+
+    scenario(f"mapped[list_{rows}]")(run)
+
+
+for _rows in (10, 100, 1000):
+    _add_mapped_list_scenario(_rows)
+
+
+@scenario("mapped[projection_1000]")
+async def mapped_projection() -> AsyncIterator[Operation]:
+    async with database(rows=1000) as create_async_session:
+
+        async def operation():
+            async with create_async_session() as session:
+                assert len(await ItemRepository(session).get_items_projected(1000)) == 1000
+
+        yield operation
+
+
+def _add_mapped_cache_scenario(name: str, hit: bool):
+    async def run() -> AsyncIterator[Operation]:
+        async with database(rows=1000) as create_async_session:
+            await invalidate_tables({"items"})
+
+            async def operation():
+                if not hit:
+                    await invalidate_tables({"items"})
+                async with create_async_session() as session:
+                    await ItemRepository(session).get_cached_item(500)
+
+            yield operation
+
+    scenario(f"mapped[cache_{name}]")(run)
+
+
+_add_mapped_cache_scenario("hit", hit=True)
+_add_mapped_cache_scenario("miss", hit=False)
+
+
+@scenario("mapped_stream[1000]")
+async def mapped_stream_scenario() -> AsyncIterator[Operation]:
+    async with database(rows=1000) as create_async_session:
+
+        async def operation():
+            async with create_async_session() as session:
+                rows = 0
+                async for chunk in ItemRepository(session).stream_items():
+                    rows += len(chunk)
+                assert rows == 1000
+
+        yield operation
+
+
+def _add_related_lookup_scenario(name: str, batched: bool):
+    """
+    100 lookups by id within a request, one by one (N+1) or batched by `DataLoader`
+    """
+
+    async def run() -> AsyncIterator[Operation]:
+        item_ids = list(range(0, 1000, 10))
+        async with database(rows=1000) as create_async_session:
+
+            async def operation():
+                async with create_async_session() as session:
+                    repository = ItemRepository(session)
+                    if batched:
+
+                        async def batch_load(keys: list[int]) -> dict[int, ItemSchema]:
+                            return {item.id: item for item in await repository.get_items_by_ids(keys)}
+
+                        items = await DataLoader(batch_load).load_many(item_ids)
+                    else:
+                        items = [await repository.get_item(item_id) for item_id in item_ids]
+                    assert len(items) == 100
+
+            yield operation
+
+    scenario(name)(run)
+
+
+_add_related_lookup_scenario("lookups[one_by_one_100]", batched=False)
+_add_related_lookup_scenario("lookups[data_loader_100]", batched=True)
+
+
+@scenario("save")
+async def save() -> AsyncIterator[Operation]:
+    async with database() as create_async_session:
+        async with create_async_session() as session:
+            repository = ItemRepository(session)
+
+            async def operation():
+                await repository.save(Item(name="item", description="-"))
+
+            yield operation
+            await session.rollback()
+
+
+def _add_bulk_write_scenario(name: str, write: Callable[[ItemRepository, list[dict]], Awaitable], rows: int = 0):
+    """
+    Writes 1000 rows per operation, rolled back after each one
+    """
+
+    async def run() -> AsyncIterator[Operation]:
+        values = [{"id": i, "name": f"item {i}", "description": "-" * 100} for i in range(1000)]
+        async with database(rows=rows) as create_async_session:
+
+            async def operation():
+                async with create_async_session() as session:
+                    await write(ItemRepository(session), values)
+                    await session.rollback()
+
+            yield operation
+
+    scenario(name)(run)
+
+
+async def _add_all(repository: ItemRepository, values: list[dict]):
+    repository.session.add_all(Item(**row) for row in values)
+    await repository.session.flush()
+
+
+_add_bulk_write_scenario("bulk_write[add_all_1000]", _add_all)
+_add_bulk_write_scenario(
+    "bulk_write[insert_many_1000]", lambda repository, values: repository.insert_many(Item, values, returning=False)
+)
+_add_bulk_write_scenario(
+    "bulk_write[upsert_many_1000]",
+    lambda repository, values: repository.upsert_many(Item, values, conflict_keys=["id"], returning=False),
+    rows=1000,
+)
+
+
+@scenario("keyset_token[dumps]")
+async def keyset_token_dumps() -> AsyncIterator[Operation]:
+    pagination = KeysetPagination(Item.name.desc(), Item.id, secret="secret")
+    item = {"name": "item 12345", "id": 12345}
+
+    async def operation():
+        pagination.dumps(item)
+
+    yield operation
+
+
+@scenario("keyset_token[loads]")
+async def keyset_token_loads() -> AsyncIterator[Operation]:
+    pagination = KeysetPagination(Item.name.desc(), Item.id, secret="secret")
+    token = pagination.dumps({"name": "item 12345", "id": 12345})
+
+    async def operation():
+        pagination.loads(token)
+
+    yield operation
+
+
+@scenario("parse_response_as[one]")
+async def parse_one() -> AsyncIterator[Operation]:
+    response = httpx.Response(200, content=json.dumps(user(1)).encode(), request=httpx.Request("GET", "http://test"))
+
+    async def operation():
+        BaseGateway.parse_response_as(UserSchema, response)
+
+    yield operation
+
+
+@scenario("parse_response_as[list_1000]")
+async def parse_list() -> AsyncIterator[Operation]:
+    content = json.dumps([user(i) for i in range(1000)]).encode()
+
+    async def operation():
+        response = make_response(content)
+        await response.aread()
+        BaseGateway.parse_response_as(list[UserSchema], response)
+
+    yield operation
+
+
+@scenario("gateway[get]")
+async def gateway_get() -> AsyncIterator[Operation]:
+    content = json.dumps(user(1)).encode()
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=content))
+    async with get_async_client("http://upstream", transport=transport) as client:
+        gateway = BaseGateway(client, {"authorization": "Bearer token"})
+
+        async def operation():
+            BaseGateway.parse_response_as(UserSchema, await gateway.get("/users/1"))
+
+        yield operation
+
+
+def _add_gateway_cache_scenario(name: str, cache: bool, coalesce: bool):
+    """
+    Upstream responds in 1ms with cacheable response, request scenarios run concurrently
+    """
+
+    async def run() -> AsyncIterator[Operation]:
+        content = json.dumps(user(1)).encode()
+
+        async def respond(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(0.001)
+            return httpx.Response(200, headers={"cache-control": "max-age=300"}, content=content)
+
+        async with get_async_client(
+            "http://upstream",
+            cache=HTTPCache() if cache else None,
+            coalesce=coalesce,
+            transport=httpx.MockTransport(respond),
+        ) as client:
+            gateway = BaseGateway(client, {"authorization": "Bearer token"})
+
+            async def operation():
+                BaseGateway.parse_response_as(UserSchema, await gateway.get("/users/1"))
+
+            yield operation
+
+    scenario(f"gateway[{name}]")(run)
+
+
+_add_gateway_cache_scenario("slow_upstream", cache=False, coalesce=False)
+_add_gateway_cache_scenario("coalesced", cache=False, coalesce=True)
+_add_gateway_cache_scenario("cache_hit", cache=True, coalesce=False)
+
+
+def percentile(values: list[float], q: int) -> float:
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+async def measure(operation: Operation, iterations: int, concurrency: int) -> dict[str, float]:
+    latencies: list[float] = []
+    queue = iter(range(iterations))
+
+    async def worker():
+        for _ in queue:
+            started = time.perf_counter()
+            await operation()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "ops_per_second": iterations / elapsed,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+async def run_scenario(name: str, iterations: int, concurrency: int, repeat: int, warmup: int) -> dict[str, float]:
+    async with SCENARIOS[name]() as operation:
+        for _ in range(warmup):
+            await operation()
+        runs = [await measure(operation, iterations, concurrency) for _ in range(repeat)]
+    best = max(runs, key=lambda result: result["ops_per_second"])
+    return {"iterations": iterations, "concurrency": concurrency, **best}
+
+
+def compare(baseline: dict, results: dict, threshold: float, metric: str) -> bool:
+    """
+    Print relative change of `metric` per scenario
+
+    :returns: whether no scenario regressed by more than `threshold` percent
+    """
+    higher_is_better = METRICS[metric]
+    ok = True
+    for name, result in results["scenarios"].items():
+        if name not in baseline["scenarios"]:
+            print(f"{name:<32} {'new':>10}")
+            continue
+        before, after = baseline["scenarios"][name][metric], result[metric]
+        change = (after - before) / before * 100
+        regression = -change if higher_is_better else change
+        failed = regression > threshold
+        ok = ok and not failed
+        print(f"{name:<32} {before:12.3f} -> {after:12.3f} {change:+7.1f}%{'  REGRESSION' if failed else ''}")
+    return ok
+
+
+async def run(args: argparse.Namespace) -> dict:
+    logger.remove()
+    names = [name for name in SCENARIOS if not args.k or any(fnmatch.fnmatch(name, f"*{k}*") for k in args.k)]
+    results = {
+        "meta": {
+            "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+        },
+        "scenarios": {},
+    }
+    # mapped reads SQL_ENGINE_ECHO on execution, scenarios use their own in-memory engines
+    settings = DatabaseSettings.model_construct(DATABASE_URL="sqlite+aiosqlite://")
+    for name in names:
+        concurrency = args.concurrency if name.startswith(("middleware_stack", "get_service", "gateway")) else 1
+        with settings_registry.override(settings):
+            result = await run_scenario(name, args.iterations, concurrency, args.repeat, args.warmup)
+        results["scenarios"][name] = result
+        print(
+            f"{name:<32} {result['ops_per_second']:10.1f} ops/s, p50 {result['p50_ms']:.3f}ms, "
+            f"p95 {result['p95_ms']:.3f}ms, p99 {result['p99_ms']:.3f}ms"
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run scenarios")
+    run_parser.add_argument("-k", action="append", help="run only scenarios which names contain pattern")
+    run_parser.add_argument("--iterations", type=int, default=2000)
+    run_parser.add_argument("--concurrency", type=int, default=32, help="for request scenarios")
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--warmup", type=int, default=100)
+    run_parser.add_argument("-o", "--output", help="JSON results file")
+    run_parser.add_argument("--baseline", help="JSON results to compare with")
+
+    for subparser in (run_parser, compare_parser := subparsers.add_parser("compare", help="compare results")):
+        subparser.add_argument("--threshold", type=float, default=10, help="allowed regression, percent")
+        subparser.add_argument("--metric", choices=METRICS, default="ops_per_second")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("results")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        results = asyncio.run(run(args))
+        if args.output:
+            with open(args.output, "w") as file:
+                json.dump(results, file, indent=2)
+        if not args.baseline:
+            return
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    else:
+        with open(args.baseline) as file, open(args.results) as results_file:
+            baseline, results = json.load(file), json.load(results_file)
+
+    if not compare(baseline, results, args.threshold, args.metric):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
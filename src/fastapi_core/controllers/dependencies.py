@@ -5,12 +5,6 @@ from starlette.requests import Request
 from fastapi_core.logging import get_logger
 from fastapi_core.services.base import BaseServiceWithSession
 
-try:
-    from sqlalchemy.ext.asyncio import AsyncSession
-
-except ImportError:
-    AsyncSession = NotImplemented
-
 T = TypeVar("T")
 
 
@@ -26,3 +20,17 @@ def get_service(service: Type[T]) -> Callable[..., T]:
         return service(logger=logger, container=request.state, headers=request.headers)
 
     return _get_service_with_db_session if db else _get_service_without_db_session
+
+
+def read_only(value: bool = True) -> Callable[[Request], None]:
+    """
+    Route dependency that overrides whether request session is read only, regardless of request method.
+    Has effect only when ``transactional_middleware_factory`` has ``create_read_only_session``.
+
+    @router.post("/search", dependencies=[Depends(read_only())])
+    """
+
+    def _read_only(request: Request):
+        request.state.session.read_only = value
+
+    return _read_only
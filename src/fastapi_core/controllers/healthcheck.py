@@ -1,8 +1,12 @@
-from typing import Callable
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable
 
-from fastapi import FastAPI
 from starlette.responses import Response
 
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+
 
 def default_healthcheck() -> Response:
     return Response(status_code=204)
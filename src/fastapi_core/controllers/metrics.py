@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Mapping, Sequence
+
+from starlette.responses import PlainTextResponse
+
+from fastapi_core.metrics.collectors import collect_gateways, get_cache_collector, get_pool_collector
+from fastapi_core.metrics.registry import MetricsRegistry, registry as default_registry
+
+if TYPE_CHECKING:
+    from fastapi import FastAPI, params
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def add_metrics_controller(
+    app: FastAPI,
+    route: str = "/metrics",
+    engines: Mapping[str, Any] | None = None,
+    caches: Mapping[str, Any] | None = None,
+    gateways: bool = True,
+    dependencies: Sequence[params.Depends] | None = None,
+    registry: MetricsRegistry = default_registry,
+):
+    """
+    Serve `registry` in Prometheus text format. Multiprocess mode is configured with `MetricsSettings`.
+
+    :param app: application
+    :param route: endpoint path
+    :param engines: name to engine mapping to report connection pools of
+    :param caches: name to cache mapping to report hits, misses, etc. of (anything with ``stats()``)
+    :param gateways: report gateway client pools, circuit breakers and retry budget
+    :param dependencies: endpoint dependencies
+    :param registry: metrics registry
+    """
+    from fastapi_core.settings.metrics import MetricsSettings
+    from fastapi_core.settings.registry import get_settings
+
+    settings = get_settings(MetricsSettings)
+    if settings.METRICS_MULTIPROCESS_DIR:
+        registry.configure(settings.METRICS_MULTIPROCESS_DIR, settings.METRICS_FLUSH_INTERVAL)
+
+    if engines:
+        registry.add_collector(get_pool_collector(engines))
+    if caches:
+        registry.add_collector(get_cache_collector(caches))
+    if gateways:
+        registry.add_collector(collect_gateways)
+
+    def metrics() -> PlainTextResponse:
+        return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
+
+    app.get(route, dependencies=dependencies, include_in_schema=False)(metrics)
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Literal, Sequence
+
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+
+if TYPE_CHECKING:
+    from fastapi import FastAPI, params
+
+
+def add_profiler_controller(
+    app: FastAPI,
+    route: str = "/admin/profile/",
+    dependencies: Sequence[params.Depends] | None = None,
+    aggregator=None,
+):
+    """
+    Serve stacks aggregated by `ProfilerMiddleware` sampling:
+    ``GET /admin/profile/?format=collapsed|speedscope&route=GET /users/{user_id}``
+
+    :param app: application
+    :param route: endpoint path
+    :param dependencies: endpoint dependencies, e.g. admin authorization, stacks expose code structure
+    :param aggregator: `ProfileAggregator`, process wide `get_profile_aggregator()` if omitted
+    """
+
+    def get_profile(format: Literal["collapsed", "speedscope"] = "collapsed", route: str | None = None) -> Response:
+        from fastapi_core.middleware.profiler import get_profile_aggregator
+
+        profile = aggregator or get_profile_aggregator()
+        if format == "speedscope":
+            return JSONResponse(profile.speedscope(route))
+        return PlainTextResponse(profile.collapsed(route))
+
+    app.get(route, dependencies=dependencies, include_in_schema=False)(get_profile)
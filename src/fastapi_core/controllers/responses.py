@@ -0,0 +1,48 @@
+from typing import Any, AsyncIterable, AsyncIterator, Literal, Mapping
+
+from pydantic_core import to_json
+from starlette.responses import StreamingResponse
+
+
+async def _ndjson_body(chunks: AsyncIterable[list[Any]]) -> AsyncIterator[bytes]:
+    async for chunk in chunks:
+        if chunk:
+            yield b"".join(to_json(item) + b"\n" for item in chunk)
+
+
+async def _json_array_body(chunks: AsyncIterable[list[Any]]) -> AsyncIterator[bytes]:
+    separator = b"["
+    async for chunk in chunks:
+        if chunk:
+            yield separator + b",".join(to_json(item) for item in chunk)
+            separator = b","
+
+    yield b"]" if separator == b"," else b"[]"
+
+
+def stream_response(
+    chunks: AsyncIterable[list[Any]],
+    format: Literal["ndjson", "json"] = "ndjson",
+    status_code: int = 200,
+    headers: Mapping[str, str] | None = None,
+) -> StreamingResponse:
+    """
+    Incrementally serialize chunks of items (e.g. from ``mapped_stream``) into response body.
+
+    :param chunks: async iterable of item lists
+    :param format: ``"ndjson"`` - one JSON document per line, ``"json"`` - single JSON array
+    :param status_code: response status code
+    :param headers: additional response headers
+    :returns: streaming response, every chunk is serialized and sent separately
+    """
+    match format:
+        case "ndjson":
+            return StreamingResponse(
+                _ndjson_body(chunks), status_code=status_code, headers=headers, media_type="application/x-ndjson"
+            )
+        case "json":
+            return StreamingResponse(
+                _json_array_body(chunks), status_code=status_code, headers=headers, media_type="application/json"
+            )
+        case _:
+            raise ValueError(f"Unrecognized format: {format}")
@@ -0,0 +1,271 @@
+import abc
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Collection, Hashable
+
+from sqlalchemy import Select, event
+from sqlalchemy.orm import Session, ORMExecuteState, UOWTransaction
+from sqlalchemy.sql.util import find_tables
+
+MISSING = object()
+
+TOUCHED_TABLES_KEY = "fastapi_core_touched_tables"
+CACHED_KEYS_KEY = "fastapi_core_cached_keys"
+
+
+class CacheBackend(abc.ABC):
+    """
+    Query results storage. Every entry is tagged with table names it was selected from,
+    so it could be invalidated when any of them changes.
+    """
+
+    @abc.abstractmethod
+    async def get(self, key: Hashable) -> Any:
+        """
+        :returns: cached value or ``MISSING``
+        """
+
+    @abc.abstractmethod
+    async def set(self, key: Hashable, value: Any, ttl: float, tables: Collection[str]):
+        ...
+
+    @abc.abstractmethod
+    async def delete(self, key: Hashable):
+        ...
+
+    @abc.abstractmethod
+    async def invalidate(self, tables: Collection[str]):
+        """
+        Drop all entries tagged with any of `tables`
+        """
+
+    @abc.abstractmethod
+    def stats(self) -> dict[str, int]:
+        ...
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    Per-process LRU cache with per-entry TTL
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        # key -> (expires_at, tables, value)
+        self._entries: OrderedDict[Hashable, tuple[float, Collection[str], Any]] = OrderedDict()
+        self._keys_by_table: dict[str, set[Hashable]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _drop(self, key: Hashable):
+        _, tables, _ = self._entries.pop(key)
+        for table in tables:
+            keys = self._keys_by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_table[table]
+
+    async def get(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+
+        expires_at, _, value = entry
+        if expires_at < time.monotonic():
+            self._drop(key)
+            self.evictions += 1
+            self.misses += 1
+            return MISSING
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    async def set(self, key: Hashable, value: Any, ttl: float, tables: Collection[str]):
+        if key in self._entries:
+            self._drop(key)
+
+        self._entries[key] = (time.monotonic() + ttl, tables, value)
+        for table in tables:
+            self._keys_by_table.setdefault(table, set()).add(key)
+
+        while len(self._entries) > self.maxsize:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    async def delete(self, key: Hashable):
+        if key in self._entries:
+            self._drop(key)
+
+    async def invalidate(self, tables: Collection[str]):
+        for table in tables:
+            for key in list(self._keys_by_table.get(table, ())):
+                self._drop(key)
+                self.invalidations += 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+_caches: weakref.WeakSet["QueryCache"] = weakref.WeakSet()
+
+
+class QueryCache:
+    """
+    Query results cache for ``mappers.base.mapped(..., cache=...)``.
+
+    Entries are invalidated by table names when ``transactional_middleware_factory``
+    (or ``TransactionalMiddleware``) commits a session that wrote into those tables.
+    Sessions with uncommitted writes bypass the cache, their reads could see rows that are never committed.
+    Cached schema objects are shared between requests and should not be mutated.
+    """
+
+    def __init__(self, backend: CacheBackend | None = None, ttl: float = 60):
+        """
+        :param backend: storage, ``InMemoryCacheBackend()`` if omitted
+        :param ttl: entry time to live in seconds
+        """
+        self.backend = backend or InMemoryCacheBackend()
+        self.ttl = ttl
+        _caches.add(self)
+
+    async def get(self, key: Hashable | None, session: Any = None) -> Any:
+        """
+        :param session: session the value is read for, cache is bypassed if it has uncommitted writes
+        :returns: cached value or ``MISSING``
+        """
+        if key is None or (session is not None and has_writes(session)):
+            return MISSING
+        return await self.backend.get(key)
+
+    async def set(self, key: Hashable | None, value: Any, tables: Collection[str], session: Any = None):
+        """
+        :param session: session the value is read with, value isn't cached if session has uncommitted writes.
+            Entry is dropped if session is rolled back, see `finish_session`
+        """
+        if key is None:
+            return
+        if session is not None:
+            sync_session = _get_sync_session(session)
+            if sync_session is not None:
+                if has_writes(sync_session):
+                    return
+                sync_session.info.setdefault(CACHED_KEYS_KEY, []).append((self, key))
+        await self.backend.set(key, value, self.ttl, tables)
+
+    def stats(self) -> dict[str, int]:
+        return self.backend.stats()
+
+
+def get_cache_key(prefix: str, statement: Select) -> tuple[tuple | None, frozenset[str]]:
+    """
+    Cache key of `statement` with its bound parameters and tables it selects from.
+
+    Built from SQLAlchemy statement cache key, so the statement isn't compiled and the key doesn't depend on dialect.
+    Key is None for statements SQLAlchemy can't cache (custom constructs without ``inherit_cache``),
+    `QueryCache` doesn't cache them.
+    """
+    tables = frozenset(table.name for table in find_tables(statement) if hasattr(table, "name"))
+    cache_key = statement._generate_cache_key()
+    if cache_key is None:
+        return None, tables
+    # parameter values could be unhashable (lists of IN and ARRAY parameters)
+    params = repr([param.effective_value for param in cache_key.bindparams])
+    return (prefix, cache_key.key, params), tables
+
+
+async def invalidate_tables(tables: Collection[str]):
+    """
+    Invalidate entries selected from `tables` in every `QueryCache`
+    """
+    for cache in list(_caches):
+        await cache.backend.invalidate(tables)
+
+
+def _get_sync_session(session: Any) -> Session | None:
+    """
+    ORM session of ``Session``, ``AsyncSession`` or ``LazySession``, None for connections and not started sessions
+    """
+    # LazySession keeps started session in `session` attribute
+    session = getattr(session, "session", session)
+    session = getattr(session, "sync_session", session)
+    return session if isinstance(session, Session) else None
+
+
+def has_writes(session: Any) -> bool:
+    """
+    Whether `session` has pending or flushed but not committed writes
+    """
+    sync_session = _get_sync_session(session)
+    if sync_session is None:
+        return False
+    return bool(
+        sync_session.info.get(TOUCHED_TABLES_KEY) or sync_session.new or sync_session.dirty or sync_session.deleted
+    )
+
+
+def _touch(session: Session, tables: Collection[str]):
+    session.info.setdefault(TOUCHED_TABLES_KEY, set()).update(tables)
+
+
+def touch_tables(session: Any, tables: Collection[str]):
+    """
+    Mark `tables` as written by `session`, for writes ORM events don't see (e.g. driver level ``COPY``),
+    so cached entries selected from them are invalidated on commit
+    """
+    sync_session = _get_sync_session(session)
+    if sync_session is not None:
+        _touch(sync_session, tables)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tables(session: Session, flush_context: UOWTransaction):
+    _touch(
+        session,
+        {
+            table.name
+            for obj in (*session.new, *session.dirty, *session.deleted)
+            for table in type(obj).__mapper__.tables
+        },
+    )
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_executed_tables(orm_execute_state: ORMExecuteState):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _touch(orm_execute_state.session, {orm_execute_state.statement.table.name})
+
+
+def pop_touched_tables(session: Session) -> set[str]:
+    """
+    Tables written by `session` since the last call
+    """
+    return session.info.pop(TOUCHED_TABLES_KEY, set())
+
+
+async def finish_session(session: Session, committed: bool):
+    """
+    Update caches after transaction of `session` is finished: entries selected from tables it wrote into
+    are invalidated on commit, entries it cached are dropped on rollback
+    """
+    tables = pop_touched_tables(session)
+    cached_keys = session.info.pop(CACHED_KEYS_KEY, ())
+    if committed:
+        if tables:
+            await invalidate_tables(tables)
+        return
+
+    for cache, key in cached_keys:
+        await cache.backend.delete(key)
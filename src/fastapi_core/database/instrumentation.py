@@ -0,0 +1,141 @@
+import re
+import time
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Iterator
+
+from fastapi_core.logging import get_logger
+
+logger = get_logger("api.database.statements")
+
+# placeholder lists of expanded IN parameters: "(?, ?, ?)", "(%(id_1)s, %(id_2)s)", "($1, $2)"
+_PLACEHOLDER = r"\s*(?:\?|%s|%\(\w+\)s|\$\d+|:\w+)\s*"
+_PLACEHOLDER_LIST = re.compile(rf"\((?:{_PLACEHOLDER},)+{_PLACEHOLDER}\)")
+
+
+@lru_cache(maxsize=1024)
+def get_statement_shape(statement: str) -> str:
+    """
+    Statement with expanded parameter lists collapsed, so ``IN`` queries of different sizes have the same shape
+    """
+    return _PLACEHOLDER_LIST.sub("(...)", statement)
+
+
+class QueryStats:
+    """
+    Statements executed within a request: count, total duration and executions per statement shape.
+    Rendered as ``3 queries 12.5ms``, so it could be put into logger context as is.
+    """
+
+    __slots__ = ("count", "duration", "shapes")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: dict[str, int] = {}
+
+    def record(self, statement: str, duration: float) -> int:
+        """
+        :returns: number of executions of `statement` shape
+        """
+        self.count += 1
+        self.duration += duration
+        shape = get_statement_shape(statement)
+        executions = self.shapes[shape] = self.shapes.get(shape, 0) + 1
+        return executions
+
+    def get_server_timing(self) -> str:
+        """
+        ``Server-Timing`` header value
+        """
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries"'
+
+    def __str__(self) -> str:
+        return f"{self.count} queries {self.duration * 1000:.1f}ms"
+
+    __repr__ = __str__
+
+
+class _Thresholds:
+    __slots__ = ("slow_query", "n_plus_one")
+
+    def __init__(self, slow_query: float | None, n_plus_one: int | None):
+        self.slow_query = slow_query
+        self.n_plus_one = n_plus_one
+
+
+# sync engine -> thresholds read by its listeners, so they could be changed after instrumentation
+_instrumented_engines: weakref.WeakKeyDictionary[Any, _Thresholds] = weakref.WeakKeyDictionary()
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def get_query_stats() -> QueryStats | None:
+    """
+    :returns: stats of the current request, None outside of `collect_query_stats`
+    """
+    return _query_stats.get()
+
+
+@contextmanager
+def collect_query_stats() -> Iterator[QueryStats]:
+    """
+    Attribute statements executed within the block to the yielded stats.
+    Nested blocks share stats of the outermost one, e.g. logger context and transactional middleware.
+    """
+    stats = _query_stats.get()
+    if stats is not None:
+        yield stats
+        return
+
+    token = _query_stats.set(stats := QueryStats())
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+def instrument_engine(engine: Any, slow_query_threshold: float | None = 0.5, n_plus_one_threshold: int | None = 10):
+    """
+    Time every statement of `engine` and record it into the current request `QueryStats`.
+    Could be called multiple times, engine is instrumented once and thresholds of the last call are used.
+
+    :param engine: ``Engine`` or ``AsyncEngine``
+    :param slow_query_threshold: statements slower than that (seconds) are logged with warning level
+    :param n_plus_one_threshold: statement shape executed that many times within a request is logged
+        as probable N+1 (once per request)
+    """
+    from sqlalchemy import event
+
+    engine = getattr(engine, "sync_engine", engine)
+    thresholds = _instrumented_engines.get(engine)
+    if thresholds is not None:
+        thresholds.slow_query = slow_query_threshold
+        thresholds.n_plus_one = n_plus_one_threshold
+        return
+    thresholds = _instrumented_engines[engine] = _Thresholds(slow_query_threshold, n_plus_one_threshold)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["query_started"].pop()
+
+        if thresholds.slow_query is not None and duration >= thresholds.slow_query:
+            logger.warning(f"Slow query {duration * 1000:.1f}ms: {statement}")
+
+        stats = _query_stats.get()
+        if stats is None:
+            return
+        executions = stats.record(statement, duration)
+        if executions == thresholds.n_plus_one:
+            logger.warning(f"Probable N+1, statement is executed {executions} times within request: {statement}")
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_started"):
+            connection.info["query_started"].pop()
@@ -1,7 +1,7 @@
 from datetime import datetime
 
-from sqlalchemy import Column, BigInteger, DateTime, func
-from sqlalchemy.orm import Mapped
+from sqlalchemy import Column, BigInteger, DateTime, event, func
+from sqlalchemy.orm import Mapped, Mapper
 
 
 class SerialIDBase:
@@ -14,7 +14,9 @@ class SerialIDBase:
 
 class CreateUpdateTimestampBase:
     """
-    Base Mixin for created_at, updated_at timestamps
+    Base Mixin for created_at, updated_at timestamps.
+    Mappers fetch server generated timestamps with ``RETURNING`` on flush instead of expiring them
+    (``eager_defaults``), unless model sets ``eager_defaults`` in its ``__mapper_args__``
     """
 
     created_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -27,3 +29,10 @@ class ExtendedBase(SerialIDBase, CreateUpdateTimestampBase):
     """
     Shortcut mixin for SerialIDBase and CreateUpdateTimestampBase
     """
+
+
+@event.listens_for(CreateUpdateTimestampBase, "instrument_class", propagate=True)
+def _enable_eager_defaults(mapper: Mapper, class_: type):
+    # set on mapper, mixin `__mapper_args__` would be replaced by `__mapper_args__` of model (e.g. polymorphic)
+    if "eager_defaults" not in getattr(class_, "__mapper_args__", {}):
+        mapper.eager_defaults = True
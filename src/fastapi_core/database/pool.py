@@ -0,0 +1,70 @@
+import time
+
+from sqlalchemy import Engine
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+class InstrumentedPoolMixin:
+    """
+    Pool mixin that records connection checkout counters:
+    number of checkouts, time spent waiting for connection and checkout timeouts
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.checkout_time_total = 0.0
+        self.checkout_time_max = 0.0
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except TimeoutError:
+            self.checkout_timeouts += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self.checkout_time_total += elapsed
+            self.checkout_time_max = max(self.checkout_time_max, elapsed)
+
+        self.checkouts += 1
+        return connection
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    ...
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    ...
+
+
+def get_pool_stats(engine: Engine | AsyncEngine) -> dict[str, int | float]:
+    """
+    Live pool state and cumulative checkout counters of `engine`.
+
+    :param engine: engine to inspect, checkout counters are present only for instrumented pools
+    :returns: pool metrics
+    """
+    pool: Pool = engine.pool
+    stats: dict[str, int | float] = {}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    if isinstance(pool, InstrumentedPoolMixin):
+        stats.update(
+            checkouts=pool.checkouts,
+            checkout_timeouts=pool.checkout_timeouts,
+            checkout_time_total=pool.checkout_time_total,
+            checkout_time_max=pool.checkout_time_max,
+            checkout_time_avg=pool.checkout_time_total / pool.checkouts if pool.checkouts else 0.0,
+        )
+    return stats
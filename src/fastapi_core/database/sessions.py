@@ -1,17 +1,144 @@
-from typing import Callable
+from itertools import cycle
+from typing import Any, Callable
 
-from sqlalchemy import create_engine, Engine
+from sqlalchemy import create_engine, Engine, event, make_url, text, URL
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, AsyncEngine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, Session
 
+from fastapi_core.database.instrumentation import instrument_engine
+from fastapi_core.database.pool import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool
+from fastapi_core.settings.database import DatabaseSettings
+
 
 def get_engines(sync_url: str, async_url: str) -> tuple[Engine, AsyncEngine]:
     return create_engine(sync_url), create_async_engine(async_url)
 
 
+def _get_engine_kwargs(settings: DatabaseSettings) -> dict[str, Any]:
+    return dict(
+        echo=settings.SQL_ENGINE_ECHO,
+        pool_pre_ping=settings.DB_ENGINE_POOL_PRE_PING,
+        pool_recycle=settings.DB_ENGINE_POOL_RECYCLE,
+        pool_size=settings.DB_ENGINE_POOL_SIZE,
+        max_overflow=settings.DB_ENGINE_MAX_OVERFLOW,
+        pool_timeout=settings.DB_ENGINE_POOL_TIMEOUT,
+    )
+
+
+def _get_asyncpg_connect_args(settings: DatabaseSettings) -> dict[str, Any]:
+    server_settings = dict(settings.DB_SERVER_SETTINGS)
+    if settings.DB_STATEMENT_TIMEOUT is not None:
+        server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT)
+
+    connect_args: dict[str, Any] = {"prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE}
+    if server_settings:
+        connect_args["server_settings"] = server_settings
+    return connect_args
+
+
+def get_async_engine(settings: DatabaseSettings, url: str | URL | None = None) -> AsyncEngine:
+    """
+    Async engine configured with ``DB_ENGINE_*`` pool settings, asyncpg settings and instrumented pool
+    (see ``database.pool.get_pool_stats``).
+
+    :param settings: database settings
+    :param url: engine url, ``settings.DATABASE_URL`` if omitted (e.g. one of ``DATABASE_REPLICA_URLS``)
+    :returns: async engine
+    """
+    url = make_url(str(url or settings.DATABASE_URL))
+    kwargs = _get_engine_kwargs(settings)
+    if url.get_driver_name() == "asyncpg":
+        kwargs["connect_args"] = _get_asyncpg_connect_args(settings)
+
+    return create_async_engine(url, poolclass=InstrumentedAsyncAdaptedQueuePool, **kwargs)
+
+
+def get_sync_engine(settings: DatabaseSettings, url: str | URL | None = None) -> Engine:
+    """
+    Sync engine with the same pool settings as `get_async_engine`, for migrations, scripts, etc.
+    Async driver in url is replaced with dialect default one (``postgresql+asyncpg`` -> ``postgresql``).
+
+    :param settings: database settings
+    :param url: engine url, ``settings.DATABASE_URL`` if omitted
+    :returns: sync engine
+    """
+    url = make_url(str(url or settings.DATABASE_URL))
+    url = url.set(drivername=url.get_backend_name())
+    return create_engine(url, poolclass=InstrumentedQueuePool, **_get_engine_kwargs(settings))
+
+
+def get_replica_engines(settings: DatabaseSettings) -> list[AsyncEngine]:
+    return [get_async_engine(settings, url) for url in settings.DATABASE_REPLICA_URLS]
+
+
 def get_session_factories(
     sync_engine: Engine, async_engine: AsyncEngine
 ) -> tuple[Callable[[], Session], Callable[[], AsyncSession]]:
-    return sessionmaker(bind=sync_engine, expire_on_commit=False), async_sessionmaker(
-        bind=async_engine, expire_on_commit=False, class_=AsyncSession
+    return sessionmaker(bind=sync_engine, expire_on_commit=False), get_async_session_factory(async_engine)
+
+
+def get_async_session_factory(
+    async_engine: AsyncEngine,
+    instrument: bool = False,
+    slow_query_threshold: float | None = 0.5,
+    n_plus_one_threshold: int | None = 10,
+) -> Callable[[], AsyncSession]:
+    """
+    :param async_engine: engine to bind sessions to
+    :param instrument: time statements and attribute them to requests, see ``database.instrumentation``
+    :param slow_query_threshold: seconds, slower statements are logged with warning level (if instrumented)
+    :param n_plus_one_threshold: executions of the same statement within a request logged as probable N+1
+        (if instrumented)
+    :returns: async session factory
+    """
+    if instrument:
+        instrument_engine(async_engine, slow_query_threshold, n_plus_one_threshold)
+    return async_sessionmaker(bind=async_engine, expire_on_commit=False, class_=AsyncSession)
+
+
+class ReadOnlySession(Session):
+    """
+    Session which transactions are started with ``SET TRANSACTION READ ONLY``
+    """
+
+
+@event.listens_for(ReadOnlySession, "after_begin")
+def _set_transaction_read_only(session: Session, transaction, connection):
+    connection.execute(text("SET TRANSACTION READ ONLY"))
+
+
+def get_read_only_session_factory(
+    *async_engines: AsyncEngine,
+    instrument: bool = False,
+    slow_query_threshold: float | None = 0.5,
+    n_plus_one_threshold: int | None = 10,
+) -> Callable[[], AsyncSession]:
+    """
+    Read only async session factory, e.g. for read replicas.
+    Each new session is bound to the next engine in round-robin order.
+
+    :param async_engines: engines to route sessions to
+    :param instrument: time statements and attribute them to requests, see ``database.instrumentation``
+    :param slow_query_threshold: see `get_async_session_factory`
+    :param n_plus_one_threshold: see `get_async_session_factory`
+    :returns: async session factory
+    """
+    if not async_engines:
+        raise ValueError("At least one engine is required")
+    if instrument:
+        for async_engine in async_engines:
+            instrument_engine(async_engine, slow_query_threshold, n_plus_one_threshold)
+
+    factories = cycle(
+        [
+            async_sessionmaker(
+                bind=async_engine, expire_on_commit=False, class_=AsyncSession, sync_session_class=ReadOnlySession
+            )
+            for async_engine in async_engines
+        ]
     )
+
+    def create_read_only_session() -> AsyncSession:
+        return next(factories)()
+
+    return create_read_only_session
@@ -1,14 +1,21 @@
 from abc import ABC
 from functools import partial
-from typing import Callable, ClassVar, Mapping, ParamSpec, Type, TypeVar, Any
+from typing import AsyncIterator, Callable, ClassVar, Collection, Mapping, ParamSpec, Type, TypeVar, Any
 
 import pydantic
-from httpx import AsyncClient, Response
-from pydantic import AnyHttpUrl, TypeAdapter
+from httpx import AsyncClient, AsyncHTTPTransport, Response
+from pydantic import AnyHttpUrl
 
+from fastapi_core.gateways.cache import CachingTransport, HTTPCache
+from fastapi_core.gateways.concurrency import get_latency_window, hedged
 from fastapi_core.gateways.exceptions import InterServiceContractMismatchException
+from fastapi_core.gateways.resilience import CIRCUIT_BREAKER_CALL, ResilientTransport, get_circuit_breaker
+from fastapi_core.gateways.streaming import CallbackOnCloseStream, RelayedResponse, iter_json_array
 from fastapi_core.logging import get_logger
+from fastapi_core.metrics.registry import registry
+from fastapi_core.schemas.adapters import get_type_adapter
 from fastapi_core.settings.httpx import HTTPXConfig
+from fastapi_core.settings.registry import get_settings
 
 P = ParamSpec("P")
 T = TypeVar("T")
@@ -40,6 +47,26 @@ class BaseGateway(ABC):
         self.delete = create_partial(self._client.delete, headers=self.headers)
         self.options = create_partial(self._client.options, headers=self.headers)
 
+    async def hedged_get(
+        self, url: str, hedge_after: float | None = None, percentile: float = 95, max_hedges: int = 1, **kwargs: Any
+    ) -> Response:
+        """
+        ``GET`` that fires duplicate request if the first one is not done in time, the first successful wins.
+        Doesn't make sense with request coalescing of ``get_async_client(..., coalesce=True)``.
+
+        :param url: url
+        :param hedge_after: seconds before hedge, `percentile` of the recent hedged requests latencies of this client
+            if None (no hedging until enough latencies are recorded)
+        :param percentile: latency percentile used as hedge threshold
+        :param max_hedges: max duplicate requests
+        :param kwargs: ``httpx.AsyncClient.get`` kwargs
+        :returns: response
+        """
+        window = get_latency_window(self._client)
+        if hedge_after is None:
+            hedge_after = window.percentile(percentile)
+        return await hedged(partial(self.get, url, **kwargs), hedge_after, max_hedges, window)
+
     @staticmethod
     def clear_params(params: dict) -> dict:
         """
@@ -79,13 +106,70 @@ class BaseGateway(ABC):
             return None
 
         try:
-            return TypeAdapter(schema).validate_json(response.content)
+            return get_type_adapter(schema).validate_json(response.content)
         except pydantic.ValidationError as e:
+            record_contract_mismatch(response)
             if not optimistic:
                 raise InterServiceContractMismatchException(response, e.errors())
             else:
                 return None
 
+    @staticmethod
+    async def iter_response_as(schema: Type[T], response: Response) -> AsyncIterator[T]:
+        """
+        Parse JSON array `response` item by item into `schema` objects.
+
+        Items are validated as they arrive, so neither the whole body nor the whole list is held in memory
+        if response is not read yet, e.g. sent with ``client.stream(...)`` or ``client.send(..., stream=True)``.
+
+        :param schema: Schema of array item
+        :param response: response object
+        :returns: async iterator of `schema` objects
+        :raises InterServiceContractMismatchException: response is not JSON array or item validation failed
+        :raises httpx.HTTPStatusError: `response` status code greater than or equal 400
+        """
+        if not response.is_success:
+            await response.aread()
+            response.raise_for_status()
+
+        adapter = get_type_adapter(schema)
+        try:
+            async for item in iter_json_array(response.aiter_bytes()):
+                yield adapter.validate_json(item)
+        except pydantic.ValidationError as e:
+            record_contract_mismatch(response)
+            raise InterServiceContractMismatchException(response, e.errors())
+        except ValueError as e:
+            record_contract_mismatch(response)
+            raise InterServiceContractMismatchException(response, [{"type": "json_invalid", "msg": str(e)}])
+
+    async def proxy(self, method: str, url: str, chunk_size: int = 64 * 1024, **kwargs: Any) -> RelayedResponse:
+        """
+        Relay upstream response as is (status code, headers, encoded body) without buffering it.
+
+        Body is piped chunk by chunk, so at most `chunk_size` bytes are held in memory per response.
+        Upstream connection is released when the response is done, even if body was never sent.
+
+        :param method: HTTP method
+        :param url: upstream url
+        :param chunk_size: max relayed chunk size in bytes
+        :param kwargs: ``httpx.AsyncClient.build_request`` kwargs, gateway headers are used if `headers` are omitted
+        :returns: streaming response
+        """
+        kwargs.setdefault("headers", self.headers)
+        request = self._client.build_request(method, url, **kwargs)
+        response = await self._client.send(request, stream=True)
+        return RelayedResponse(response, chunk_size)
+
+
+def record_contract_mismatch(response: Response):
+    """
+    Count contract mismatch as failed call of upstream circuit breaker (if enabled)
+    """
+    breaker = get_circuit_breaker(response.request.url.netloc.decode())
+    if breaker is not None:
+        breaker.record_failure(response.extensions.get(CIRCUIT_BREAKER_CALL))
+
 
 class PathMappable(ABC):
     path_mapping: ClassVar[dict[str, str]]
@@ -97,30 +181,96 @@ class PathMappable(ABC):
 
 logger = get_logger("api.gateway")
 
+gateway_requests = registry.counter(
+    "gateway_requests_total", "Gateway requests by upstream and status code", ("upstream", "method", "status")
+)
+gateway_duration = registry.histogram(
+    "gateway_request_duration_seconds", "Gateway request duration until body is read", ("upstream", "method")
+)
+
 
 async def log_response(response: Response):
-    await response.aread()  # this has to be done to deal with .elapsed when logging
-
-    logger.debug(
-        " ".join(
-            (
-                response.request.method,
-                str(response.url),
-                str(response.status_code),
-                response.reason_phrase,
-                f"{round(response.elapsed.total_seconds() * 1000)}ms",
+    # .elapsed is known only when body is read, so response is logged when its stream is closed
+    # instead of reading body here, that keeps streamed responses unbuffered
+    async def log():
+        upstream = response.request.url.netloc.decode()
+        method = response.request.method
+        gateway_requests.labels(upstream, method, str(response.status_code)).inc()
+        try:
+            seconds = response.elapsed.total_seconds()
+        except RuntimeError:  # response was already read by transport, e.g. httpx.MockTransport
+            elapsed = "-"
+        else:
+            elapsed = f"{round(seconds * 1000)}ms"
+            gateway_duration.labels(upstream, method).observe(seconds)
+
+        logger.debug(
+            " ".join(
+                (
+                    response.request.method,
+                    str(response.url),
+                    str(response.status_code),
+                    response.reason_phrase,
+                    elapsed,
+                )
             )
         )
-    )
 
+    if response.is_closed:
+        await log()
+    else:
+        response.stream = CallbackOnCloseStream(response.stream, log)
+
+
+_TRANSPORT_KWARGS = ("verify", "cert", "http1", "http2", "limits", "trust_env")
+
+
+def get_async_client(
+    url: AnyHttpUrl,
+    cache: HTTPCache | None = None,
+    coalesce: bool = False,
+    key_headers: Collection[str] | None = None,
+    **kwargs: Any,
+):
+    """
+    Client with timeouts, pool limits, HTTP/2, circuit breaker and retries configured with ``HTTPXConfig``.
+    Consider ``fastapi_core.gateways.clients.client_registry`` to share clients between services.
+
+    :param url: base url
+    :param cache: cache ``GET`` responses according to ``Cache-Control``, ``ETag`` and ``Last-Modified`` headers
+    :param coalesce: share one upstream response between concurrent identical ``GET`` requests
+    :param key_headers: request headers that must be equal for requests to be coalesced, all headers if None
+    :param kwargs: ``httpx.AsyncClient`` kwargs
+    """
+    config = get_settings(HTTPXConfig)
+    kwargs.setdefault("timeout", config.get_timeout())
+    kwargs.setdefault("limits", config.get_limits())
+    kwargs.setdefault("http2", config.HTTPX_HTTP2)
+
+    circuit_breaker = config.get_circuit_breaker_kwargs()
+    resilient = circuit_breaker is not None or config.HTTPX_RETRIES > 0
+    if cache is not None or coalesce or resilient:
+        transport = kwargs.pop("transport", None) or AsyncHTTPTransport(
+            **{key: kwargs.pop(key) for key in _TRANSPORT_KWARGS if key in kwargs}
+        )
+        if resilient:
+            transport = ResilientTransport(
+                transport,
+                circuit_breaker=circuit_breaker,
+                retries=config.HTTPX_RETRIES,
+                backoff=config.HTTPX_RETRY_BACKOFF,
+                backoff_max=config.HTTPX_RETRY_BACKOFF_MAX,
+            )
+        # cache is outermost, so cache hits are not counted by circuit breaker
+        if cache is not None or coalesce:
+            transport = CachingTransport(transport, cache=cache, coalesce=coalesce, key_headers=key_headers)
+        kwargs["transport"] = transport
 
-def get_async_client(url: AnyHttpUrl, **kwargs: Any):
     return AsyncClient(
         base_url=url,
         event_hooks={
             "request": [],
             "response": [log_response],
         },
-        timeout=HTTPXConfig().get_timeout(),
         **kwargs,
     )
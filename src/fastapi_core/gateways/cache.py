@@ -0,0 +1,251 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Collection
+
+from httpx import AsyncBaseTransport, ByteStream, Headers, Request, Response
+
+CACHEABLE_STATUS_CODES = (200, 203, 300, 301, 308, 404, 410)
+
+
+def parse_cache_control(value: str | None) -> dict[str, str | None]:
+    directives = {}
+    for directive in (value or "").split(","):
+        name, _, argument = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') or None
+    return directives
+
+
+class CacheEntry:
+    def __init__(self, status_code: int, headers: Headers, content: bytes, vary: dict[str, str | None]):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.vary = vary
+        self.expires_at = 0.0
+        self.update_freshness(headers)
+
+    def update_freshness(self, headers: Headers):
+        cache_control = parse_cache_control(headers.get("cache-control"))
+        max_age = 0
+        if "no-cache" not in cache_control:
+            try:
+                max_age = int(cache_control.get("max-age") or 0) - int(headers.get("age") or 0)
+            except ValueError:
+                max_age = 0
+        self.expires_at = time.monotonic() + max(max_age, 0)
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+
+class HTTPCache:
+    """
+    In-memory HTTP responses cache for ``GET`` requests with LRU eviction, bounded by entries count and total size.
+
+    Honors ``Cache-Control`` (``no-store``, ``no-cache``, ``max-age``, ``private`` is allowed since cache is
+    per process), ``Vary``, and revalidates stale entries with ``ETag``/``Last-Modified`` conditional requests.
+    ``Expires`` header is not supported, only ``max-age``.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_size: int = 64 * 1024 * 1024,
+        max_entry_size: int = 1024 * 1024,
+        key_headers: Collection[str] = ("authorization", "cookie"),
+    ):
+        """
+        :param max_entries: max cached responses
+        :param max_size: max total size of cached bodies in bytes
+        :param max_entry_size: bodies larger than that are not cached
+        :param key_headers: request headers that are part of the cache key, e.g. forwarded credentials,
+            so responses of different users are never shared
+        """
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.max_entry_size = max_entry_size
+        self.key_headers = tuple(header.lower() for header in key_headers)
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._size = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+    def get_key(self, request: Request) -> str:
+        key_headers = "\0".join(request.headers.get(header, "") for header in self.key_headers)
+        return f"{request.method}:{request.url}:{hashlib.sha1(key_headers.encode()).hexdigest()}"
+
+    def get(self, key: str, request: Request) -> CacheEntry | None:
+        entry = self._entries.get(key)
+        if entry is None or any(request.headers.get(header) != value for header, value in entry.vary.items()):
+            return None
+
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, request: Request, response: Response, content: bytes) -> CacheEntry | None:
+        """
+        Store response if it is cacheable
+        """
+        cache_control = parse_cache_control(response.headers.get("cache-control"))
+        has_validators = "etag" in response.headers or "last-modified" in response.headers
+        vary = [header.strip().lower() for header in response.headers.get("vary", "").split(",") if header.strip()]
+        if (
+            response.status_code not in CACHEABLE_STATUS_CODES
+            or "no-store" in cache_control
+            or "*" in vary
+            or len(content) > self.max_entry_size
+            or ("max-age" not in cache_control and not has_validators)
+        ):
+            return None
+
+        entry = CacheEntry(
+            response.status_code, response.headers, content, {header: request.headers.get(header) for header in vary}
+        )
+        self.pop(key)
+        self._entries[key] = entry
+        self._size += entry.size
+        while len(self._entries) > self.max_entries or self._size > self.max_size:
+            self.pop(next(iter(self._entries)))
+            self.evictions += 1
+        return entry
+
+    def pop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "size": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "evictions": self.evictions,
+        }
+
+
+class CachingTransport(AsyncBaseTransport):
+    """
+    Transport wrapper that serves ``GET`` requests from `HTTPCache` and coalesces
+    concurrent identical ``GET`` requests into a single upstream request (single-flight).
+    Requests are identical if they have the same url and `key_headers` values (all headers by default).
+    If the request that is in flight is cancelled, coalesced requests are retried.
+    Coalesced and cached responses are fully read into memory.
+    """
+
+    def __init__(
+        self,
+        transport: AsyncBaseTransport,
+        cache: HTTPCache | None = None,
+        coalesce: bool = True,
+        key_headers: Collection[str] | None = None,
+    ):
+        """
+        :param transport: wrapped transport
+        :param cache: responses cache, cache key is built with `HTTPCache.key_headers`
+        :param coalesce: share one upstream response between concurrent identical requests
+        :param key_headers: request headers that must be equal for requests to be coalesced,
+            all headers if None, so responses to different tenants, languages, etc. are never shared
+        """
+        self._transport = transport
+        self.cache = cache
+        self.coalesce = coalesce
+        self.key_headers = tuple(header.lower() for header in key_headers) if key_headers is not None else None
+        self._in_flight: dict[str, asyncio.Future] = {}
+        self.coalesced = 0
+
+    def get_coalescing_key(self, request: Request) -> str:
+        if self.key_headers is None:
+            headers = "\0".join(f"{name}:{value}" for name, value in sorted(request.headers.multi_items()))
+        else:
+            headers = "\0".join(request.headers.get(header, "") for header in self.key_headers)
+        return f"{request.method}:{request.url}:{hashlib.sha1(headers.encode()).hexdigest()}"
+
+    async def handle_async_request(self, request: Request) -> Response:
+        if request.method != "GET" or (self.cache is None and not self.coalesce):
+            return await self._transport.handle_async_request(request)
+
+        key = self.cache.get_key(request) if self.cache is not None else None
+        request_cache_control = parse_cache_control(request.headers.get("cache-control"))
+        cache = self.cache if "no-store" not in request_cache_control else None
+
+        entry = cache.get(key, request) if cache is not None else None
+        if entry is not None and entry.is_fresh and "no-cache" not in request_cache_control:
+            cache.hits += 1
+            return self._build_response(entry.status_code, entry.headers, entry.content)
+        if cache is not None:
+            cache.misses += 1
+
+        if not self.coalesce:
+            return self._build_response(*await self._fetch(request, key, cache, entry))
+
+        coalescing_key = self.get_coalescing_key(request)
+        while (future := self._in_flight.get(coalescing_key)) is not None:
+            result = await asyncio.shield(future)
+            # None if request in flight was cancelled, the first retried request becomes the new one
+            if result is not None:
+                self.coalesced += 1
+                return self._build_response(*result)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[coalescing_key] = future
+        try:
+            result = await self._fetch(request, key, cache, entry)
+            future.set_result(result)
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # mark as retrieved in case there are no followers
+            raise
+        finally:
+            del self._in_flight[coalescing_key]
+            # cancelled or interrupted by any other BaseException: followers must not wait forever,
+            # they are woken up with None and retry
+            if not future.done():
+                future.set_result(None)
+
+        return self._build_response(*result)
+
+    async def _fetch(
+        self, request: Request, key: str | None, cache: HTTPCache | None, entry: CacheEntry | None
+    ) -> tuple[int, Headers, bytes]:
+        if entry is not None:
+            if etag := entry.headers.get("etag"):
+                request.headers["If-None-Match"] = etag
+            if last_modified := entry.headers.get("last-modified"):
+                request.headers["If-Modified-Since"] = last_modified
+
+        response = await self._transport.handle_async_request(request)
+
+        if entry is not None and response.status_code == 304:
+            await response.aclose()
+            cache.revalidations += 1
+            entry.update_freshness(response.headers)
+            return entry.status_code, entry.headers, entry.content
+
+        # raw (not decoded) body is stored, client decodes it according to headers
+        try:
+            content = b"".join([chunk async for chunk in response.stream])
+        finally:
+            await response.aclose()
+        if cache is not None:
+            cache.set(key, request, response, content)
+        return response.status_code, response.headers, content
+
+    @staticmethod
+    def _build_response(status_code: int, headers: Headers, content: bytes) -> Response:
+        return Response(status_code, headers=headers, stream=ByteStream(content))
+
+    async def aclose(self):
+        await self._transport.aclose()
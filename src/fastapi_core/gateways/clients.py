@@ -0,0 +1,101 @@
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from httpx import URL, AsyncClient, AsyncHTTPTransport
+from pydantic import AnyHttpUrl
+
+from fastapi_core.gateways.base import get_async_client
+
+
+def _get_key(url: AnyHttpUrl | str) -> str:
+    return str(URL(str(url))).rstrip("/")
+
+
+def get_client_pool_stats(client: AsyncClient) -> dict[str, int]:
+    """
+    Connection pool utilization of `client`, empty if client doesn't use default httpx transport
+
+    :param client: client to inspect
+    :returns: pool metrics
+    """
+    transport = client._transport
+    # unwrap transport wrappers, e.g. gateways.cache.CachingTransport
+    while not isinstance(transport, AsyncHTTPTransport) and hasattr(transport, "_transport"):
+        transport = transport._transport
+    pool = getattr(transport, "_pool", None)
+    if pool is None:
+        return {}
+
+    connections = pool.connections
+    idle = sum(connection.is_idle() for connection in connections)
+    return {
+        "connections": len(connections),
+        "active": len(connections) - idle,
+        "idle": idle,
+        "queued_requests": sum(request.is_queued() for request in getattr(pool, "_requests", ())),
+        "max_connections": pool._max_connections,
+        "max_keepalive_connections": pool._max_keepalive_connections,
+    }
+
+
+class AsyncClientRegistry:
+    """
+    Application scoped ``httpx.AsyncClient`` per base url, so every gateway reuses warm connections.
+    Clients are created on first use with `get_async_client` and closed on application shutdown:
+
+        app = FastAPI(lifespan=client_registry.lifespan)
+
+        class ServiceExample(BaseService):
+            @property
+            def gateway_example(self):
+                return self.gateway_factory(GatewayExample, client_registry.get("https://example.com/"))
+    """
+
+    def __init__(self):
+        self._clients: dict[str, AsyncClient] = {}
+
+    def get(self, url: AnyHttpUrl | str, **kwargs: Any) -> AsyncClient:
+        """
+        :param url: base url
+        :param kwargs: `get_async_client` kwargs, used only when client for `url` is created
+        :returns: shared client
+        """
+        key = _get_key(url)
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = self._clients[key] = get_async_client(key, **kwargs)
+        return client
+
+    def register(self, url: AnyHttpUrl | str, **kwargs: Any) -> AsyncClient:
+        """
+        Create client for `url` with custom `get_async_client` kwargs, e.g. on startup
+
+        :raises ValueError: client for `url` already exists
+        """
+        if _get_key(url) in self._clients:
+            raise ValueError(f"Client for {url} is already registered")
+        return self.get(url, **kwargs)
+
+    async def aclose(self):
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+    @asynccontextmanager
+    async def lifespan(self, app: Any = None) -> AsyncIterator[None]:
+        """
+        FastAPI lifespan that closes all clients on shutdown
+        """
+        try:
+            yield
+        finally:
+            await self.aclose()
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """
+        :returns: base url to connection pool metrics mapping
+        """
+        return {key: get_client_pool_stats(client) for key, client in self._clients.items()}
+
+
+client_registry = AsyncClientRegistry()
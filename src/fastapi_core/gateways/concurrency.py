@@ -0,0 +1,178 @@
+import asyncio
+import time
+import weakref
+from collections import deque
+from functools import partial
+from typing import Any, Awaitable, Callable, TypeVar
+
+from httpx import AsyncClient
+
+T = TypeVar("T")
+
+
+def _get_host(call: Callable[[], Awaitable[Any]]) -> str | None:
+    """
+    Upstream host of gateway or client method (possibly wrapped into ``functools.partial``)
+    """
+    while isinstance(call, partial):
+        call = call.func
+    owner = getattr(call, "__self__", None)
+    client = getattr(owner, "_client", owner)
+    if isinstance(client, AsyncClient):
+        return client.base_url.host
+    return None
+
+
+async def fan_out(
+    *calls: Callable[[], Awaitable[T]],
+    limit: int | None = None,
+    per_host_limit: int | None = None,
+    return_exceptions: bool = True,
+) -> list[T | BaseException]:
+    """
+    Run gateway calls concurrently:
+
+        users, orders = await fan_out(
+            partial(users_gateway.get_user, user_id),
+            partial(orders_gateway.get_orders, user_id),
+            per_host_limit=10,
+        )
+
+    Upstream host is detected for methods of ``BaseGateway`` and ``httpx.AsyncClient`` objects
+    (and ``functools.partial`` of them), other calls are limited by `limit` only.
+
+    :param calls: zero arguments callables returning awaitables
+    :param limit: max calls running at once
+    :param per_host_limit: max calls running at once per upstream host
+    :param return_exceptions: return exceptions in place of results, otherwise the first one is raised
+        and other calls are cancelled
+    :returns: results in the order of `calls`
+    """
+    limit_semaphore = asyncio.Semaphore(limit) if limit else None
+    host_semaphores: dict[str, asyncio.Semaphore] = {}
+
+    async def run(call: Callable[[], Awaitable[T]]) -> T:
+        host = _get_host(call) if per_host_limit else None
+        host_semaphore = None
+        if host is not None:
+            host_semaphore = host_semaphores.setdefault(host, asyncio.Semaphore(per_host_limit))
+
+        if limit_semaphore is not None:
+            await limit_semaphore.acquire()
+        try:
+            if host_semaphore is None:
+                return await call()
+            async with host_semaphore:
+                return await call()
+        finally:
+            if limit_semaphore is not None:
+                limit_semaphore.release()
+
+    tasks = [asyncio.ensure_future(run(call)) for call in calls]
+    try:
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+class LatencyWindow:
+    """
+    Latencies of the last `size` calls for percentile based hedging threshold
+    """
+
+    def __init__(self, size: int = 1000, min_samples: int = 20):
+        """
+        :param size: number of kept latencies
+        :param min_samples: percentile is unknown until that many latencies are recorded
+        """
+        self.min_samples = min_samples
+        self._latencies: deque[float] = deque(maxlen=size)
+
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def add(self, latency: float):
+        self._latencies.append(latency)
+
+    def percentile(self, q: float) -> float | None:
+        if len(self._latencies) < self.min_samples:
+            return None
+        latencies = sorted(self._latencies)
+        return latencies[min(int(len(latencies) * q / 100), len(latencies) - 1)]
+
+    def stats(self) -> dict[str, int | float | None]:
+        return {
+            "samples": len(self._latencies),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+        }
+
+
+_latency_windows: weakref.WeakKeyDictionary[AsyncClient, LatencyWindow] = weakref.WeakKeyDictionary()
+
+
+def get_latency_window(client: AsyncClient) -> LatencyWindow:
+    """
+    Latencies of hedged requests sent with `client`
+    """
+    window = _latency_windows.get(client)
+    if window is None:
+        window = _latency_windows[client] = LatencyWindow()
+    return window
+
+
+async def hedged(
+    call: Callable[[], Awaitable[T]], delay: float | None, max_hedges: int = 1, window: LatencyWindow | None = None
+) -> T:
+    """
+    Await `call()`, if it is not done in `delay` seconds, fire duplicate call and return whichever
+    succeeds first, others are cancelled. Call must be idempotent.
+
+    :param call: zero arguments callable returning awaitable
+    :param delay: seconds to wait before every hedge, no hedging if None
+    :param max_hedges: max duplicate calls
+    :param window: latencies of successful calls are recorded into it
+    :returns: result of the first successful call
+    :raises Exception: error of the last failed call if all calls failed
+    """
+    attempts: dict[asyncio.Future, int] = {}
+
+    async def attempt() -> T:
+        started = time.perf_counter()
+        result = await call()
+        if window is not None:
+            window.add(time.perf_counter() - started)
+        return result
+
+    first = asyncio.ensure_future(attempt())
+    attempts[first] = 0
+    pending = {first}
+    error = None
+    try:
+        while pending:
+            timeout = delay if delay is not None and len(attempts) <= max_hedges else None
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if window is not None and attempts[task]:
+                        window.hedge_wins += 1
+                    return task.result()
+                error = task.exception()
+
+            if not done:
+                task = asyncio.ensure_future(attempt())
+                attempts[task] = len(attempts)
+                pending.add(task)
+                if window is not None:
+                    window.hedges += 1
+        raise error
+    finally:
+        for task in attempts:
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                task.exception()  # mark errors of lost attempts as retrieved
@@ -2,8 +2,6 @@ from typing import Any
 
 from httpx import Response
 
-from fastapi_core.settings.app import APISettings
-
 
 class InterServiceContractMismatchException(Exception):
     def __init__(self, response: Response, errors: Any):
@@ -11,8 +9,11 @@ class InterServiceContractMismatchException(Exception):
         self.errors = errors
 
     def get_detail(self) -> dict[str, Any]:
+        from fastapi_core.settings.app import APISettings
+        from fastapi_core.settings.registry import get_settings
+
         detail = {"message": "Contract mismatch"}
-        if APISettings().DEBUG:
+        if get_settings(APISettings).DEBUG:
             try:
                 json_body = self.response.json()
             except Exception:
@@ -28,3 +29,14 @@ class InterServiceContractMismatchException(Exception):
             }
 
         return detail
+
+
+class CircuitOpenException(Exception):
+    """
+    Upstream calls fail fast, because upstream circuit breaker is open
+    """
+
+    def __init__(self, upstream: str, retry_after: float):
+        self.upstream = upstream
+        self.retry_after = retry_after
+        super().__init__(f"Circuit breaker for {upstream} is open, retry after {retry_after:.1f}s")
@@ -0,0 +1,355 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Collection, Literal
+
+from httpx import AsyncBaseTransport, ByteStream, Request, Response, TransportError
+
+from fastapi_core.gateways.exceptions import CircuitOpenException
+from fastapi_core.settings.registry import get_settings, settings_registry
+
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+RETRYABLE_STATUS_CODES = (502, 503, 504)
+# response extension with id of the circuit breaker call that produced response, see `CircuitBreaker.record_failure`
+CIRCUIT_BREAKER_CALL = "circuit_breaker_call"
+
+
+class CircuitBreaker:
+    """
+    Per upstream circuit breaker over sliding window of the last `window_size` calls.
+
+    - ``closed``: calls pass, circuit opens when failed or slow calls rate reaches threshold
+    - ``open``: calls fail fast with `CircuitOpenException` for `open_duration` seconds
+    - ``half_open``: up to `half_open_calls` trial calls pass, circuit closes if all of them succeed
+      and opens again on the first failure
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = 0.5,
+        slow_call_duration: float | None = None,
+        slow_call_rate: float = 1.0,
+        window_size: int = 100,
+        min_calls: int = 20,
+        open_duration: float = 30,
+        half_open_calls: int = 5,
+    ):
+        """
+        :param name: upstream name, e.g. host
+        :param failure_rate: failed calls rate (0..1) to open circuit at
+        :param slow_call_duration: calls longer than that (seconds) are slow, latency is not tracked if None
+        :param slow_call_rate: slow calls rate (0..1) to open circuit at
+        :param window_size: number of last calls rates are calculated for
+        :param min_calls: rates are not checked until that many calls are recorded
+        :param open_duration: seconds to fail fast before trial calls
+        :param half_open_calls: trial calls to close circuit
+        """
+        self.name = name
+        self.failure_rate = failure_rate
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate = slow_call_rate
+        self.min_calls = min_calls
+        self.open_duration = open_duration
+        self.half_open_calls = half_open_calls
+
+        self.state: Literal["closed", "open", "half_open"] = "closed"
+        # (call id, failed, slow) of the last calls
+        self._window: deque[tuple[int, bool, bool]] = deque(maxlen=window_size)
+        self._failures = 0
+        self._slow = 0
+        self._opened_at = 0.0
+        self._last_call = 0
+        # the last call id before circuit became half open, later calls are trials
+        self._half_opened_after = 0
+        # ids of trial calls in progress
+        self._trials: set[int] = set()
+        self._trial_successes = 0
+
+        self.rejected = 0
+        self.opened = 0
+
+    @property
+    def retry_after(self) -> float:
+        return max(self._opened_at + self.open_duration - time.monotonic(), 0.0)
+
+    def acquire(self) -> int:
+        """
+        Check whether call is allowed, the call must end with `record` or `release`
+
+        :returns: call id
+        :raises CircuitOpenException: circuit is open or all trial calls are in progress
+        """
+        if self.state == "open" and not self.retry_after:
+            self.state = "half_open"
+            self._trials.clear()
+            self._trial_successes = 0
+            self._half_opened_after = self._last_call
+
+        if self.state == "open" or (
+            self.state == "half_open" and len(self._trials) + self._trial_successes >= self.half_open_calls
+        ):
+            self.rejected += 1
+            raise CircuitOpenException(self.name, self.retry_after)
+
+        self._last_call += 1
+        if self.state == "half_open":
+            self._trials.add(self._last_call)
+        return self._last_call
+
+    def release(self, call: int):
+        """
+        Free trial slot of the call if it ended without `record`, no-op for recorded calls
+        """
+        self._trials.discard(call)
+
+    def record(self, call: int, failed: bool, duration: float = 0.0):
+        """
+        :param call: id returned by `acquire`
+        :param failed: call failed
+        :param duration: call duration in seconds
+        """
+        slow = self.slow_call_duration is not None and duration > self.slow_call_duration
+
+        if self.state == "half_open":
+            # results of calls started before circuit opened are stale
+            if call in self._trials:
+                self._trials.discard(call)
+                if failed or slow:
+                    self._open()
+                else:
+                    self._trial_successes += 1
+                    if self._trial_successes >= self.half_open_calls:
+                        self._close()
+            return
+
+        if self.state == "open":
+            return
+
+        if len(self._window) == self._window.maxlen:
+            _, old_failed, old_slow = self._window[0]
+            self._failures -= old_failed
+            self._slow -= old_slow
+        self._window.append((call, failed, slow))
+        self._failures += failed
+        self._slow += slow
+
+        self._check()
+
+    def record_failure(self, call: int | None = None):
+        """
+        Mark recorded call as failed, e.g. when its response doesn't match the contract
+
+        :param call: id returned by `acquire`, failed call is recorded if None (e.g. response came from cache)
+        """
+        if call is None:
+            if self.state == "closed":
+                self.record(self.acquire(), failed=True)
+            return
+
+        if self.state == "half_open":
+            # trial call succeeded, but its response is broken
+            if call > self._half_opened_after:
+                self._open()
+            return
+
+        for i, (recorded, failed, slow) in enumerate(self._window):
+            if recorded == call:
+                if not failed:
+                    self._window[i] = (call, True, slow)
+                    self._failures += 1
+                    self._check()
+                return
+
+    def _check(self):
+        calls = len(self._window)
+        if self.state == "closed" and calls >= self.min_calls:
+            if self._failures / calls >= self.failure_rate or self._slow / calls >= self.slow_call_rate:
+                self._open()
+
+    def _open(self):
+        self.state = "open"
+        self._opened_at = time.monotonic()
+        self.opened += 1
+
+    def _close(self):
+        self.state = "closed"
+        self._window.clear()
+        self._failures = self._slow = 0
+
+    def stats(self) -> dict[str, int | float | str]:
+        calls = len(self._window)
+        return {
+            "state": self.state,
+            "calls": calls,
+            "failure_rate": self._failures / calls if calls else 0.0,
+            "slow_call_rate": self._slow / calls if calls else 0.0,
+            "rejected": self.rejected,
+            "opened": self.opened,
+        }
+
+
+class RetryBudget:
+    """
+    Caps retries to `ratio` of requests made in the last `ttl` seconds (plus `min_per_second` retries),
+    so retries can't multiply load on degraded upstreams
+    """
+
+    def __init__(self, ratio: float = 0.1, min_per_second: float = 10, ttl: float = 10):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.ttl = ttl
+        self._requests: deque[float] = deque()
+        self._retries: deque[float] = deque()
+
+        self.exhausted = 0
+
+    def _expire(self, now: float):
+        for events in (self._requests, self._retries):
+            while events and events[0] < now - self.ttl:
+                events.popleft()
+
+    def deposit(self):
+        self._requests.append(time.monotonic())
+
+    def withdraw(self) -> bool:
+        """
+        :returns: whether retry is allowed
+        """
+        now = time.monotonic()
+        self._expire(now)
+        if len(self._retries) >= self.min_per_second * self.ttl + self.ratio * len(self._requests):
+            self.exhausted += 1
+            return False
+
+        self._retries.append(now)
+        return True
+
+    def stats(self) -> dict[str, int]:
+        self._expire(time.monotonic())
+        return {"requests": len(self._requests), "retries": len(self._retries), "exhausted": self.exhausted}
+
+
+_circuit_breakers: dict[str, CircuitBreaker] = {}
+# global budget is configured on the first use with HTTPXConfig and reset on settings reload, see get_retry_budget()
+_retry_budget: RetryBudget | None = None
+
+
+def _reset_retry_budget():
+    global _retry_budget
+    _retry_budget = None
+
+
+settings_registry.on_reload(_reset_retry_budget)
+
+
+def get_retry_budget() -> RetryBudget:
+    global _retry_budget
+    if _retry_budget is None:
+        from fastapi_core.settings.httpx import HTTPXConfig
+
+        config = get_settings(HTTPXConfig)
+        _retry_budget = RetryBudget(config.HTTPX_RETRY_BUDGET_RATIO, config.HTTPX_RETRY_BUDGET_MIN_PER_SECOND)
+    return _retry_budget
+
+
+def get_circuit_breaker(host: str) -> CircuitBreaker | None:
+    return _circuit_breakers.get(host)
+
+
+def get_resilience_stats() -> dict[str, dict]:
+    """
+    Circuit breakers of every upstream and global retry budget metrics
+    """
+    return {
+        "circuit_breakers": {host: breaker.stats() for host, breaker in _circuit_breakers.items()},
+        "retry_budget": get_retry_budget().stats(),
+    }
+
+
+class ResilientTransport(AsyncBaseTransport):
+    """
+    Transport wrapper with per host `CircuitBreaker` and retries with jittered exponential backoff
+    (full jitter) capped by global `RetryBudget`.
+
+    Calls are failed if transport error is raised or response status code is one of `retry_status_codes`.
+    Only requests of `retry_methods` with non-streaming body are retried.
+    """
+
+    def __init__(
+        self,
+        transport: AsyncBaseTransport,
+        circuit_breaker: dict | None = None,
+        retries: int = 0,
+        backoff: float = 0.1,
+        backoff_max: float = 2.0,
+        retry_methods: Collection[str] = IDEMPOTENT_METHODS,
+        retry_status_codes: Collection[int] = RETRYABLE_STATUS_CODES,
+        budget: RetryBudget | None = None,
+    ):
+        """
+        :param transport: wrapped transport
+        :param circuit_breaker: `CircuitBreaker` kwargs, no circuit breaker if None.
+            Breakers are shared by all clients of the same host
+        :param retries: max retries per request
+        :param backoff: base backoff in seconds, n-th retry sleeps random time up to ``backoff * 2 ** n``
+        :param backoff_max: max backoff in seconds
+        :param retry_methods: methods that are safe to retry
+        :param retry_status_codes: response status codes that are retried and counted as failures
+        :param budget: retry budget, global `get_retry_budget()` if omitted
+        """
+        self._transport = transport
+        self.circuit_breaker = circuit_breaker
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.retry_methods = retry_methods
+        self.retry_status_codes = retry_status_codes
+        self.budget = budget or get_retry_budget()
+
+    def _get_circuit_breaker(self, request: Request) -> CircuitBreaker | None:
+        if self.circuit_breaker is None:
+            return None
+        host = request.url.netloc.decode()
+        breaker = _circuit_breakers.get(host)
+        if breaker is None:
+            breaker = _circuit_breakers[host] = CircuitBreaker(host, **self.circuit_breaker)
+        return breaker
+
+    async def handle_async_request(self, request: Request) -> Response:
+        breaker = self._get_circuit_breaker(request)
+        retryable = request.method in self.retry_methods and isinstance(request.stream, ByteStream)
+        self.budget.deposit()
+
+        attempt = 0
+        while True:
+            call = breaker.acquire() if breaker is not None else None
+
+            started = time.monotonic()
+            try:
+                response = await self._transport.handle_async_request(request)
+            except TransportError:
+                if breaker is not None:
+                    breaker.record(call, failed=True, duration=time.monotonic() - started)
+                if not (retryable and attempt < self.retries and self.budget.withdraw()):
+                    raise
+            else:
+                failed = response.status_code in self.retry_status_codes
+                if breaker is not None:
+                    breaker.record(call, failed=failed, duration=time.monotonic() - started)
+                if not (failed and retryable and attempt < self.retries and self.budget.withdraw()):
+                    if call is not None:
+                        response.extensions[CIRCUIT_BREAKER_CALL] = call
+                    return response
+                await response.aclose()
+            finally:
+                # any other exception (or cancellation) ends the call without result
+                if breaker is not None:
+                    breaker.release(call)
+
+            await asyncio.sleep(random.uniform(0, min(self.backoff_max, self.backoff * 2**attempt)))
+            attempt += 1
+
+    async def aclose(self):
+        await self._transport.aclose()
@@ -0,0 +1,186 @@
+import re
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable
+
+from httpx import AsyncByteStream, Response
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+# hop-by-hop headers are not relayed by proxy, https://www.rfc-editor.org/rfc/rfc9110#section-7.6.1
+HOP_BY_HOP_HEADERS = (
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailer",
+    "transfer-encoding",
+    "upgrade",
+)
+
+_STRING = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+# skip everything up to the next structural character, complete string literals included
+_SKIP_TOP = re.compile(rb'(?:[^"\[\]{},]+|' + _STRING + rb")*")
+_SKIP_NESTED = re.compile(rb'(?:[^"\[\]{}]+|' + _STRING + rb")*")
+_SKIP_WHITESPACE = re.compile(rb"\s*")
+# rest of string literal split between chunks
+_STRING_END = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*"')
+
+
+class JSONArrayParser:
+    """
+    Incremental splitter of top level JSON array into raw JSON of its items.
+    Items are not decoded, so they could be validated directly with ``TypeAdapter.validate_json``.
+
+        parser = JSONArrayParser()
+        for chunk in chunks:
+            for item in parser.feed(chunk):
+                ...
+        parser.close()
+    """
+
+    def __init__(self):
+        self._buffer = b""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._item_start: int | None = None
+        self._finished = False
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        """
+        :param chunk: next part of JSON document
+        :returns: raw items completed within `chunk`
+        :raises ValueError: document is not a JSON array
+        """
+        buffer = self._buffer + chunk
+        pos, depth, in_string, item_start = self._pos, self._depth, self._in_string, self._item_start
+        items = []
+
+        while not self._finished:
+            if in_string:
+                match = _STRING_END.match(buffer, pos)
+                if match is None:
+                    break
+                pos, in_string = match.end(), False
+                continue
+
+            skip = _SKIP_WHITESPACE if depth == 0 else _SKIP_TOP if depth == 1 else _SKIP_NESTED
+            pos = skip.match(buffer, pos).end()
+            if pos == len(buffer):
+                break
+
+            token = buffer[pos]
+            if depth == 0 and token != ord("["):
+                raise ValueError("JSON array expected")
+
+            if token == ord('"'):
+                in_string = True
+            elif token in b"[{":
+                depth += 1
+                if depth == 1:
+                    item_start = pos + 1
+            elif token in b"]}":
+                depth -= 1
+                if depth == 0:
+                    if item := buffer[item_start:pos].strip():
+                        items.append(item)
+                    item_start = None
+                    self._finished = True
+            else:
+                items.append(buffer[item_start:pos].strip())
+                item_start = pos + 1
+            pos += 1
+
+        # keep only unfinished item in buffer
+        offset = item_start if item_start is not None else pos
+        self._buffer = buffer[offset:]
+        self._pos = pos - offset
+        self._item_start = 0 if item_start is not None else None
+        self._depth, self._in_string = depth, in_string
+        return items
+
+    def close(self):
+        """
+        :raises ValueError: document is incomplete
+        """
+        if not self._finished:
+            raise ValueError("Incomplete JSON array")
+
+
+async def iter_json_array(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """
+    Raw items of JSON array received by `chunks`
+    """
+    parser = JSONArrayParser()
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+    parser.close()
+
+
+class CallbackOnCloseStream(AsyncByteStream):
+    """
+    Response stream wrapper that calls `callback` once the stream is closed (fully read or aborted)
+    """
+
+    def __init__(self, stream: AsyncByteStream, callback: Callable[[], Awaitable[None]]):
+        self._stream = stream
+        self._callback = callback
+        self._closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            await self._stream.aclose()
+        finally:
+            await self._callback()
+
+
+async def relay_response(response: Response, chunk_size: int) -> AsyncIterator[bytes]:
+    """
+    Raw (still encoded) body of streamed `response` in chunks of at most `chunk_size`,
+    response is closed when iteration finishes or is aborted
+    """
+    try:
+        async for chunk in response.aiter_raw(chunk_size):
+            yield chunk
+    finally:
+        await response.aclose()
+
+
+def get_relayed_headers(response: Response) -> list[tuple[bytes, bytes]]:
+    """
+    Raw end-to-end headers of `response`, repeated headers (e.g. ``Set-Cookie``) are kept as separate entries.
+    Hop-by-hop headers are dropped, including the ones listed in ``Connection`` header.
+    """
+    excluded = {*HOP_BY_HOP_HEADERS, *(name.lower() for name in response.headers.get_list("connection", True))}
+    return [
+        (key.encode("latin-1"), value.encode("latin-1"))
+        for key, value in response.headers.multi_items()
+        if key not in excluded
+    ]
+
+
+class RelayedResponse(StreamingResponse):
+    """
+    Streaming response relaying streamed `upstream` response as is (see `relay_response`, `get_relayed_headers`).
+    Upstream is closed when the response is done even if its body was never iterated,
+    e.g. when sending response start failed, so pooled connection is never leaked.
+    """
+
+    def __init__(self, upstream: Response, chunk_size: int):
+        super().__init__(relay_response(upstream, chunk_size), status_code=upstream.status_code)
+        self.raw_headers.extend(get_relayed_headers(upstream))
+        self.upstream = upstream
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.upstream.aclose()
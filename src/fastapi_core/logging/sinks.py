@@ -1,13 +1,36 @@
 from __future__ import annotations
 
+import asyncio
+import time
+from typing import Literal
+
 import loguru
 from pydantic_core import Url
 
 from fastapi_core.settings.app import APISettings
+from fastapi_core.settings.clickhouse import ClickhouseSettings
+from fastapi_core.settings.registry import get_settings
+
+Row = tuple[str, object, str, str, int, str, str]
 
 
 class ClickHouseSink:
     """
+    Buffered loguru sink that writes log records into ClickHouse in batches.
+
+    Records are put into a bounded in-memory queue and a background task flushes them
+    with a single multi-row ``INSERT`` over a persistent connection once ``batch_size``
+    records are collected or ``flush_interval`` seconds passed since the first buffered record.
+    When the queue is full, records are either dropped (``overflow="drop"``) or the sink waits
+    for free space (``overflow="block"``).
+
+    Usage::
+
+        sink = ClickHouseSink(settings.CLICKHOUSE_TCP_URL, settings.CLICKHOUSE_LOG_TABLE)
+        logger.add(sink.sink)
+        ...
+        await sink.close()  # on application shutdown, flushes buffered records
+
     Table DDL:
 
     CREATE TABLE <table_name>
@@ -25,45 +48,201 @@ class ClickHouseSink:
             PARTITION BY toYYYYMM(timestamp);
     """
 
-    def __init__(self, clickhouse_url: Url, table_name: str):
+    def __init__(
+        self,
+        clickhouse_url: Url,
+        table_name: str,
+        service_name: str | None = None,
+        batch_size: int | None = None,
+        flush_interval: float | None = None,
+        max_queue_size: int | None = None,
+        overflow: Literal["drop", "block"] | None = None,
+    ):
+        """
+        :param clickhouse_url: ClickHouse TCP url
+        :param table_name: logs table name
+        :param service_name: value for ``service`` column, ``APISettings.SERVICE_NAME`` if omitted
+        :param batch_size: max records per ``INSERT``, ``CLICKHOUSE_LOG_BATCH_SIZE`` if omitted
+        :param flush_interval: max seconds a record waits in buffer before flush,
+            ``CLICKHOUSE_LOG_FLUSH_INTERVAL`` if omitted
+        :param max_queue_size: max buffered records, ``CLICKHOUSE_LOG_QUEUE_SIZE`` if omitted
+        :param overflow: full queue policy - ``"drop"`` new records or ``"block"`` until there is space,
+            ``CLICKHOUSE_LOG_OVERFLOW`` if omitted
+        """
         from asynch.connection import Connection
+
         self.clickhouse_url = clickhouse_url
         self.table_name = table_name
-        self._conn: Connection | None = None
         self.database = self.clickhouse_url.path.lstrip("/")
+        self.service_name = service_name or get_settings(APISettings).SERVICE_NAME
+        settings = get_settings(ClickhouseSettings)
+        self.batch_size = batch_size or settings.CLICKHOUSE_LOG_BATCH_SIZE
+        self.flush_interval = flush_interval if flush_interval is not None else settings.CLICKHOUSE_LOG_FLUSH_INTERVAL
+        self.max_queue_size = max_queue_size or settings.CLICKHOUSE_LOG_QUEUE_SIZE
+        self.overflow = overflow or settings.CLICKHOUSE_LOG_OVERFLOW
+
+        self._conn: Connection | None = None
+        # records and flush waiters, see `flush`
+        self._queue: asyncio.Queue[Row | asyncio.Future] | None = None
+        # owned by the flusher task only
+        self._buffer: list[Row] = []
+        self._flusher: asyncio.Task | None = None
+        self._closed = False
+
+        # counters
+        self.flushed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.failed_batches = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "queued": self._queue.qsize() if self._queue else 0,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "failed_batches": self.failed_batches,
+        }
 
     async def conn(self):
         from asynch import connect
 
-        return await connect(
-            host=self.clickhouse_url.host,
-            port=self.clickhouse_url.port,
-            database=self.clickhouse_url.path.lstrip("/"),
-            user=self.clickhouse_url.username or "default",
-            password=self.clickhouse_url.password or ""
-        )
+        if self._conn is None:
+            self._conn = await connect(
+                host=self.clickhouse_url.host,
+                port=self.clickhouse_url.port,
+                database=self.database,
+                user=self.clickhouse_url.username or "default",
+                password=self.clickhouse_url.password or "",
+            )
+        return self._conn
+
+    async def _close_conn(self):
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            try:
+                await conn.close()
+            except Exception:
+                ...
+
+    def _start(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
 
     async def sink(self, message: loguru.Message):
-        from asynch.cursors import DictCursor
-        from asynch.errors import ClickHouseException
+        if self._closed:
+            self.dropped += 1
+            return
 
-        conn = await self.conn()
+        self._start()
+        record = message.record
+        row = (
+            self.service_name,
+            record["time"],
+            record["message"],
+            record["file"].path,
+            record["line"],
+            record["level"].name,
+            record["function"],
+        )
+
+        if self.overflow == "block":
+            await self._queue.put(row)
+            return
+
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def _collect_batch(self) -> asyncio.Future | None:
+        """
+        Collect up to `batch_size` records into buffer, waiting at most `flush_interval` since the first one
+
+        :returns: flush waiter if batch is cut by `flush`
+        """
+        deadline = None
+        while len(self._buffer) < self.batch_size:
+            if not self._queue.empty():
+                # take everything that is ready without yielding to event loop
+                item = self._queue.get_nowait()
+            elif deadline is None:
+                item = await self._queue.get()
+            else:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+
+            if isinstance(item, asyncio.Future):
+                return item
+            self._buffer.append(item)
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+        return None
+
+    async def _flush_loop(self):
+        try:
+            while True:
+                waiter = await self._collect_batch()
+                batch, self._buffer = self._buffer, []
+                if batch:
+                    # insert is shielded so cancelling the task won't lose an in-flight batch
+                    await asyncio.shield(self._insert(batch))
+                if waiter is not None and not waiter.done():
+                    waiter.set_result(None)
+                if self._closed and self._queue.empty():
+                    return
+        except asyncio.CancelledError:
+            self.dropped += len(self._buffer)
+            self._buffer = []
+            raise
+
+    async def _insert(self, batch: list[Row]):
         try:
-            async with conn.cursor(cursor=DictCursor) as cursor:
+            conn = await self.conn()
+            async with conn.cursor() as cursor:
                 await cursor.execute(
                     f"INSERT INTO {self.database}.{self.table_name} "
                     f"(service, timestamp, message, file, lineno, level, function) VALUES ",
-                    [
-                        dict(
-                            service=APISettings().SERVICE_NAME,
-                            timestamp=message.record["time"],
-                            message=message.record["message"],
-                            file=message.record["file"].path,
-                            lineno=message.record["line"],
-                            level=message.record["level"].name,
-                            function=message.record["function"]
-                        )
-                    ]
+                    batch,
                 )
-        except ClickHouseException:
-            ...
+            self.flushed += len(batch)
+        except Exception:
+            # connection could be broken, the next batch reconnects
+            self.failed += len(batch)
+            self.failed_batches += 1
+            await self._close_conn()
+
+    async def flush(self):
+        """
+        Write all records buffered before the call. Records are written by the flusher task,
+        so they are never lost or written twice by concurrent flushes.
+        """
+        if self._queue is None:
+            return
+
+        self._start()
+        waiter = asyncio.get_running_loop().create_future()
+        await self._queue.put(waiter)
+        await waiter
+
+    async def close(self):
+        """
+        Stop background flushing, write buffered records and close connection
+        """
+        self._closed = True
+        await self.flush()
+        if self._flusher is not None:
+            # flusher stops once queue is drained, records put by blocked sinks after that are dropped
+            await self._flusher
+            self._flusher = None
+        if self._queue is not None:
+            self.dropped += self._queue.qsize()
+
+        await self._close_conn()
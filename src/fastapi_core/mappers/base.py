@@ -1,12 +1,33 @@
-from typing import TypeVar, Awaitable, Callable, ParamSpec, get_args, get_origin, Type, overload, Literal
+import time
+from collections.abc import Sequence
+from functools import lru_cache
+from types import NoneType, UnionType
+from typing import (
+    TypeVar,
+    Awaitable,
+    AsyncIterator,
+    Callable,
+    ParamSpec,
+    Union,
+    get_args,
+    get_origin,
+    Type,
+    overload,
+    Literal,
+    Any,
+)
 
-from pydantic import TypeAdapter, BaseModel
-from sqlalchemy import Select
-from sqlalchemy.orm import DeclarativeBase, defer
+from pydantic import BaseModel
+from sqlalchemy import Select, inspect
+from sqlalchemy.orm import DeclarativeBase, defer, joinedload, load_only, selectinload
+from sqlalchemy.sql.base import ExecutableOption
+from sqlalchemy.sql.elements import Label
 
+from fastapi_core.database.cache import MISSING, QueryCache, get_cache_key
 from fastapi_core.logging import get_logger
+from fastapi_core.metrics.registry import ROWS_BUCKETS, registry
 from fastapi_core.repositories.base import BaseRepository
-from fastapi_core.settings.database import DatabaseSettings
+from fastapi_core.schemas.adapters import get_type_adapter
 
 S = TypeVar("S")
 M = TypeVar("M", bound=type[DeclarativeBase])
@@ -14,41 +35,221 @@ P = ParamSpec("P")
 
 logger = get_logger("api.mappers")
 
-settings = DatabaseSettings()
+query_duration = registry.histogram(
+    "db_query_duration_seconds", "`mapped` statements execution and fetch duration", ("query",)
+)
+query_rows = registry.histogram("db_query_rows", "Rows fetched by `mapped` statements", ("query",), ROWS_BUCKETS)
 
 
-def _mapped(
-    from_model: M | None, to_schema: S, to_list: bool = False, optional: bool = False
-) -> Callable[[Callable[P, Select]], Callable[P, Awaitable[S | list[S] | None]]]:
-    initial_type = to_schema
-    to_schema = TypeAdapter(to_schema)
+def _is_echo_enabled() -> bool:
+    # resolved on first use, so mappers could be imported without DATABASE_URL
+    from fastapi_core.settings.database import DatabaseSettings
+    from fastapi_core.settings.registry import get_settings
+
+    return get_settings(DatabaseSettings).SQL_ENGINE_ECHO
+
+
+def _is_pydantic(to_schema: Any) -> bool:
     try:
-        is_pydantic = issubclass(initial_type, BaseModel)
+        return issubclass(to_schema, BaseModel)
     except TypeError:
-        is_pydantic = False
+        return False
+
+
+def _unwrap_schema(annotation: Any) -> Type[BaseModel] | None:
+    """
+    Nested pydantic model from field annotation: ``Schema``, ``Schema | None``, ``list[Schema]``, etc.
+    """
+    origin = get_origin(annotation)
+    if origin in (Union, UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not NoneType]
+        return _unwrap_schema(args[0]) if len(args) == 1 else None
+    if origin is not None and isinstance(origin, type) and issubclass(origin, (Sequence, set, frozenset)):
+        args = get_args(annotation)
+        return _unwrap_schema(args[0]) if args else None
+    return annotation if _is_pydantic(annotation) else None
+
 
-    list_to_schema = TypeAdapter(list[initial_type])
+def _get_schema_relationships(from_model: M, to_schema: Type[BaseModel]) -> dict[str, Any]:
+    """
+    `from_model` relationships that are `to_schema` fields
+    """
+    relationships = inspect(from_model).relationships
+    return {name: relationships[name] for name in to_schema.model_fields if name in relationships}
 
-    if is_pydantic and from_model is not None:
-        initial_type: Type[BaseModel]
+
+def _get_extra_columns(from_model: M | None, to_schema: S) -> set[str]:
+    """
+    Model columns that are not present in `to_schema` and could be deferred
+    """
+    if _is_pydantic(to_schema) and from_model is not None:
+        to_schema: Type[BaseModel]
         database_columns: set[str] = set(from_model.__table__.columns.keys())
-        schema_columns = initial_type.model_fields.keys()
-        extra_columns = database_columns - schema_columns
-    else:
-        extra_columns = set()
+        schema_columns = to_schema.model_fields.keys()
+        # columns used by eager loaded relationships must stay loaded
+        relationship_columns = {
+            column.key
+            for relationship in _get_schema_relationships(from_model, to_schema).values()
+            for column in relationship.local_columns
+        }
+        return database_columns - schema_columns - relationship_columns
+
+    return set()
+
+
+def _get_relationship_loaders(from_model: M, to_schema: Type[BaseModel], seen: frozenset) -> list[ExecutableOption]:
+    seen = seen | {(from_model, to_schema)}
+    loaders = []
+    for name, relationship in _get_schema_relationships(from_model, to_schema).items():
+        attribute = getattr(from_model, name)
+        # collections are loaded with one extra "IN" query, scalars are joined into the main one
+        loader = selectinload(attribute) if relationship.uselist else joinedload(attribute)
+
+        nested_schema = _unwrap_schema(to_schema.model_fields[name].annotation)
+        nested_model = relationship.mapper.class_
+        if nested_schema is not None and (nested_model, nested_schema) not in seen:
+            loader = loader.options(*_get_nested_options(nested_model, nested_schema, seen))
+
+        loaders.append(loader)
+
+    return loaders
+
+
+def _get_nested_options(from_model: M, to_schema: Type[BaseModel], seen: frozenset) -> list[ExecutableOption]:
+    mapper = inspect(from_model)
+    relationships = _get_schema_relationships(from_model, to_schema)
+    columns = {name for name in to_schema.model_fields if name in mapper.column_attrs}
+    columns |= {
+        mapper.get_property_by_column(column).key
+        for relationship in relationships.values()
+        for column in relationship.local_columns
+    }
+
+    options = _get_relationship_loaders(from_model, to_schema, seen)
+    if columns:
+        options.append(load_only(*(getattr(from_model, key) for key in columns)))
+    return options
+
+
+@lru_cache(maxsize=None)
+def _get_loader_options(from_model: M | None, to_schema: S) -> tuple[ExecutableOption, ...]:
+    """
+    Eager loading plan for `to_schema` fields that are `from_model` relationships.
+
+    Nested schemas are walked recursively: collections get ``selectinload``, scalars get ``joinedload``,
+    related models load only the columns their schemas need. Cached per (model, schema) pair.
+    """
+    if not _is_pydantic(to_schema) or from_model is None:
+        return ()
+
+    return tuple(_get_relationship_loaders(from_model, to_schema, frozenset()))
+
+
+def _collect_related_tables(from_model: M, to_schema: Type[BaseModel], tables: set[str], seen: set):
+    seen.add((from_model, to_schema))
+    for name, relationship in _get_schema_relationships(from_model, to_schema).items():
+        tables.add(relationship.target.name)
+        if relationship.secondary is not None:
+            tables.add(relationship.secondary.name)
+
+        nested_schema = _unwrap_schema(to_schema.model_fields[name].annotation)
+        nested_model = relationship.mapper.class_
+        if nested_schema is not None and (nested_model, nested_schema) not in seen:
+            _collect_related_tables(nested_model, nested_schema, tables, seen)
+
+
+@lru_cache(maxsize=None)
+def _get_related_tables(from_model: M | None, to_schema: S) -> frozenset[str]:
+    """
+    Tables of relationships eager loaded for `to_schema`
+    """
+    tables: set[str] = set()
+    if _is_pydantic(to_schema) and from_model is not None:
+        _collect_related_tables(from_model, to_schema, tables, set())
+    return frozenset(tables)
+
+
+def _get_projected_columns(from_model: M | None, to_schema: S) -> list[Label]:
+    """
+    Model columns labeled as `to_schema` fields, to select them instead of the whole entity
+    """
+    if not _is_pydantic(to_schema) or from_model is None:
+        raise ValueError("Projection requires both model and pydantic schema")
+
+    to_schema: Type[BaseModel]
+    column_attrs = inspect(from_model).column_attrs.keys()
+    columns = []
+    for name, field in to_schema.model_fields.items():
+        if name in column_attrs:
+            columns.append(getattr(from_model, name).label(field.alias or name))
+        elif field.is_required():
+            raise ValueError(
+                f"{to_schema.__name__}.{name} is not a column of {from_model.__name__}, projection is not possible"
+            )
+
+    return columns
+
+
+def _get_options(from_model: M | None, to_schema: S) -> tuple[ExecutableOption, ...]:
+    """
+    Loader options for ORM path: deferred extra columns and eager loaded relationships
+    """
+    extra_columns = _get_extra_columns(from_model, to_schema)
+    deferred = tuple(defer(getattr(from_model, key)) for key in extra_columns)
+    return deferred + _get_loader_options(from_model, to_schema)
+
+
+def _prepare_statement(
+    statement: Select, options: tuple[ExecutableOption, ...], projected_columns: list[Label] | None
+) -> Select:
+    if projected_columns:
+        return statement.with_only_columns(*projected_columns)
+    if options:
+        return statement.options(*options)
+    return statement
+
+
+def _mapped(
+    from_model: M | None,
+    to_schema: S,
+    to_list: bool = False,
+    optional: bool = False,
+    projection: bool = False,
+    cache: QueryCache | None = None,
+) -> Callable[[Callable[P, Select]], Callable[P, Awaitable[S | list[S] | None]]]:
+    initial_type = to_schema
+    to_schema = get_type_adapter(to_schema)
+    list_to_schema = get_type_adapter(list[initial_type])
+    options = _get_options(from_model, initial_type)
+    projected_columns = _get_projected_columns(from_model, initial_type) if projection else None
+    related_tables = _get_related_tables(from_model, initial_type) if not projection else frozenset()
 
     def decorator(func: Callable[P, Select]) -> Callable[P, Awaitable[S | list[S] | None]]:
+        cache_prefix = f"{func.__module__}.{func.__qualname__}"
+        duration_metric = query_duration.labels(cache_prefix)
+        rows_metric = query_rows.labels(cache_prefix)
+
         async def wrapper(*args: P.args, **kwargs: P.kwargs) -> S | list[S] | None:
-            statement = func(*args, **kwargs)
-            if extra_columns:
-                statement = statement.options(defer(*(getattr(from_model, key) for key in extra_columns)))
-            repo: BaseRepository[M] = args[0]
-            if settings.SQL_ENGINE_ECHO:
+            statement = _prepare_statement(func(*args, **kwargs), options, projected_columns)
+            if cache is None:
+                return await execute(args[0], statement)
+
+            key, tables = get_cache_key(cache_prefix, statement)
+            session = args[0].session
+            value = await cache.get(key, session)
+            if value is MISSING:
+                value = await execute(args[0], statement)
+                await cache.set(key, value, tables | related_tables, session)
+            return value
+
+        async def execute(repo: BaseRepository[M], statement: Select) -> S | list[S] | None:
+            if _is_echo_enabled():
                 logger.debug(f"{statement.compile()}")
 
+            started = time.perf_counter()
             result = await repo.execute(statement)
 
-            if from_model is not None:
+            if from_model is not None and not projection:
                 result = result.scalars()
             else:
                 result = result.mappings()
@@ -57,6 +258,8 @@ def _mapped(
                 result = result.all()
             else:
                 result = result.one_or_none()
+            duration_metric.observe(time.perf_counter() - started)
+            rows_metric.observe(len(result) if to_list else int(result is not None))
 
             if result is None and optional:
                 return result
@@ -73,21 +276,96 @@ def _mapped(
 
 @overload
 def mapped(
-    from_model: M | None, to_schema: Type[S], optional: Literal[False] = False
+    from_model: M | None,
+    to_schema: Type[S],
+    optional: Literal[False] = False,
+    projection: bool = False,
+    cache: QueryCache | None = None,
 ) -> Callable[[Callable[P, Select]], Callable[P, Awaitable[S]]]:
     ...
 
 
 @overload
 def mapped(
-    from_model: M | None, to_schema: Type[S], optional: Literal[True] = False
+    from_model: M | None,
+    to_schema: Type[S],
+    optional: Literal[True] = False,
+    projection: bool = False,
+    cache: QueryCache | None = None,
 ) -> Callable[[Callable[P, Select]], Callable[P, Awaitable[S | None]]]:
     ...
 
 
 def mapped(
-    from_model: M | None, to_schema: Type[S | None], optional: bool = False
+    from_model: M | None,
+    to_schema: Type[S | None],
+    optional: bool = False,
+    projection: bool = False,
+    cache: QueryCache | None = None,
 ) -> Callable[[Callable[P, Select]], Callable[P, Awaitable[S | None]]]:
+    """
+    Execute returned statement and validate result into `to_schema` (or `list[...]` of it).
+
+    :param from_model: selected model, ``None`` if statement selects plain columns
+    :param to_schema: schema or ``list[schema]``
+    :param optional: return ``None`` instead of failing validation when nothing is found
+    :param projection: select only schema fields as plain columns and validate rows directly,
+        skipping ORM entities hydration. Every required schema field has to be a model column.
+    :param cache: cache validated results by compiled statement and its parameters, see ``database.cache.QueryCache``
+    """
     if get_origin(to_schema) is list:
-        return _mapped(from_model, get_args(to_schema)[0], to_list=True, optional=optional)
-    return _mapped(from_model, to_schema, optional=optional)
+        return _mapped(
+            from_model, get_args(to_schema)[0], to_list=True, optional=optional, projection=projection, cache=cache
+        )
+    return _mapped(from_model, to_schema, optional=optional, projection=projection, cache=cache)
+
+
+def mapped_stream(
+    from_model: M | None, to_schema: Type[S], chunk_size: int = 1000, projection: bool = False
+) -> Callable[[Callable[P, Select]], Callable[P, AsyncIterator[list[S]]]]:
+    """
+    Streaming version of ``mapped(from_model, list[to_schema])``.
+
+    Statement is executed with server-side cursor (``AsyncSession.stream`` with ``yield_per``),
+    rows are fetched and validated by chunks of ``chunk_size``, so only one chunk
+    of ORM objects and schema objects is held in memory at a time.
+    Wrapped method returns async iterator of validated chunks, suitable for
+    ``fastapi_core.controllers.responses.stream_response``.
+
+    If repository session has ``streaming`` flag (``LazySession`` from ``transactional_middleware_factory`` does),
+    it is set, so transaction is kept open until the response body is fully sent.
+    ``projection`` has the same meaning as in ``mapped``.
+    """
+    list_to_schema = get_type_adapter(list[to_schema])
+    options = _get_options(from_model, to_schema)
+    projected_columns = _get_projected_columns(from_model, to_schema) if projection else None
+
+    def decorator(func: Callable[P, Select]) -> Callable[P, AsyncIterator[list[S]]]:
+        async def stream(repo: BaseRepository[M], statement: Select) -> AsyncIterator[list[S]]:
+            result = await repo.session.stream(statement)
+
+            if from_model is not None and not projection:
+                result = result.scalars()
+            else:
+                result = result.mappings()
+
+            async for partition in result.partitions(chunk_size):
+                yield list_to_schema.validate_python(partition)
+
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> AsyncIterator[list[S]]:
+            statement = _prepare_statement(func(*args, **kwargs), options, projected_columns)
+            statement = statement.execution_options(yield_per=chunk_size)
+            repo: BaseRepository[M] = args[0]
+            if _is_echo_enabled():
+                logger.debug(f"{statement.compile()}")
+
+            # marked on call, not on iteration: iteration starts only when response body is being sent
+            # duck typed, so data layer doesn't depend on middleware
+            if hasattr(repo.session, "streaming"):
+                repo.session.streaming = True
+
+            return stream(repo, statement)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,69 @@
+from typing import Any, Callable, Iterable, Mapping
+
+from fastapi_core.metrics.registry import Sample, get_stats_samples
+
+
+def get_pool_collector(engines: Mapping[str, Any]) -> Callable[[], Iterable[Sample]]:
+    """
+    :param engines: name to ``Engine``/``AsyncEngine`` mapping, see ``database.pool.get_pool_stats``
+    """
+
+    def collect() -> list[Sample]:
+        from fastapi_core.database.pool import get_pool_stats
+
+        stats = {name: get_pool_stats(engine) for name, engine in engines.items()}
+        return get_stats_samples(
+            "db_pool",
+            "Database connection pool",
+            stats,
+            "engine",
+            counters=("checkouts", "checkout_timeouts", "checkout_time_total"),
+        )
+
+    return collect
+
+
+def get_cache_collector(caches: Mapping[str, Any]) -> Callable[[], Iterable[Sample]]:
+    """
+    :param caches: name to cache mapping, any object with ``stats()``,
+        e.g. ``database.cache.QueryCache`` or ``gateways.cache.HTTPCache``
+    """
+
+    def collect() -> list[Sample]:
+        stats = {name: cache.stats() for name, cache in caches.items()}
+        return get_stats_samples(
+            "cache",
+            "Cache",
+            stats,
+            "cache",
+            counters=("hits", "misses", "revalidations", "evictions", "invalidations"),
+        )
+
+    return collect
+
+
+def collect_gateways() -> list[Sample]:
+    """
+    Connection pools of ``gateways.clients.client_registry`` clients, circuit breakers and retry budget
+    """
+    from fastapi_core.gateways.clients import client_registry
+    from fastapi_core.gateways.resilience import get_resilience_stats
+
+    resilience = get_resilience_stats()
+    return [
+        *get_stats_samples("http_client_pool", "Gateway client connection pool", client_registry.stats(), "upstream"),
+        *get_stats_samples(
+            "circuit_breaker",
+            "Gateway circuit breaker",
+            resilience["circuit_breakers"],
+            "upstream",
+            counters=("rejected", "opened"),
+        ),
+        *get_stats_samples(
+            "retry_budget",
+            "Gateway retry budget",
+            {"global": resilience["retry_budget"]},
+            "budget",
+            counters=("exhausted",),
+        ),
+    ]
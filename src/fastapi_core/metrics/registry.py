@@ -0,0 +1,381 @@
+import json
+import math
+import os
+import tempfile
+import threading
+from bisect import bisect_left
+from typing import Callable, Iterable, Literal, NamedTuple, Sequence
+
+MetricType = Literal["counter", "gauge", "histogram"]
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ROWS_BUCKETS = (0, 1, 5, 10, 50, 100, 500, 1000, 5000, 10000)
+
+
+class Sample(NamedTuple):
+    """
+    Scrape time value of a collector, e.g. connection pool size
+    """
+
+    name: str
+    type: MetricType
+    documentation: str
+    labels: dict[str, str]
+    value: float
+
+
+class CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+
+class GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+
+class HistogramChild:
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        # non cumulative, the last one is +Inf
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class Metric:
+    """
+    Metric family, values are kept per label values in children:
+
+        requests = registry.counter("requests_total", "Requests", ("method",))
+        requests.labels("GET").inc()
+
+    Recording is not synchronized: children are created with atomic ``dict.setdefault`` and updated
+    with plain attribute arithmetic, that is exact on the event loop thread. Concurrent updates
+    of the same child from other threads could rarely be lost.
+    """
+
+    type: MetricType
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], CounterChild | GaugeChild | HistogramChild] = {}
+
+    def _create_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            child = self._children.setdefault(tuple(map(str, values)), self._create_child())
+        return child
+
+    def _get_value(self, child) -> float | list:
+        return child.value
+
+    def collect(self) -> dict:
+        return {
+            "type": self.type,
+            "documentation": self.documentation,
+            "labelnames": list(self.labelnames),
+            # list() of dict items is atomic, so children could be added concurrently
+            "samples": [[*labels, self._get_value(child)] for labels, child in list(self._children.items())],
+        }
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def _create_child(self) -> CounterChild:
+        return CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def _create_child(self) -> GaugeChild:
+        return GaugeChild()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self.labels().dec(amount)
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _create_child(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def _get_value(self, child: HistogramChild) -> list:
+        return [list(child.counts), child.sum]
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def collect(self) -> dict:
+        return {**super().collect(), "buckets": list(self.buckets)}
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 2**53:
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """
+    In-process metrics rendered in Prometheus text format.
+
+    With multiple workers every process periodically writes its snapshot into shared `directory`
+    (``METRICS_MULTIPROCESS_DIR``), the scraped process merges them: counters and histograms are summed
+    over all files, gauges only over alive processes. The directory should be emptied on deploy.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+        self._collectors: list[Callable[[], Iterable[Sample]]] = []
+        self.directory: str | None = None
+        self.flush_interval = 5.0
+        self._flusher: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def _get_or_create(self, cls: type[Metric], name: str, *args, **kwargs) -> Metric:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics.setdefault(name, cls(name, *args, **kwargs))
+        if not isinstance(metric, cls):
+            raise ValueError(f"Metric {name} is already registered as {metric.type}")
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets)
+
+    def add_collector(self, collector: Callable[[], Iterable[Sample]]):
+        """
+        :param collector: function called on every collection (scrape or flush), e.g. to report pool stats
+        """
+        self._collectors.append(collector)
+
+    def collect(self) -> dict[str, dict]:
+        """
+        :returns: JSON serializable snapshot of metrics and collector samples of this process
+        """
+        families = {name: metric.collect() for name, metric in list(self._metrics.items())}
+        for collector in self._collectors:
+            for sample in collector():
+                family = families.setdefault(
+                    sample.name,
+                    {
+                        "type": sample.type,
+                        "documentation": sample.documentation,
+                        "labelnames": list(sample.labels),
+                        "samples": [],
+                    },
+                )
+                family["samples"].append([*map(str, sample.labels.values()), sample.value])
+        return families
+
+    def configure(self, directory: str | None = None, flush_interval: float = 5.0):
+        """
+        Enable multiprocess mode: start background thread that writes snapshot into `directory`
+        every `flush_interval` seconds. Thread is restarted in forked workers.
+        """
+        self.directory = directory
+        self.flush_interval = flush_interval
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._start_flusher()
+
+    def _start_flusher(self):
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="metrics-flusher", daemon=True)
+        self._flusher.start()
+
+    def _after_fork(self):
+        self._flusher = None
+        if self.directory is not None:
+            self._start_flusher()
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """
+        Write snapshot of this process into multiprocess directory
+        """
+        if self.directory is None:
+            return
+        pid = os.getpid()
+        data = json.dumps({"pid": pid, "metrics": self.collect()}, separators=(",", ":"))
+        fd, path = tempfile.mkstemp(dir=self.directory, prefix=".tmp")
+        with os.fdopen(fd, "w") as file:
+            file.write(data)
+        os.replace(path, os.path.join(self.directory, f"{pid}.json"))
+
+    def stop(self):
+        self._stop.set()
+        self.flush()
+
+    def _read_snapshots(self) -> list[tuple[int, dict]]:
+        pid = os.getpid()
+        snapshots = [(pid, self.collect())]
+        for file_name in os.listdir(self.directory):
+            if not file_name.endswith(".json") or file_name == f"{pid}.json":
+                continue
+            try:
+                with open(os.path.join(self.directory, file_name)) as file:
+                    data = json.load(file)
+            except (OSError, ValueError):
+                continue
+            snapshots.append((data["pid"], data["metrics"]))
+        return snapshots
+
+    def render(self) -> str:
+        """
+        :returns: metrics of this process (or of all processes in multiprocess mode) in Prometheus text format
+        """
+        snapshots = [(os.getpid(), self.collect())] if self.directory is None else self._read_snapshots()
+
+        merged: dict[str, dict] = {}
+        for pid, families in snapshots:
+            alive = None
+            for name, family in families.items():
+                if family["type"] == "gauge":
+                    alive = _is_alive(pid) if alive is None else alive
+                    if not alive:
+                        continue
+                target = merged.setdefault(name, {**family, "samples": {}})
+                samples = target["samples"]
+                for *labels, value in family["samples"]:
+                    labels = tuple(labels)
+                    if family["type"] != "histogram":
+                        samples[labels] = samples.get(labels, 0.0) + value
+                    elif labels not in samples:
+                        samples[labels] = [list(value[0]), value[1]]
+                    else:
+                        counts, total = samples[labels]
+                        samples[labels] = [[a + b for a, b in zip(counts, value[0])], total + value[1]]
+
+        lines = []
+        for name, family in sorted(merged.items()):
+            lines.append(f"# HELP {name} {_escape(family['documentation'])}")
+            lines.append(f"# TYPE {name} {family['type']}")
+            labelnames = family["labelnames"]
+            for labels, value in sorted(family["samples"].items()):
+                if family["type"] != "histogram":
+                    lines.append(f"{name}{_format_labels(labelnames, labels)} {_format_value(value)}")
+                    continue
+
+                counts, total = value
+                cumulative = 0
+                for bound, count in zip((*family["buckets"], math.inf), counts):
+                    cumulative += count
+                    le = f'le="{_format_value(bound)}"'
+                    lines.append(f"{name}_bucket{_format_labels(labelnames, labels, le)} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labelnames, labels)} {_format_value(total)}")
+                lines.append(f"{name}_count{_format_labels(labelnames, labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=registry._after_fork)
+
+
+def get_stats_samples(
+    prefix: str,
+    documentation: str,
+    stats: dict[str, dict[str, float | str]],
+    label: str,
+    counters: Iterable[str] = (),
+) -> list[Sample]:
+    """
+    Samples of ``stats()`` results keyed by `label` value, e.g. ``client_registry.stats()``:
+    ``{prefix}_{stat}{label="key"}``. Non numeric stats are reported as ``{prefix}_{stat}{..., value="..."} 1``.
+
+    :param counters: cumulative stats, the rest are gauges
+    """
+    counters = set(counters)
+    samples = []
+    for key, values in stats.items():
+        for stat, value in values.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                samples.append(Sample(f"{prefix}_{stat}", "gauge", documentation, {label: key, "value": str(value)}, 1))
+            else:
+                metric_type = "counter" if stat in counters else "gauge"
+                samples.append(Sample(f"{prefix}_{stat}", metric_type, documentation, {label: key}, value))
+    return samples
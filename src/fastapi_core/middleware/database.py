@@ -1,48 +1,213 @@
 import logging
-from typing import Awaitable, Callable, Any
+import time
+from typing import AsyncIterator, Awaitable, Callable, Any, Collection
 
-from fastapi.requests import Request
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from fastapi_core.database.cache import finish_session
+from fastapi_core.database.instrumentation import QueryStats, collect_query_stats
 from fastapi_core.logging import get_logger
+from fastapi_core.metrics.registry import registry
+
+session_duration = registry.histogram(
+    "db_session_duration_seconds", "Request session lifetime from the first use to close", ("read_only",)
+)
+commit_duration = registry.histogram("db_commit_duration_seconds", "Request transaction commit duration")
+transactions = registry.counter("db_transactions_total", "Finished request transactions", ("result",))
 
 
 class LazySession:
-    def __init__(self, factory: Callable[[], AsyncSession], logger: logging.Logger):
+    def __init__(
+        self,
+        factory: Callable[[], AsyncSession],
+        logger: logging.Logger,
+        read_only_factory: Callable[[], AsyncSession] | None = None,
+        read_only: bool = False,
+        query_stats: QueryStats | None = None,
+    ):
         self._factory = factory
+        self._read_only_factory = read_only_factory
         self._logger = logger
         self.session: AsyncSession | None = None
+        self.started_at: float | None = None
+        self._session_read_only = False
+        # could be changed until the session is started, e.g. by `controllers.dependencies.read_only`
+        self.read_only = read_only
+        # set when response body is produced from the session (e.g. by `mapped_stream`),
+        # transaction is finished only after the body is sent
+        self.streaming = False
+        # statements of instrumented engines executed within request, see `database.instrumentation`
+        self.query_stats = query_stats or QueryStats()
+
+    @property
+    def is_read_only(self) -> bool:
+        """
+        Whether session is (or will be) created by read only factory
+        """
+        if self.session:
+            return self._session_read_only
+        return self.read_only and self._read_only_factory is not None
 
     def __getattr__(self, key: str) -> Any:
         if not self.session:
-            self.session = self._factory()
-            self._logger.debug(f"Started new session {self.session}")
+            self._session_read_only = self.is_read_only
+            self.session = self._read_only_factory() if self._session_read_only else self._factory()
+            self.started_at = time.perf_counter()
+            self._logger.debug(f"Started new {'read only ' if self._session_read_only else ''}session {self.session}")
 
         return getattr(self.session, key)
 
 
-def transactional_middleware_factory(create_async_session: Callable[[], AsyncSession]):
+async def _commit(lazy_session: LazySession, logger: logging.Logger):
+    if lazy_session.session and not lazy_session.is_read_only:
+        started = time.perf_counter()
+        await lazy_session.session.commit()
+        commit_duration.observe(time.perf_counter() - started)
+        transactions.labels("commit").inc()
+        logger.debug(f"Transaction committed for session {lazy_session.session}")
+        await finish_session(lazy_session.session, committed=True)
+
+
+async def _rollback(lazy_session: LazySession, logger: logging.Logger):
+    if lazy_session.session:
+        await lazy_session.session.rollback()
+        transactions.labels("rollback").inc()
+        await finish_session(lazy_session.session, committed=False)
+        logger.debug(f"Transaction rolled back for session {lazy_session.session}")
+
+
+async def _close(lazy_session: LazySession, logger: logging.Logger):
+    if lazy_session.session:
+        await lazy_session.session.close()
+        session_duration.labels(str(lazy_session.is_read_only).lower()).observe(
+            time.perf_counter() - lazy_session.started_at
+        )
+        logger.debug(f"Session {lazy_session.session} closed")
+
+
+def transactional_middleware_factory(
+    create_async_session: Callable[[], AsyncSession],
+    create_read_only_session: Callable[[], AsyncSession] | None = None,
+    read_only_methods: Collection[str] = ("GET", "HEAD", "OPTIONS"),
+    server_timing: bool = False,
+):
+    """
+    :param create_async_session: primary session factory
+    :param create_read_only_session: session factory for read only requests,
+        e.g. ``database.sessions.get_read_only_session_factory(*replica_engines)``.
+        Read only sessions are never committed.
+    :param read_only_methods: request methods that use read only session by default
+    :param server_timing: add ``Server-Timing`` header with statements count and duration
+        (requires instrumented session factories)
+    """
     logger = get_logger("api.middleware.session")
 
+    async def finish_after_body(body_iterator: AsyncIterator[bytes], lazy_session: LazySession):
+        try:
+            async for chunk in body_iterator:
+                yield chunk
+            await _commit(lazy_session, logger)
+        except BaseException:
+            await _rollback(lazy_session, logger)
+            raise
+        finally:
+            await _close(lazy_session, logger)
+
     async def transactional_middleware(request: Request, call_next: Callable[[Request], Awaitable]):
-        lazy_session = LazySession(factory=create_async_session, logger=logger)
+        with collect_query_stats() as query_stats:
+            lazy_session = LazySession(
+                factory=create_async_session,
+                logger=logger,
+                read_only_factory=create_read_only_session,
+                read_only=request.method in read_only_methods,
+                query_stats=query_stats,
+            )
 
-        request.state.session = lazy_session
-        try:
-            response = await call_next(request)
-            if lazy_session.session:
-                await lazy_session.session.commit()
-                logger.debug(f"Transaction committed for session {lazy_session.session}")
+            request.state.session = lazy_session
+            streaming = False
+            try:
+                response = await call_next(request)
+                if lazy_session.streaming:
+                    streaming = True
+                    response.body_iterator = finish_after_body(response.body_iterator, lazy_session)
+                else:
+                    await _commit(lazy_session, logger)
+
+                if server_timing:
+                    response.headers.append("Server-Timing", query_stats.get_server_timing())
+                return response
+            except Exception:
+                await _rollback(lazy_session, logger)
+                raise
+            finally:
+                if not streaming:
+                    await _close(lazy_session, logger)
 
-            return response
+    return transactional_middleware
+
+
+class TransactionalMiddleware:
+    """
+    Pure ASGI version of `transactional_middleware_factory`.
+
+    Transaction is committed right before the response start is sent, so commit failure still
+    results in error response. For streaming responses (see `LazySession.streaming`)
+    it is committed after the whole body is sent.
+    With `server_timing` statements count and duration (commit included) are sent in ``Server-Timing`` header.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        create_async_session: Callable[[], AsyncSession],
+        create_read_only_session: Callable[[], AsyncSession] | None = None,
+        read_only_methods: Collection[str] = ("GET", "HEAD", "OPTIONS"),
+        server_timing: bool = False,
+    ):
+        self.app = app
+        self.create_async_session = create_async_session
+        self.create_read_only_session = create_read_only_session
+        self.read_only_methods = read_only_methods
+        self.server_timing = server_timing
+        self.logger = get_logger("api.middleware.session")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        with collect_query_stats() as query_stats:
+            await self._handle(scope, receive, send, query_stats)
+
+    async def _handle(self, scope: Scope, receive: Receive, send: Send, query_stats: QueryStats):
+        lazy_session = LazySession(
+            factory=self.create_async_session,
+            logger=self.logger,
+            read_only_factory=self.create_read_only_session,
+            read_only=scope["method"] in self.read_only_methods,
+            query_stats=query_stats,
+        )
+        scope.setdefault("state", {})["session"] = lazy_session
+        committed = False
+
+        async def send_wrapper(message: Message):
+            nonlocal committed
+            if message["type"] == "http.response.start":
+                if not lazy_session.streaming:
+                    await _commit(lazy_session, self.logger)
+                    committed = True
+                if self.server_timing:
+                    header = (b"server-timing", query_stats.get_server_timing().encode("latin-1"))
+                    message["headers"] = [*message.get("headers", ()), header]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+            if not committed:
+                await _commit(lazy_session, self.logger)
         except Exception:
-            if lazy_session.session:
-                await lazy_session.session.rollback()
-                logger.debug(f"Transaction rolled back for session {lazy_session.session}")
+            await _rollback(lazy_session, self.logger)
             raise
         finally:
-            if lazy_session.session:
-                await lazy_session.session.close()
-                logger.debug(f"Session {lazy_session.session} closed")
-
-    return transactional_middleware
+            await _close(lazy_session, self.logger)
@@ -1,8 +1,26 @@
+import sys
 import traceback
 from typing import Callable, Awaitable
 
 from starlette.requests import Request
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+def _get_exception_response(exc: Exception) -> JSONResponse:
+    # exception modules are looked up instead of imported, so gateway (httpx) and pagination dependencies
+    # are not loaded with middleware. Exception can't be raised if its module was never imported.
+    gateway_exceptions = sys.modules.get("fastapi_core.gateways.exceptions")
+    if gateway_exceptions is not None and isinstance(exc, gateway_exceptions.CircuitOpenException):
+        return JSONResponse(
+            {"message": str(exc)}, 503, headers={"Retry-After": str(max(round(exc.retry_after), 1))}
+        )
+    tokens = sys.modules.get("fastapi_core.schemas.tokens")
+    if tokens is not None and isinstance(exc, tokens.InvalidPageTokenException):
+        return JSONResponse({"message": str(exc)}, 400)
+    return JSONResponse(
+        {"message": f"{exc.__class__.__name__}: {exc}", "traceback": traceback.format_exception(exc)}, 500
+    )
 
 
 async def json_exceptions_wrapper_middleware(request: Request, call_next: Callable[[Request], Awaitable]):
@@ -12,6 +30,33 @@ async def json_exceptions_wrapper_middleware(request: Request, call_next: Callab
     try:
         return await call_next(request)
     except Exception as exc:
-        return JSONResponse(
-            {"message": f"{exc.__class__.__name__}: {exc}", "traceback": traceback.format_exception(exc)}, 500
-        )
+        return _get_exception_response(exc)
+
+
+class JSONExceptionsMiddleware:
+    """
+    Pure ASGI version of `json_exceptions_wrapper_middleware`.
+    If the response has already started, exception is re-raised.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        response_started = False
+
+        async def send_wrapper(message: Message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            if response_started:
+                raise
+            await _get_exception_response(exc)(scope, receive, send)
@@ -1,17 +1,45 @@
 from typing import Callable, Awaitable
 
-from fastapi.requests import Request
 from loguru import logger
+from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from fastapi_core.database.instrumentation import collect_query_stats
 
 
 async def logger_context_middleware(request: Request, call_next: Callable[[Request], Awaitable]):
     """
     JSONResponse exception wrapping
     """
-    with logger.contextualize(
+    # statements count and duration of the request are rendered live, e.g. "3 queries 12.5ms"
+    with collect_query_stats() as query_stats, logger.contextualize(
         method=request.method,
         path=request.url.path,
         query=request.url.query,
-        user=request.user.sub if request.user else None
+        user=request.user.sub if request.user else None,
+        db=query_stats,
     ):
         return await call_next(request)
+
+
+class LoggerContextMiddleware:
+    """
+    Pure ASGI version of `logger_context_middleware`
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        user = scope.get("user")
+        with collect_query_stats() as query_stats, logger.contextualize(
+            method=scope["method"],
+            path=scope.get("root_path", "") + scope["path"],
+            query=scope.get("query_string", b"").decode("latin-1"),
+            user=getattr(user, "sub", None) if user else None,
+            db=query_stats,
+        ):
+            await self.app(scope, receive, send)
@@ -0,0 +1,47 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from fastapi_core.metrics.registry import MetricsRegistry, registry as default_registry
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware that counts requests by route template and status code and measures their duration
+    (until the whole body is sent). Unmatched requests are counted as ``<unmatched>`` route.
+    """
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry = default_registry):
+        self.app = app
+        self.requests = registry.counter(
+            "http_requests_total", "HTTP requests by route and status code", ("method", "route", "status")
+        )
+        self.duration = registry.histogram(
+            "http_request_duration_seconds", "HTTP request duration by route", ("method", "route")
+        )
+        self.in_progress = registry.gauge("http_requests_in_progress", "HTTP requests in progress", ("method",))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = "500"
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        method = scope["method"]
+        in_progress = self.in_progress.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            # route is set by router, so it is known only after the request is handled
+            route = getattr(scope.get("route"), "path", None) or "<unmatched>"
+            self.duration.labels(method, route).observe(time.perf_counter() - started)
+            self.requests.labels(method, route, status).inc()
@@ -1,14 +1,214 @@
-from fastapi.requests import Request
+import os
+import random
+import sys
+import time
+from collections import Counter, deque
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterable
+
 from pyinstrument import Profiler
+from starlette.datastructures import QueryParams
+from starlette.requests import Request
 from starlette.responses import HTMLResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+if TYPE_CHECKING:
+    from fastapi_core.settings.profiler import ProfilerSettings
+
+Frame = tuple[str, str | None, int | None]
+
+TRUNCATED_STACK: tuple[Frame, ...] = (("[truncated]", None, None),)
+
+
+def get_profiler_settings() -> "ProfilerSettings":
+    from fastapi_core.settings.profiler import ProfilerSettings
+    from fastapi_core.settings.registry import get_settings
+
+    return get_settings(ProfilerSettings)
+
+
+@lru_cache(maxsize=8192)
+def _get_frame(identifier: str) -> Frame:
+    """
+    pyinstrument frame identifier ``function\\x00file\\x00line[\\x01cClass]...`` -> (name, file, line)
+    """
+    parts = identifier.split("\x00")
+    if len(parts) < 3:
+        return identifier, None, None  # [await], [self], etc.
+
+    function, file, line = parts[0], parts[1], parts[2].split("\x01")
+    for attribute in line[1:]:
+        if attribute.startswith("c"):
+            function = f"{attribute[1:]}.{function}"
+
+    # paths relative to sys.path entries, so site-packages and project prefixes don't bloat stacks
+    for path in sorted(sys.path, key=len, reverse=True):
+        if path and file.startswith(path + os.sep):
+            file = file[len(path) + 1 :]
+            break
+    return function, file, int(line[0]) if line[0].isdigit() else None
+
+
+def _get_frame_name(frame: Frame) -> str:
+    function, file, line = frame
+    return function if file is None else f"{function} ({file}:{line})"
+
+
+class ProfileAggregator:
+    """
+    Wall time of sampled requests aggregated by route and stack over rolling window of `window` seconds.
+
+    Window is split into `buckets`, the oldest bucket is dropped as a whole, so memory is bounded by
+    ``buckets * routes * max_stacks``.
+    """
+
+    def __init__(self, window: float = 600, buckets: int = 10, max_stacks: int = 10000):
+        """
+        :param window: seconds stacks are kept for
+        :param buckets: number of window parts
+        :param max_stacks: unique stacks per route and bucket, time of other stacks is added to ``[truncated]``
+        """
+        self.bucket_duration = window / buckets
+        self.max_stacks = max_stacks
+        self._buckets: deque[tuple[int, dict[str, Counter[tuple[Frame, ...]]]]] = deque(maxlen=buckets)
+        self._requests: deque[tuple[int, Counter]] = deque(maxlen=buckets)
+
+    def _expire(self, now: int):
+        oldest = now - self._buckets.maxlen + 1
+        while self._buckets and self._buckets[0][0] < oldest:
+            self._buckets.popleft()
+            self._requests.popleft()
+
+    def _get_bucket(self) -> tuple[dict[str, Counter], Counter]:
+        now = int(time.monotonic() // self.bucket_duration)
+        self._expire(now)
+        if not self._buckets or self._buckets[-1][0] != now:
+            self._buckets.append((now, {}))
+            self._requests.append((now, Counter()))
+        return self._buckets[-1][1], self._requests[-1][1]
+
+    def add(self, route: str, records: Iterable[tuple[tuple[Frame, ...], float]]):
+        """
+        :param route: aggregation key, e.g. ``GET /users/{user_id}``
+        :param records: (stack of (function, file, line) frames from the root, seconds) pairs
+        """
+        stacks, requests = self._get_bucket()
+        route_stacks = stacks.setdefault(route, Counter())
+        requests[route] += 1
+        for stack, duration in records:
+            if stack not in route_stacks and len(route_stacks) >= self.max_stacks:
+                stack = TRUNCATED_STACK
+            route_stacks[stack] += duration
+
+    def add_session(self, route: str, profiler: Profiler, root: str | None = None):
+        """
+        Add pyinstrument session of finished `profiler`
+
+        :param root: file name to cut stack prefix at, frames up to the last frame of that file are dropped
+        """
+        records = []
+        for identifiers, duration in profiler.last_session.frame_records:
+            start = 1  # thread frame
+            if root is not None:
+                for i, identifier in enumerate(identifiers):
+                    if f"\x00{root}\x00" in identifier:
+                        start = i + 1
+            records.append((tuple(_get_frame(identifier) for identifier in identifiers[start:]), duration))
+        self.add(route, records)
 
-from fastapi_core.settings.profiler import ProfilerSettings
+    def get_stacks(self, route: str | None = None) -> dict[str, Counter]:
+        """
+        :param route: route to get stacks of, all routes if omitted
+        :returns: seconds spent by route and stack within window
+        """
+        self._expire(int(time.monotonic() // self.bucket_duration))
+        result: dict[str, Counter] = {}
+        for _, stacks in self._buckets:
+            for key, route_stacks in stacks.items():
+                if route is None or key == route:
+                    result.setdefault(key, Counter()).update(route_stacks)
+        return result
 
-settings = ProfilerSettings()
+    def get_requests(self) -> Counter:
+        """
+        :returns: number of sampled requests by route within window
+        """
+        self._expire(int(time.monotonic() // self.bucket_duration))
+        result = Counter()
+        for _, requests in self._requests:
+            result.update(requests)
+        return result
+
+    def collapsed(self, route: str | None = None) -> str:
+        """
+        Collapsed stacks (``route;frame;frame microseconds`` lines) for flamegraph.pl, speedscope, etc.
+        """
+        lines = []
+        for key, stacks in sorted(self.get_stacks(route).items()):
+            for stack, duration in stacks.items():
+                if (microseconds := round(duration * 1_000_000)) > 0:
+                    stack = ";".join((key, *map(_get_frame_name, stack))).replace("\n", " ")
+                    lines.append(f"{stack} {microseconds}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def speedscope(self, route: str | None = None) -> dict:
+        """
+        speedscope file format (https://www.speedscope.app/file-format-schema.json), one sampled profile per route
+        """
+        frames, indexes, profiles = [], {}, []
+        requests = self.get_requests()
+        for key, stacks in sorted(self.get_stacks(route).items()):
+            samples, weights = [], []
+            for stack, duration in stacks.items():
+                sample = []
+                for frame in stack:
+                    if frame not in indexes:
+                        function, file, line = frame
+                        indexes[frame] = len(frames)
+                        frames.append({"name": function, **({"file": file, "line": line} if file else {})})
+                    sample.append(indexes[frame])
+                samples.append(sample)
+                weights.append(duration)
+            profiles.append(
+                {
+                    "type": "sampled",
+                    "name": f"{key} ({requests[key]} requests)",
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            )
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": profiles,
+            "exporter": "fastapi_core",
+        }
+
+    def clear(self):
+        self._buckets.clear()
+        self._requests.clear()
+
+
+@lru_cache
+def get_profile_aggregator() -> ProfileAggregator:
+    """
+    Process wide aggregator configured with `ProfilerSettings`
+    """
+    settings = get_profiler_settings()
+    return ProfileAggregator(settings.PROFILER_WINDOW, settings.PROFILER_WINDOW_BUCKETS, settings.PROFILER_MAX_STACKS)
+
+
+def _get_route_name(scope: Scope) -> str:
+    route = getattr(scope.get("route"), "path", None) or "<unmatched>"
+    return f"{scope['method']} {route}"
 
 
 async def profile_request_middleware(request: Request, call_next):
-    profiling = request.query_params.get(settings.PROFILER_QUERY_PARAM, False)
+    settings = get_profiler_settings()
+    profiling = settings.PROFILING_ENABLED and request.query_params.get(settings.PROFILER_QUERY_PARAM, False)
     if profiling:
         profiler = Profiler(interval=settings.PROFILER_INTERVAL, async_mode="enabled")
         profiler.start()
@@ -17,3 +217,64 @@ async def profile_request_middleware(request: Request, call_next):
         return HTMLResponse(profiler.output_html())
     else:
         return await call_next(request)
+
+
+class ProfilerMiddleware:
+    """
+    Pure ASGI version of `profile_request_middleware`.
+
+    Also profiles random `PROFILER_SAMPLE_RATE` fraction of requests (at most `PROFILER_MAX_CONCURRENT`
+    at the same time) without touching responses, their stacks are aggregated by route in `aggregator`,
+    see `fastapi_core.controllers.profiler.add_profiler_controller`.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        profiler_settings: "ProfilerSettings | None" = None,
+        aggregator: ProfileAggregator | None = None,
+    ):
+        self.app = app
+        self.settings = profiler_settings or get_profiler_settings()
+        self.aggregator = aggregator or get_profile_aggregator()
+        self.profiling = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self.settings.PROFILING_ENABLED:
+            return await self.app(scope, receive, send)
+
+        if QueryParams(scope.get("query_string", b"")).get(self.settings.PROFILER_QUERY_PARAM):
+            return await self._profile_html(scope, receive, send)
+
+        if (
+            self.settings.PROFILER_SAMPLE_RATE
+            and self.profiling < self.settings.PROFILER_MAX_CONCURRENT
+            and random.random() < self.settings.PROFILER_SAMPLE_RATE
+        ):
+            return await self._profile_sample(scope, receive, send)
+
+        await self.app(scope, receive, send)
+
+    async def _profile_sample(self, scope: Scope, receive: Receive, send: Send):
+        profiler = Profiler(interval=self.settings.PROFILER_INTERVAL, async_mode="enabled")
+        self.profiling += 1
+        profiler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.stop()
+            self.profiling -= 1
+            self.aggregator.add_session(_get_route_name(scope), profiler, root=__file__)
+
+    async def _profile_html(self, scope: Scope, receive: Receive, send: Send):
+        async def discard(message: Message):
+            ...
+
+        profiler = Profiler(interval=self.settings.PROFILER_INTERVAL, async_mode="enabled")
+        profiler.start()
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            profiler.stop()
+
+        await HTMLResponse(profiler.output_html())(scope, receive, send)
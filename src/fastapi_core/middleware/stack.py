@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Collection
+
+from fastapi_core.middleware.exceptions import JSONExceptionsMiddleware
+
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def add_core_middleware(
+    app: FastAPI,
+    create_async_session: Callable[[], AsyncSession] | None = None,
+    create_read_only_session: Callable[[], AsyncSession] | None = None,
+    read_only_methods: Collection[str] = ("GET", "HEAD", "OPTIONS"),
+    logger_context: bool = True,
+    profiling: bool = False,
+    metrics: bool = False,
+    server_timing: bool = False,
+):
+    """
+    Install pure ASGI core middleware stack, from outermost to innermost:
+    metrics -> JSON exceptions -> logger context -> profiler -> transactions.
+
+    :param app: application
+    :param create_async_session: session factory, transactions middleware is not installed if omitted
+    :param create_read_only_session: read only session factory, see `transactional_middleware_factory`
+    :param read_only_methods: request methods that use read only session by default
+    :param logger_context: install loguru context middleware (requires loguru)
+    :param profiling: install profiler middleware, on demand and sampled, see `ProfilerSettings` (requires pyinstrument)
+    :param metrics: install request metrics middleware, see `fastapi_core.controllers.metrics.add_metrics_controller`
+    :param server_timing: send statements count and duration in ``Server-Timing`` header,
+        see `fastapi_core.database.instrumentation`
+    """
+    # middleware added last is the outermost one
+    if create_async_session is not None:
+        from fastapi_core.middleware.database import TransactionalMiddleware
+
+        app.add_middleware(
+            TransactionalMiddleware,
+            create_async_session=create_async_session,
+            create_read_only_session=create_read_only_session,
+            read_only_methods=read_only_methods,
+            server_timing=server_timing,
+        )
+
+    if profiling:
+        from fastapi_core.middleware.profiler import ProfilerMiddleware
+
+        app.add_middleware(ProfilerMiddleware)
+
+    if logger_context:
+        from fastapi_core.middleware.logger import LoggerContextMiddleware
+
+        app.add_middleware(LoggerContextMiddleware)
+
+    app.add_middleware(JSONExceptionsMiddleware)
+
+    if metrics:
+        from fastapi_core.middleware.metrics import MetricsMiddleware
+
+        app.add_middleware(MetricsMiddleware)
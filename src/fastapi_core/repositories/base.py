@@ -1,20 +1,74 @@
+from __future__ import annotations
+
 import abc
-from typing import Generic, TypeVar, Iterable
+import asyncio
+from itertools import chain, islice
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Generic,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+    TypeVar,
+)
 
+from sqlalchemy import insert, inspect, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql import CompoundSelect, Delete, Select, Update
+from sqlalchemy.sql import CompoundSelect, Delete, Insert, Select, Update
+
+from fastapi_core.database.cache import touch_tables
+from fastapi_core.repositories.counting import CountStrategy, count
+
+if TYPE_CHECKING:
+    # schemas require pydantic, they are imported on use
+    from fastapi_core.database.cache import QueryCache
+    from fastapi_core.schemas.base import (
+        EstimatedPaginatedResponseSchema,
+        PaginatedRequestSchema,
+        PaginatedResponseSchema,
+    )
 
 T = TypeVar("T")
 
 
+def _batches(values: Iterable[Mapping[str, Any]], size: int) -> Iterator[list[Mapping[str, Any]]]:
+    iterator = iter(values)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
 class BaseRepository(abc.ABC, Generic[T]):
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def save(self, obj: T) -> T:
+    async def save(self, obj: T, refresh: bool = False) -> T:
+        """
+        Add `obj` to session and flush it.
+
+        Server generated values (id, created_at, updated_at, etc.) are fetched by the flush itself
+        with ``RETURNING`` when mapper has ``eager_defaults`` enabled (``ExtendedBase`` does).
+        Only column attributes that are still expired after flush are refreshed with additional ``SELECT``,
+        relationships are not reloaded (eager loaded ones were loaded by full refresh before),
+        pass ``refresh=True`` if they are needed after save.
+
+        :param obj: object to save
+        :param refresh: refresh the whole object after flush, including eager loaded relationships
+        :returns: saved object
+        """
         self.session.add(obj)
         await self.session.flush()
-        await self.session.refresh(obj)
+        if refresh:
+            await self.session.refresh(obj)
+            return obj
+
+        state = inspect(obj)
+        expired = state.expired_attributes.intersection(state.mapper.column_attrs.keys())
+        if expired:
+            await self.session.refresh(obj, attribute_names=expired)
         return obj
 
     async def one_or_none(self, statement: Select | CompoundSelect) -> T | None:
@@ -34,3 +88,200 @@ class BaseRepository(abc.ABC, Generic[T]):
 
     async def first(self, statement: Select | CompoundSelect) -> T | None:
         return (await self.session.execute(statement)).scalars().first()
+
+    async def paginate(
+        self,
+        statement: Select,
+        request: PaginatedRequestSchema,
+        count_strategy: CountStrategy = "exact",
+        count_cap: int = 10000,
+        count_cache: QueryCache | None = None,
+        concurrent: bool = False,
+    ) -> PaginatedResponseSchema[T] | EstimatedPaginatedResponseSchema[T]:
+        """
+        Select page of `statement` objects and count all of them.
+
+        :param statement: select of model
+        :param request: page and page size
+        :param count_strategy: see ``fastapi_core.repositories.counting.count``. Response of ``"estimated"``
+            and ``"capped"`` strategies is `EstimatedPaginatedResponseSchema`, its ``count_exact`` is False
+            if count is estimated or capped
+        :param count_cap: max count for ``"capped"`` strategy
+        :param count_cache: cache for ``"cached"`` strategy
+        :param concurrent: count on separate connection concurrently with the page query.
+            Count doesn't see uncommitted changes of the current transaction then
+        :returns: page
+        """
+        from fastapi_core.schemas.base import EstimatedPaginatedResponseSchema, PaginatedResponseSchema
+
+        limit, offset = request.to_limit_offset("tuple")
+        page_statement = statement.limit(limit).offset(offset)
+
+        if not concurrent:
+            items = await self.all(page_statement)
+            total, exact = await count(self.session, statement, count_strategy, count_cap, count_cache)
+        else:
+
+            async def count_on_connection() -> tuple[int, bool]:
+                async with self.session.bind.connect() as connection:
+                    return await count(connection, statement, count_strategy, count_cap, count_cache)
+
+            items, (total, exact) = await asyncio.gather(self.all(page_statement), count_on_connection())
+
+        if count_strategy in ("exact", "cached"):
+            return PaginatedResponseSchema(count=total, items=items)
+        return EstimatedPaginatedResponseSchema(count=total, items=items, count_exact=exact)
+
+    async def _execute_many(
+        self, statement: Insert, values: Iterable[Mapping[str, Any]], batch_size: int, returning: bool
+    ) -> list[T]:
+        result = []
+        statement = statement.execution_options(insertmanyvalues_page_size=batch_size)
+        for batch in _batches(values, batch_size):
+            if returning:
+                result.extend((await self.session.scalars(statement, batch)).all())
+            else:
+                await self.session.execute(statement, batch)
+        return result
+
+    async def insert_many(
+        self,
+        model: type[T],
+        values: Iterable[Mapping[str, Any]],
+        batch_size: int = 1000,
+        returning: bool = True,
+    ) -> list[T]:
+        """
+        Bulk insert with multi-row ``INSERT ... RETURNING``, one statement per batch.
+        Order of returned objects is not guaranteed to match `values`.
+
+        :param model: model to insert
+        :param values: rows as column name to value mappings, rows of the same batch should have the same keys
+        :param batch_size: rows per statement
+        :param returning: return inserted objects with server generated values (id, created_at, etc.)
+        :returns: inserted objects if `returning` is True, else empty list
+        """
+        statement = insert(model)
+        if returning:
+            statement = statement.returning(model)
+        return await self._execute_many(statement, values, batch_size, returning)
+
+    async def upsert_many(
+        self,
+        model: type[T],
+        values: Sequence[Mapping[str, Any]],
+        conflict_keys: Sequence[str],
+        update_keys: Sequence[str] | None = None,
+        batch_size: int = 1000,
+        returning: bool = True,
+    ) -> list[T]:
+        """
+        Bulk ``INSERT ... ON CONFLICT (conflict_keys) DO UPDATE ... RETURNING``.
+
+        Supported for PostgreSQL and SQLite.
+
+        :param model: model to upsert
+        :param values: rows as column name to value mappings
+        :param conflict_keys: columns of unique index/constraint to detect conflict on
+        :param update_keys: columns to update on conflict, all passed non-conflict columns if None.
+            If empty, conflicting rows are skipped (``DO NOTHING``)
+        :param batch_size: rows per statement
+        :param returning: return inserted or updated objects
+        :returns: upserted objects if `returning` is True, else empty list
+        """
+        if not values:
+            return []
+
+        match self.session.get_bind().dialect.name:
+            case "postgresql":
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            case "sqlite":
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            case name:
+                raise NotImplementedError(f"Upsert is not supported for {name} dialect")
+
+        statement = dialect_insert(model)
+        if update_keys is None:
+            update_keys = [key for key in values[0] if key not in conflict_keys]
+
+        if update_keys:
+            set_ = {key: statement.excluded[key] for key in update_keys}
+            # ON CONFLICT DO UPDATE doesn't apply column onupdate (e.g. updated_at), so it is set explicitly
+            for column in model.__table__.columns:
+                if column.onupdate is not None and column.onupdate.is_clause_element and column.key not in set_:
+                    set_[column.key] = column.onupdate.arg
+            statement = statement.on_conflict_do_update(index_elements=conflict_keys, set_=set_)
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=conflict_keys)
+
+        if returning:
+            statement = statement.returning(model).execution_options(populate_existing=True)
+        return await self._execute_many(statement, values, batch_size, returning)
+
+    async def update_many(
+        self, model: type[T], values: Iterable[Mapping[str, Any]], batch_size: int = 1000
+    ) -> None:
+        """
+        Bulk update by primary key, every row must contain primary key columns.
+
+        :param model: model to update
+        :param values: rows as column name to value mappings
+        :param batch_size: rows per ``executemany`` call
+        """
+        for batch in _batches(values, batch_size):
+            await self.session.execute(update(model), batch)
+
+    async def copy_many(
+        self,
+        model: type[T],
+        values: Iterable[Mapping[str, Any]] | AsyncIterable[Mapping[str, Any]],
+        columns: Sequence[str] | None = None,
+    ) -> int:
+        """
+        Bulk load with PostgreSQL ``COPY`` protocol, fastest for very large ingests. Requires asyncpg driver.
+
+        Runs inside current session transaction. Python-side column defaults are not applied
+        and nothing is returned, consider `insert_many` if generated values are needed.
+        Rows are streamed to the driver as they are produced, so memory use doesn't depend on rows count.
+
+        :param model: model to load into
+        :param values: rows as column name to value mappings, e.g. generator or async generator
+        :param columns: columns to copy, keys of the first row if None
+        :returns: number of copied rows
+        """
+        if isinstance(values, AsyncIterable):
+            iterator = aiter(values)
+            first = await anext(iterator, None)
+        else:
+            iterator = iter(values)
+            first = next(iterator, None)
+        if first is None:
+            return 0
+
+        columns = list(columns or first.keys())
+        copied = 0
+
+        def to_record(row: Mapping[str, Any]) -> tuple:
+            nonlocal copied
+            copied += 1
+            return tuple(row[column] for column in columns)
+
+        async def async_records() -> AsyncIterator[tuple]:
+            yield to_record(first)
+            async for row in iterator:
+                yield to_record(row)
+
+        if isinstance(values, AsyncIterable):
+            records = async_records()
+        else:
+            records = map(to_record, chain((first,), iterator))
+
+        table = model.__table__
+        # COPY bypasses ORM events that track written tables for query cache invalidation
+        touch_tables(self.session, (table.name,))
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            table.name, records=records, columns=columns, schema_name=table.schema
+        )
+        return copied
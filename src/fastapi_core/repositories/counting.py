@@ -0,0 +1,138 @@
+import json
+from typing import Literal
+
+from sqlalchemy import Dialect, Select, Table, func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from fastapi_core.database.cache import MISSING, QueryCache, get_cache_key
+
+CountStrategy = Literal["exact", "estimated", "capped", "cached"]
+
+
+def get_count_statement(statement: Select) -> Select:
+    """
+    ``SELECT count(*) FROM (statement without ORDER BY, LIMIT and OFFSET)``
+    """
+    subquery = statement.order_by(None).limit(None).offset(None).subquery()
+    return select(func.count()).select_from(subquery)
+
+
+async def _get_connection(executor: AsyncSession | AsyncConnection) -> AsyncConnection:
+    if isinstance(executor, AsyncConnection):
+        return executor
+    return await executor.connection()
+
+
+def _is_whole_table(statement: Select, froms: list) -> bool:
+    """
+    Whether `statement` selects all rows of a single table: it is equal to plain select of the same columns,
+    so it has no filters, joins, grouping or ``DISTINCT``
+    """
+    if len(froms) != 1 or not isinstance(froms[0], Table):
+        return False
+    plain = select(*(description["expr"] for description in statement.column_descriptions))
+    return statement.order_by(None).limit(None).offset(None).compare(plain)
+
+
+async def count_exact(executor: AsyncSession | AsyncConnection, statement: Select) -> int:
+    return (await executor.execute(get_count_statement(statement))).scalar_one()
+
+
+async def count_capped(executor: AsyncSession | AsyncConnection, statement: Select, cap: int) -> tuple[int, bool]:
+    """
+    Count at most `cap` + 1 rows, so cost is bounded by `cap`
+
+    :returns: count up to `cap` and whether it is exact
+    """
+    # not `get_count_statement`, it drops LIMIT
+    subquery = statement.order_by(None).limit(cap + 1).offset(None).subquery()
+    count = (await executor.execute(select(func.count()).select_from(subquery))).scalar_one()
+    return min(count, cap), count <= cap
+
+
+def get_explain_statement(statement: Select, dialect: Dialect) -> tuple[str, dict | tuple]:
+    """
+    ``EXPLAIN (FORMAT JSON)`` of `statement` without ORDER BY, LIMIT and OFFSET as driver SQL and parameters.
+    Expanding parameters (``IN``) are rendered, driver SQL can't contain post compile placeholders.
+    """
+    compiled = statement.order_by(None).limit(None).offset(None).compile(
+        dialect=dialect, compile_kwargs={"render_postcompile": True}
+    )
+    params = compiled.construct_params()
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+    return f"EXPLAIN (FORMAT JSON) {compiled}", params
+
+
+async def count_estimated(executor: AsyncSession | AsyncConnection, statement: Select) -> int | None:
+    """
+    PostgreSQL planner estimate: ``pg_class.reltuples`` for unfiltered single table selects,
+    ``EXPLAIN`` rows estimate otherwise. Estimates are as fresh as the last ``ANALYZE``.
+
+    :returns: estimated count or None if dialect is not PostgreSQL or table was never analyzed
+    """
+    connection = await _get_connection(executor)
+    if connection.dialect.name != "postgresql":
+        return None
+
+    froms = statement.get_final_froms()
+    if _is_whole_table(statement, froms):
+        estimate = (
+            await connection.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+                {"table": froms[0].fullname},
+            )
+        ).scalar_one_or_none()
+        # reltuples is -1 if table was never vacuumed or analyzed
+        return estimate if estimate is not None and estimate >= 0 else None
+
+    sql, params = get_explain_statement(statement, connection.dialect)
+    plan = (await connection.exec_driver_sql(sql, params)).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count(
+    executor: AsyncSession | AsyncConnection,
+    statement: Select,
+    strategy: CountStrategy = "exact",
+    cap: int = 10000,
+    cache: QueryCache | None = None,
+) -> tuple[int, bool]:
+    """
+    Count rows selected by `statement` (pagination is ignored)
+
+    :param executor: session or connection to count with
+    :param statement: select to count rows of
+    :param strategy:
+        - ``"exact"`` - ``COUNT(*)``
+        - ``"estimated"`` - planner estimate (PostgreSQL), exact count for other dialects
+        - ``"capped"`` - exact count up to `cap`
+        - ``"cached"`` - exact count cached in `cache` by statement and its parameters,
+          entries are invalidated on writes into counted tables like ``mapped(..., cache=...)`` results
+    :param cap: max count for ``"capped"`` strategy
+    :param cache: cache for ``"cached"`` strategy
+    :returns: count and whether it is exact
+    """
+    match strategy:
+        case "exact":
+            return await count_exact(executor, statement), True
+        case "estimated":
+            estimate = await count_estimated(executor, statement)
+            if estimate is None:
+                return await count_exact(executor, statement), True
+            return estimate, False
+        case "capped":
+            return await count_capped(executor, statement, cap)
+        case "cached":
+            if cache is None:
+                raise ValueError("Cache is required for cached count")
+            key, tables = get_cache_key("count", get_count_statement(statement))
+            value = await cache.get(key, executor)
+            if value is MISSING:
+                value = await count_exact(executor, statement)
+                await cache.set(key, value, tables, executor)
+            return value, True
+        case _:
+            raise ValueError(f"Unrecognized count strategy: {strategy}")
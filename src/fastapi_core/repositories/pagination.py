@@ -0,0 +1,135 @@
+from typing import Any, Generic, Mapping, Sequence, TypeVar
+
+from sqlalchemy import Select, and_, or_, tuple_
+from sqlalchemy.sql import ColumnElement, operators
+from sqlalchemy.sql.elements import UnaryExpression
+
+from fastapi_core.schemas.tokens import InvalidPageTokenException, sign_token, verify_token
+
+T = TypeVar("T")
+
+
+class KeysetPagination(Generic[T]):
+    """
+    Keyset (seek) pagination over composite sort order, page depth doesn't affect query cost unlike ``OFFSET``.
+
+        pagination = KeysetPagination(Post.created_at.desc(), Post.id.desc())
+
+        statement = pagination.paginate(select(Post), request.page_token, request.page_size)
+        items, next_page_token = pagination.get_page(await repository.all(statement), request.page_size)
+
+    Next page condition is row-value comparison ``(created_at, id) < (:created_at, :id)``, so it could
+    use composite index on sort columns. Mixed directions are split into runs of the same direction:
+    ``(a, b) > (:a, :b) OR (a = :a AND b = :b AND c < :c)``.
+    Sort columns must be not nullable and the last one must be unique (usually primary key).
+
+    Page token holds only sort values of the last item in compact binary form and is signed with HMAC,
+    signature covers sort order, so token of other sort order is rejected.
+    """
+
+    def __init__(self, *order_by: Any, secret: str | bytes | None = None):
+        """
+        :param order_by: sort columns or ``column.asc()``/``column.desc()`` clauses
+        :param secret: token signing key, ``APISettings.PAGE_TOKEN_SECRET`` if omitted.
+            Tokens can't be signed without key, `secret` raises ValueError then
+        """
+        if not order_by:
+            raise ValueError("At least one sort column is required")
+
+        self.order_by = []
+        self.columns = []
+        self.descending = []
+        for clause in order_by:
+            descending = False
+            if isinstance(clause, UnaryExpression) and clause.modifier in (operators.desc_op, operators.asc_op):
+                descending = clause.modifier is operators.desc_op
+                clause = clause.element
+            self.columns.append(clause)
+            self.descending.append(descending)
+            self.order_by.append(clause.desc() if descending else clause.asc())
+
+        self.keys = [column.key for column in self.columns]
+        self.context = ",".join(
+            f"{key} {'desc' if descending else 'asc'}" for key, descending in zip(self.keys, self.descending)
+        ).encode()
+        if secret is not None and not secret:
+            raise ValueError("Page token secret must not be empty")
+        self._secret = secret.encode() if isinstance(secret, str) else secret
+
+    @property
+    def secret(self) -> bytes:
+        if self._secret is not None:
+            return self._secret
+
+        from fastapi_core.settings.app import APISettings
+        from fastapi_core.settings.registry import get_settings
+
+        # read on every use to follow settings reload
+        secret = get_settings(APISettings).PAGE_TOKEN_SECRET
+        if not secret:
+            # HMAC with empty key could be forged by anyone
+            raise ValueError("Page token secret is required: pass `secret` or set PAGE_TOKEN_SECRET")
+        return secret.encode()
+
+    def get_condition(self, values: Sequence[Any]) -> ColumnElement[bool]:
+        """
+        Condition for rows after the row with sort `values`
+        """
+        conditions = []
+        equal_prefix = []
+        start = 0
+        for end in range(1, len(self.columns) + 1):
+            if end < len(self.columns) and self.descending[end] == self.descending[start]:
+                continue
+
+            columns, run_values = self.columns[start:end], values[start:end]
+            if len(columns) == 1:
+                left, right = columns[0], run_values[0]
+            else:
+                left, right = tuple_(*columns), tuple_(*run_values)
+            conditions.append(and_(*equal_prefix, left < right if self.descending[start] else left > right))
+
+            equal_prefix.extend(column == value for column, value in zip(columns, run_values))
+            start = end
+
+        return conditions[0] if len(conditions) == 1 else or_(*conditions)
+
+    def paginate(self, statement: Select, page_token: str | None, page_size: int) -> Select:
+        """
+        :param statement: select without ``ORDER BY`` and ``LIMIT``
+        :param page_token: token from `get_page` or ``None`` for the first page
+        :param page_size: items per page
+        :returns: statement that selects the page and one more row to detect whether next page exists
+        :raises InvalidPageTokenException: token is malformed, forged or of other sort order
+        """
+        statement = statement.order_by(*self.order_by)
+        if page_token:
+            statement = statement.where(self.get_condition(self.loads(page_token)))
+        return statement.limit(page_size + 1)
+
+    def get_page(self, rows: Sequence[T], page_size: int) -> tuple[list[T], str | None]:
+        """
+        :param rows: rows selected by `paginate` statement, objects or mappings with sort keys (could be mapped schemas)
+        :param page_size: the same page size as passed to `paginate`
+        :returns: page items and next page token (``None`` for the last page)
+        """
+        items = list(rows[:page_size])
+        if len(rows) <= page_size:
+            return items, None
+        return items, self.dumps(items[-1])
+
+    def dumps(self, item: Any) -> str:
+        if isinstance(item, Mapping):
+            values = [item[key] for key in self.keys]
+        else:
+            values = [getattr(item, key) for key in self.keys]
+        return sign_token(values, self.secret, self.context)
+
+    def loads(self, page_token: str) -> list[Any]:
+        """
+        :raises InvalidPageTokenException: token is malformed, forged or of other sort order
+        """
+        values = verify_token(page_token, self.secret, self.context)
+        if len(values) != len(self.keys):
+            raise InvalidPageTokenException("Invalid page token")
+        return values
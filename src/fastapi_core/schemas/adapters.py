@@ -0,0 +1,34 @@
+from functools import lru_cache
+from typing import Any, TypeVar
+
+from pydantic import TypeAdapter
+
+T = TypeVar("T")
+
+TYPE_ADAPTERS_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=TYPE_ADAPTERS_CACHE_SIZE)
+def _get_cached_type_adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def get_type_adapter(schema: type[T]) -> TypeAdapter[T]:
+    """
+    Shared ``TypeAdapter`` for `schema`, so validator is built once per type instead of once per call.
+
+    Cache is bounded LRU and thread-safe. Unhashable types (e.g. ``Annotated`` with unhashable metadata)
+    are not cached.
+
+    :param schema: type to validate against, e.g. ``MySchema`` or ``list[MySchema]``
+    :returns: type adapter
+    """
+    try:
+        hash(schema)
+    except TypeError:
+        return TypeAdapter(schema)
+    return _get_cached_type_adapter(schema)
+
+
+def get_type_adapters_cache_info():
+    return _get_cached_type_adapter.cache_info()
@@ -26,6 +26,11 @@ class PaginatedResponseSchema(BaseModel, Generic[T]):
     items: list[T]
 
 
+class EstimatedPaginatedResponseSchema(PaginatedResponseSchema[T], Generic[T]):
+    # False if count is estimated or capped, see BaseRepository.paginate
+    count_exact: bool = True
+
+
 class TokenPaginatedRequestSchema(BaseModel):
     page_token: str | None
     page_size: Annotated[int, Field(ge=1)]
@@ -46,7 +51,7 @@ class CountSchema(BaseModel, Generic[T]):
 
 class TokenPaginationItem(BaseModel):
     key: str
-    operation: Literal[">", "<"]
+    operation: Literal[">", "<", ">=", "<="]
     value: Any
 
     def get_condition_for_model(self, model: Any) -> Any:
@@ -60,7 +65,7 @@ class TokenPaginationItem(BaseModel):
             case "<=":
                 return getattr(model, self.key) <= self.value
             case _:
-                raise ValueError(f"Unrecognized operator: {self.operator}")
+                raise ValueError(f"Unrecognized operator: {self.operation}")
 
 
 items_list_type = TypeAdapter(list[TokenPaginationItem])
@@ -0,0 +1,172 @@
+import base64
+import binascii
+import datetime
+import hashlib
+import hmac
+import struct
+from decimal import Decimal
+from typing import Any, Sequence
+from uuid import UUID
+
+TOKEN_VERSION = 1
+SIGNATURE_SIZE = 12
+
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _DATETIME, _AWARE_DATETIME, _DATE, _UUID, _DECIMAL, _BYTES = range(12)
+_EPOCH = datetime.datetime(1970, 1, 1)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+class InvalidPageTokenException(ValueError):
+    """
+    Page token is malformed, tampered or belongs to other sort order
+    """
+
+
+def _write_varint(buffer: bytearray, value: int):
+    if not -(2**63) <= value < 2**63:
+        raise ValueError("Integer is out of 64 bit range")
+    value = (value << 1) ^ (value >> 63)  # zigzag, so small negative numbers are short too
+    while value > 0x7F:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return (value >> 1) ^ -(value & 1), pos
+        shift += 7
+
+
+def _write_bytes(buffer: bytearray, tag: int, value: bytes):
+    buffer.append(tag)
+    _write_varint(buffer, len(value))
+    buffer.extend(value)
+
+
+def encode_values(values: Sequence[Any]) -> bytes:
+    """
+    Compact binary encoding of scalar values: ``None``, ``bool``, ``int``, ``float``, ``str``, ``bytes``,
+    ``datetime``, ``date``, ``UUID`` and ``Decimal``
+    """
+    buffer = bytearray()
+    for value in values:
+        if value is None:
+            buffer.append(_NONE)
+        elif isinstance(value, bool):
+            buffer.append(_TRUE if value else _FALSE)
+        elif isinstance(value, int):
+            buffer.append(_INT)
+            _write_varint(buffer, value)
+        elif isinstance(value, float):
+            buffer.append(_FLOAT)
+            buffer.extend(struct.pack(">d", value))
+        elif isinstance(value, str):
+            _write_bytes(buffer, _STR, value.encode())
+        elif isinstance(value, datetime.datetime):
+            offset = value.utcoffset()
+            if offset is None:
+                buffer.append(_DATETIME)
+            else:
+                buffer.append(_AWARE_DATETIME)
+                _write_varint(buffer, int(offset.total_seconds()))
+                value = value.replace(tzinfo=None) - offset
+            _write_varint(buffer, (value - _EPOCH) // _MICROSECOND)
+        elif isinstance(value, datetime.date):
+            buffer.append(_DATE)
+            _write_varint(buffer, value.toordinal())
+        elif isinstance(value, UUID):
+            buffer.append(_UUID)
+            buffer.extend(value.bytes)
+        elif isinstance(value, Decimal):
+            _write_bytes(buffer, _DECIMAL, str(value).encode())
+        elif isinstance(value, bytes):
+            _write_bytes(buffer, _BYTES, value)
+        else:
+            raise TypeError(f"Unsupported page token value type: {type(value).__name__}")
+    return bytes(buffer)
+
+
+def decode_values(data: bytes) -> list[Any]:
+    values = []
+    pos = 0
+    while pos < len(data):
+        tag = data[pos]
+        pos += 1
+        match tag:
+            case 0 | 1 | 2:
+                values.append((None, False, True)[tag])
+            case 3:
+                value, pos = _read_varint(data, pos)
+                values.append(value)
+            case 4:
+                values.append(struct.unpack_from(">d", data, pos)[0])
+                pos += 8
+            case 5 | 10 | 11:
+                size, pos = _read_varint(data, pos)
+                raw, pos = data[pos : pos + size], pos + size
+                values.append(raw.decode() if tag == _STR else Decimal(raw.decode()) if tag == _DECIMAL else raw)
+            case 6 | 7:
+                offset = None
+                if tag == _AWARE_DATETIME:
+                    offset, pos = _read_varint(data, pos)
+                microseconds, pos = _read_varint(data, pos)
+                value = _EPOCH + microseconds * _MICROSECOND
+                if offset is not None:
+                    tz = datetime.timezone(datetime.timedelta(seconds=offset))
+                    value = (value + datetime.timedelta(seconds=offset)).replace(tzinfo=tz)
+                values.append(value)
+            case 8:
+                ordinal, pos = _read_varint(data, pos)
+                values.append(datetime.date.fromordinal(ordinal))
+            case 9:
+                values.append(UUID(bytes=data[pos : pos + 16]))
+                pos += 16
+            case _:
+                raise ValueError(f"Unknown value tag: {tag}")
+    return values
+
+
+def _sign(payload: bytes, secret: bytes, context: bytes) -> bytes:
+    return hmac.new(secret, context + payload, hashlib.sha256).digest()[:SIGNATURE_SIZE]
+
+
+def sign_token(values: Sequence[Any], secret: bytes, context: bytes = b"") -> str:
+    """
+    Encode `values` into url safe token signed with HMAC-SHA256
+
+    :param values: scalar values, see `encode_values`
+    :param secret: HMAC key
+    :param context: additional signed data that is not stored in token, e.g. sort order, so token
+        is valid only within the same context
+    :returns: token
+    """
+    payload = bytes([TOKEN_VERSION]) + encode_values(values)
+    return base64.urlsafe_b64encode(payload + _sign(payload, secret, context)).rstrip(b"=").decode()
+
+
+def verify_token(token: str, secret: bytes, context: bytes = b"") -> list[Any]:
+    """
+    :returns: values of token created with `sign_token`
+    :raises InvalidPageTokenException: token is malformed or signature doesn't match
+    """
+    try:
+        data = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (binascii.Error, ValueError):
+        raise InvalidPageTokenException("Malformed page token")
+
+    payload, signature = data[:-SIGNATURE_SIZE], data[-SIGNATURE_SIZE:]
+    if not payload or payload[0] != TOKEN_VERSION or not hmac.compare_digest(
+        signature, _sign(payload, secret, context)
+    ):
+        raise InvalidPageTokenException("Invalid page token")
+
+    try:
+        return decode_values(payload[1:])
+    except (ValueError, IndexError, struct.error) as e:
+        raise InvalidPageTokenException(f"Malformed page token: {e}")
@@ -1,13 +1,18 @@
+from __future__ import annotations
+
+import asyncio
 from logging import Logger
-from typing import Any, Mapping, Type, TypeVar
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Hashable, Mapping, Type, TypeVar
+
+from fastapi_core.services.loaders import DataLoader
 
-# try/except imports are only for type hinting purposes
-try:
+# imports are only for type hinting purposes
+if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
-except ImportError:
-    AsyncSession = object
 
 T = TypeVar("T")
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
 
 
 class BaseService:
@@ -31,6 +36,24 @@ class BaseService:
         gateway: cls = getattr(self._container, placeholder)
         return gateway
 
+    def loader_factory(self, name: str, batch_load: Callable[[list[K]], Awaitable[Mapping[K, V]]]) -> DataLoader[K, V]:
+        """
+        Per request `DataLoader` singleton, e.g. for batched gateway calls:
+
+            @property
+            def users_loader(self):
+                return self.loader_factory("users", self.users_gateway.get_users_by_ids)
+
+        :param name: loader name, unique per container
+        :param batch_load: loads key to value mapping for list of keys, used on first call only
+        """
+        placeholder = f"_loader_{name}"
+        if not hasattr(self._container, placeholder):
+            setattr(self._container, placeholder, DataLoader(batch_load))
+
+        loader: DataLoader[K, V] = getattr(self._container, placeholder)
+        return loader
+
 
 class BaseServiceWithSession(BaseService):
     """Base class with sqlalchemy.ext.asyncio.AsyncSession"""
@@ -66,6 +89,31 @@ class BaseServiceWithSession(BaseService):
         repo: cls = getattr(self._container, placeholder)
         return repo
 
+    def model_loader(self, model: Type[T], key: str = "id") -> DataLoader[Any, T]:
+        """
+        Per request `DataLoader` of `model` objects by `key` column,
+        batched into single ``SELECT ... WHERE key IN (...)`` query:
+
+            users = await self.model_loader(User).load_many(post.author_id for post in posts)
+
+        :param model: model to load
+        :param key: unique column to load by
+        """
+        from sqlalchemy import select
+
+        column = getattr(model, key)
+        # session doesn't allow concurrent operations, loaders dispatched in the same tick take turns
+        if not hasattr(self._container, "_loaders_session_lock"):
+            self._container._loaders_session_lock = asyncio.Lock()
+        lock: asyncio.Lock = self._container._loaders_session_lock
+
+        async def batch_load(keys: list) -> dict[Any, T]:
+            async with lock:
+                objs = (await self.session.execute(select(model).where(column.in_(keys)))).scalars().all()
+            return {getattr(obj, key): obj for obj in objs}
+
+        return self.loader_factory(f"{model.__name__}_{key}", batch_load)
+
 
 class BaseServiceWithoutSession(BaseService):
     """
@@ -0,0 +1,94 @@
+import asyncio
+from functools import partial
+from typing import Awaitable, Callable, Generic, Hashable, Iterable, Mapping, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class DataLoader(Generic[K, V]):
+    """
+    Batches keys requested within one event loop tick into a single `batch_load` call
+    and memoizes results for the loader lifetime (per request, see ``BaseService.loader_factory``).
+
+        loader = DataLoader(load_users_by_ids)
+        users = await asyncio.gather(*(loader.load(post.author_id) for post in posts))  # one batch_load call
+    """
+
+    def __init__(self, batch_load: Callable[[list[K]], Awaitable[Mapping[K, V]]], max_batch_size: int | None = None):
+        """
+        :param batch_load: loads values for list of unique keys, returns key to value mapping.
+            Keys missing in mapping are resolved with ``None``
+        :param max_batch_size: max keys per `batch_load` call
+        """
+        self.batch_load = batch_load
+        self.max_batch_size = max_batch_size
+        self._futures: dict[K, asyncio.Future] = {}
+        # futures are captured with keys, so `clear` doesn't detach them from pending batches
+        self._queue: dict[K, asyncio.Future] = {}
+        # strong references to running batches, event loop keeps only weak ones
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> V | None:
+        future = self._futures.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            future.add_done_callback(partial(self._forget_cancelled, key))
+            self._futures[key] = future
+            if not self._queue:
+                asyncio.get_running_loop().call_soon(self._dispatch)
+            self._queue[key] = future
+
+        # shared by all callers of the key, cancellation of one caller must not cancel it for the others
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Iterable[K]) -> list[V | None]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: K, value: V):
+        """
+        Put known value into memo, e.g. entity that was loaded by other query
+        """
+        if key not in self._futures:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            self._futures[key] = future
+
+    def clear(self, key: K | None = None):
+        if key is None:
+            self._futures.clear()
+        else:
+            self._futures.pop(key, None)
+
+    def _forget_cancelled(self, key: K, future: asyncio.Future):
+        if future.cancelled() and self._futures.get(key) is future:
+            del self._futures[key]
+
+    def _dispatch(self):
+        items, self._queue = list(self._queue.items()), {}
+        size = self.max_batch_size or len(items)
+        for i in range(0, len(items), size):
+            task = asyncio.ensure_future(self._resolve(dict(items[i : i + size])))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, futures: dict[K, asyncio.Future]):
+        try:
+            values = await self.batch_load(list(futures))
+        except BaseException as exc:
+            for key, future in futures.items():
+                # failed keys are not memoized, so they could be retried
+                if self._futures.get(key) is future:
+                    del self._futures[key]
+                if not future.done():
+                    if isinstance(exc, Exception):
+                        future.set_exception(exc)
+                    else:
+                        future.cancel()
+            if not isinstance(exc, Exception):
+                raise
+            return
+
+        for key, future in futures.items():
+            if not future.done():
+                future.set_result(values.get(key))
@@ -8,6 +8,9 @@ class APISettings(BaseSettings):
 
     API_DESCRIPTION: str | None
 
+    # HMAC key of keyset pagination tokens, required by fastapi_core.repositories.pagination.KeysetPagination
+    PAGE_TOKEN_SECRET: str | None = None
+
     CORS_ALLOW_HEADERS: list[str] = ["*"]
     CORS_ALLOW_METHODS: list[str] = ["*"]
     CORS_ALLOW_ORIGINS: list[str] = ["*"]
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import AnyUrl
 from pydantic_settings import BaseSettings
 
@@ -5,3 +7,9 @@ from pydantic_settings import BaseSettings
 class ClickhouseSettings(BaseSettings):
     CLICKHOUSE_TCP_URL: AnyUrl | None = None
     CLICKHOUSE_LOG_TABLE: str | None = None
+
+    # fastapi_core.logging.sinks.ClickHouseSink buffering
+    CLICKHOUSE_LOG_BATCH_SIZE: int = 1000
+    CLICKHOUSE_LOG_FLUSH_INTERVAL: float = 1.0
+    CLICKHOUSE_LOG_QUEUE_SIZE: int = 10000
+    CLICKHOUSE_LOG_OVERFLOW: Literal["drop", "block"] = "drop"
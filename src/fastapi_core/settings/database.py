@@ -4,9 +4,16 @@ from pydantic_settings import BaseSettings
 
 class DatabaseSettings(BaseSettings):
     DATABASE_URL: PostgresDsn | str
+    # read replicas for safe methods and read only endpoints, JSON list
+    DATABASE_REPLICA_URLS: list[PostgresDsn | str] = []
     DB_ENGINE_POOL_PRE_PING: bool = True
     DB_ENGINE_POOL_RECYCLE: int = -1
     DB_ENGINE_POOL_SIZE: int = 5
     DB_ENGINE_MAX_OVERFLOW: int = 10
     DB_ENGINE_POOL_TIMEOUT: int = 30
     SQL_ENGINE_ECHO: bool = False
+
+    # asyncpg only
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    DB_STATEMENT_TIMEOUT: int | None = None  # milliseconds
+    DB_SERVER_SETTINGS: dict[str, str] = {}
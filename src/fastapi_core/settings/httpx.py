@@ -1,4 +1,4 @@
-from httpx import Timeout
+from httpx import Limits, Timeout
 from pydantic_settings import BaseSettings
 
 
@@ -9,6 +9,29 @@ class HTTPXConfig(BaseSettings):
     HTTPX_WRITE_TIMEOUT: int = 5
     HTTPX_POOL_TIMEOUT: int = 5
 
+    HTTPX_MAX_CONNECTIONS: int | None = 100
+    HTTPX_MAX_KEEPALIVE_CONNECTIONS: int | None = 20
+    HTTPX_KEEPALIVE_EXPIRY: float | None = 5.0
+    # requires h2 package (httpx[http2])
+    HTTPX_HTTP2: bool = False
+
+    # circuit breaker per upstream host, see fastapi_core.gateways.resilience.CircuitBreaker
+    HTTPX_CIRCUIT_BREAKER_ENABLED: bool = False
+    HTTPX_CIRCUIT_BREAKER_FAILURE_RATE: float = 0.5
+    HTTPX_CIRCUIT_BREAKER_SLOW_CALL_DURATION: float | None = None
+    HTTPX_CIRCUIT_BREAKER_SLOW_CALL_RATE: float = 1.0
+    HTTPX_CIRCUIT_BREAKER_WINDOW_SIZE: int = 100
+    HTTPX_CIRCUIT_BREAKER_MIN_CALLS: int = 20
+    HTTPX_CIRCUIT_BREAKER_OPEN_DURATION: float = 30
+    HTTPX_CIRCUIT_BREAKER_HALF_OPEN_CALLS: int = 5
+
+    # retries of idempotent requests, capped by global retry budget
+    HTTPX_RETRIES: int = 0
+    HTTPX_RETRY_BACKOFF: float = 0.1
+    HTTPX_RETRY_BACKOFF_MAX: float = 2.0
+    HTTPX_RETRY_BUDGET_RATIO: float = 0.1
+    HTTPX_RETRY_BUDGET_MIN_PER_SECOND: float = 10
+
     def get_timeout(self) -> Timeout:
         return Timeout(
             timeout=self.HTTPX_TIMEOUT,
@@ -17,3 +40,23 @@ class HTTPXConfig(BaseSettings):
             write=self.HTTPX_WRITE_TIMEOUT,
             pool=self.HTTPX_POOL_TIMEOUT,
         )
+
+    def get_limits(self) -> Limits:
+        return Limits(
+            max_connections=self.HTTPX_MAX_CONNECTIONS,
+            max_keepalive_connections=self.HTTPX_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=self.HTTPX_KEEPALIVE_EXPIRY,
+        )
+
+    def get_circuit_breaker_kwargs(self) -> dict | None:
+        if not self.HTTPX_CIRCUIT_BREAKER_ENABLED:
+            return None
+        return dict(
+            failure_rate=self.HTTPX_CIRCUIT_BREAKER_FAILURE_RATE,
+            slow_call_duration=self.HTTPX_CIRCUIT_BREAKER_SLOW_CALL_DURATION,
+            slow_call_rate=self.HTTPX_CIRCUIT_BREAKER_SLOW_CALL_RATE,
+            window_size=self.HTTPX_CIRCUIT_BREAKER_WINDOW_SIZE,
+            min_calls=self.HTTPX_CIRCUIT_BREAKER_MIN_CALLS,
+            open_duration=self.HTTPX_CIRCUIT_BREAKER_OPEN_DURATION,
+            half_open_calls=self.HTTPX_CIRCUIT_BREAKER_HALF_OPEN_CALLS,
+        )
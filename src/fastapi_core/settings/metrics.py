@@ -0,0 +1,8 @@
+from pydantic_settings import BaseSettings
+
+
+class MetricsSettings(BaseSettings):
+    # shared directory of worker snapshots for multi worker deployments, should be emptied on deploy
+    METRICS_MULTIPROCESS_DIR: str | None = None
+    # seconds between snapshots, so other workers' metrics are that stale on scrape
+    METRICS_FLUSH_INTERVAL: float = 5.0
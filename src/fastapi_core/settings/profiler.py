@@ -6,3 +6,10 @@ class ProfilerSettings(BaseSettings):
     PROFILER_INTERVAL: float = 0.001
 
     PROFILER_QUERY_PARAM: str = "profile_req"
+
+    # continuous profiling, see fastapi_core.middleware.profiler.ProfilerMiddleware
+    PROFILER_SAMPLE_RATE: float = 0.0  # fraction of requests to profile, 0 disables sampling
+    PROFILER_MAX_CONCURRENT: int = 4  # max requests profiled at the same time
+    PROFILER_WINDOW: float = 600  # seconds stacks are aggregated for
+    PROFILER_WINDOW_BUCKETS: int = 10
+    PROFILER_MAX_STACKS: int = 10000  # unique stacks per route and bucket, the rest is counted as [truncated]
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import signal
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Iterator, TypeVar
+
+if TYPE_CHECKING:
+    from pydantic_settings import BaseSettings
+
+S = TypeVar("S", bound="BaseSettings")
+
+
+class FrozenSettingsMixin:
+    """
+    Base of ``Frozen<Settings>`` subclasses created by registry: immutable, equal to instances of the original
+    class with the same values and pickled by values, so unpickling doesn't need the dynamic class
+    """
+
+    __slots__ = ()
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, self.__class__.__bases__[1]):
+            return NotImplemented
+        return self.__dict__ == other.__dict__ and self.__pydantic_extra__ == other.__pydantic_extra__
+
+    def __hash__(self) -> int:
+        # values could be unhashable (lists), equal instances have the same class and fields anyway
+        return hash((self.__class__, tuple(self.__dict__)))
+
+    def __reduce__(self):
+        return _restore_frozen, (self.__class__.__bases__[1], self.__dict__, self.__pydantic_fields_set__)
+
+
+def _restore_frozen(cls: type[S], values: dict[str, Any], fields_set: set[str]) -> S:
+    return settings_registry._get_frozen_class(cls).model_construct(fields_set, **values)
+
+
+class SettingsRegistry:
+    """
+    Process wide settings: every ``BaseSettings`` class is loaded from environment once, on the first use,
+    and the same frozen instance is shared afterwards, so hot paths don't re-parse environment.
+
+        settings = get_settings(APISettings)
+
+    `reload` drops loaded instances (or `request_reload` on ``SIGHUP``, see `install_reload_signal`),
+    `override` replaces them in tests.
+    """
+
+    def __init__(self):
+        self._instances: dict[type, Any] = {}
+        self._frozen_classes: dict[type, type] = {}
+        self._reload_callbacks: list[Callable[[], Any]] = []
+        self._lock = threading.Lock()
+        # set by signal handler, reload is done by the next `get` outside of the handler
+        self._reload_requested = False
+
+    def _get_frozen_class(self, cls: type[S]) -> type[S]:
+        frozen = self._frozen_classes.get(cls)
+        if frozen is None:
+            frozen = self._frozen_classes[cls] = type(
+                f"Frozen{cls.__name__}",
+                (FrozenSettingsMixin, cls),
+                {"__module__": __name__, "model_config": {"frozen": True}},
+            )
+        return frozen
+
+    def get(self, cls: type[S]) -> S:
+        """
+        :returns: shared frozen instance of `cls`
+        :raises pydantic.ValidationError: environment is not valid for `cls`
+        """
+        if self._reload_requested:
+            self._reload_requested = False
+            self.reload()
+
+        instance = self._instances.get(cls)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(cls)
+                if instance is None:
+                    instance = self._instances[cls] = self._get_frozen_class(cls)()
+        return instance
+
+    def reload(self, *classes: type):
+        """
+        Drop loaded instances of `classes` (of all classes if omitted), they are loaded again on the next use.
+        Objects built from settings (e.g. global retry budget) are rebuilt by reload callbacks.
+        """
+        with self._lock:
+            if classes:
+                for cls in classes:
+                    self._instances.pop(cls, None)
+            else:
+                self._instances.clear()
+        for callback in self._reload_callbacks:
+            callback()
+
+    def on_reload(self, callback: Callable[[], Any]):
+        """
+        :param callback: called after every `reload`, e.g. to reset object configured with settings
+        """
+        self._reload_callbacks.append(callback)
+
+    @contextmanager
+    def override(self, settings: BaseSettings | type[S], **values: Any) -> Iterator[S]:
+        """
+        Replace shared instance within the block:
+
+            with settings_registry.override(APISettings, DEBUG=True):
+                ...
+
+        :param settings: settings instance or settings class to create with `values`
+        :param values: field values, the rest is loaded from environment
+        :returns: overriding instance
+        """
+        if isinstance(settings, type):
+            cls, instance = settings, settings(**values)
+        else:
+            cls, instance = type(settings), settings
+
+        with self._lock:
+            previous = self._instances.get(cls)
+            self._instances[cls] = instance
+        try:
+            yield instance
+        finally:
+            with self._lock:
+                if previous is None:
+                    self._instances.pop(cls, None)
+                else:
+                    self._instances[cls] = previous
+
+    def request_reload(self, *_: Any):
+        """
+        Reload all settings on the next `get`, safe to call from signal handlers
+        """
+        self._reload_requested = True
+
+    def install_reload_signal(self, signum: int | None = None):
+        """
+        Reload all settings after the process receives `signum` (``SIGHUP`` by default, not available on Windows).
+        Must be called from the main thread.
+        """
+        signal.signal(signal.SIGHUP if signum is None else signum, self.request_reload)
+
+
+settings_registry = SettingsRegistry()
+
+
+def get_settings(cls: type[S]) -> S:
+    """
+    Shortcut for ``settings_registry.get(cls)``
+    """
+    return settings_registry.get(cls)
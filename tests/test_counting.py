@@ -0,0 +1,47 @@
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from fastapi_core.repositories.counting import count, count_capped, get_explain_statement
+from tests.conftest import Item
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def items(session):
+    session.add_all(Item(name=f"item{i}") for i in range(10))
+    await session.commit()
+
+
+@pytest.mark.usefixtures("items")
+async def test_count_capped_stops_at_cap(session):
+    statements = []
+
+    def listener(connection, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(session.bind.sync_engine, "before_cursor_execute", listener)
+
+    assert await count_capped(session, select(Item), cap=3) == (3, False)
+    # only cap + 1 rows are counted
+    assert "LIMIT" in statements[0]
+    event.remove(session.bind.sync_engine, "before_cursor_execute", listener)
+
+
+@pytest.mark.usefixtures("items")
+async def test_count_capped_is_exact_below_cap(session):
+    assert await count_capped(session, select(Item).where(Item.id <= 2), cap=3) == (2, True)
+    assert await count_capped(session, select(Item).limit(1), cap=100) == (10, True)
+
+
+@pytest.mark.usefixtures("items")
+async def test_count_estimated_falls_back_to_exact_count(session):
+    assert await count(session, select(Item), strategy="estimated") == (10, True)
+
+
+def test_explain_statement_renders_expanding_parameters():
+    sql, params = get_explain_statement(select(Item).where(Item.id.in_([1, 2])).limit(5), asyncpg.dialect())
+    assert "POSTCOMPILE" not in sql and "LIMIT" not in sql
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT")
+    assert params == (1, 2)
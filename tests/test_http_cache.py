@@ -0,0 +1,112 @@
+import asyncio
+
+import httpx
+import pytest
+
+from fastapi_core.gateways.cache import CachingTransport, HTTPCache
+
+pytestmark = pytest.mark.anyio
+
+
+class Interrupted(BaseException):
+    pass
+
+
+class Upstream(httpx.AsyncBaseTransport):
+    """
+    Responds after `release` is set, raises `error` once if it is set
+    """
+
+    def __init__(self, headers: dict[str, str] | None = None):
+        self.headers = headers or {}
+        self.release = asyncio.Event()
+        self.error: BaseException | None = None
+        self.calls = 0
+        self.responses = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+        self.responses += 1
+        return httpx.Response(200, headers=self.headers, content=f"response{self.responses}".encode())
+
+
+async def get(transport: httpx.AsyncBaseTransport, **headers: str) -> httpx.Response:
+    response = await transport.handle_async_request(httpx.Request("GET", "http://upstream/items", headers=headers))
+    await response.aread()
+    return response
+
+
+async def wait_for_leader():
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+async def test_concurrent_identical_requests_are_coalesced():
+    upstream = Upstream()
+    transport = CachingTransport(upstream)
+
+    tasks = [asyncio.ensure_future(get(transport)) for _ in range(3)]
+    tenant = asyncio.ensure_future(get(transport, authorization="tenant"))
+    await wait_for_leader()
+    upstream.release.set()
+
+    contents = {(await task).content for task in tasks}
+    assert len(contents) == 1 and (await tenant).content not in contents
+    assert upstream.calls == 2 and transport.coalesced == 2
+
+
+async def test_followers_get_leader_exception():
+    upstream = Upstream()
+    transport = CachingTransport(upstream)
+    upstream.error = httpx.ConnectError("refused")
+
+    tasks = [asyncio.ensure_future(get(transport)) for _ in range(2)]
+    await wait_for_leader()
+    upstream.release.set()
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert [type(result) for result in results] == [httpx.ConnectError, httpx.ConnectError]
+    assert upstream.calls == 1
+
+
+@pytest.mark.parametrize("error", [None, Interrupted()], ids=["cancelled", "base_exception"])
+async def test_followers_retry_when_leader_dies(error):
+    upstream = Upstream()
+    transport = CachingTransport(upstream)
+
+    leader = asyncio.ensure_future(get(transport))
+    await wait_for_leader()
+    followers = [asyncio.ensure_future(get(transport)) for _ in range(2)]
+    await wait_for_leader()
+    if error is None:
+        leader.cancel()
+    else:
+        upstream.error = error
+        # wakes up the leader only, retried request waits for the next release
+        upstream.release.set()
+        upstream.release.clear()
+    await wait_for_leader()
+
+    upstream.release.set()
+    responses = await asyncio.wait_for(asyncio.gather(*followers), 1)
+    # the first follower became the new leader, the other one is coalesced with it
+    assert [response.content for response in responses] == [b"response1", b"response1"]
+    assert upstream.calls == 2
+    with pytest.raises(asyncio.CancelledError if error is None else Interrupted):
+        await leader
+
+
+async def test_fresh_responses_are_served_from_cache():
+    upstream = Upstream({"cache-control": "max-age=60"})
+    upstream.release.set()
+    cache = HTTPCache()
+    transport = CachingTransport(upstream, cache)
+
+    assert (await get(transport)).content == b"response1"
+    assert (await get(transport)).content == b"response1"
+    assert (await get(transport, **{"cache-control": "no-cache"})).content == b"response2"
+    assert upstream.calls == 2 and cache.hits == 1
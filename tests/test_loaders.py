@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from fastapi_core.services.loaders import DataLoader
+
+pytestmark = pytest.mark.anyio
+
+
+class BatchLoad:
+    def __init__(self, delay: float = 0, error: Exception | None = None):
+        self.delay = delay
+        self.error = error
+        self.calls: list[list[int]] = []
+
+    async def __call__(self, keys: list[int]) -> dict[int, str]:
+        self.calls.append(keys)
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return {key: f"value{key}" for key in keys if key != 0}
+
+
+async def test_keys_are_batched_and_memoized():
+    batch_load = BatchLoad()
+    loader = DataLoader(batch_load, max_batch_size=2)
+
+    assert await loader.load_many([1, 2, 1, 3, 0]) == ["value1", "value2", "value1", "value3", None]
+    assert await loader.load(2) == "value2"
+    assert batch_load.calls == [[1, 2], [3, 0]]
+
+
+async def test_cancelled_caller_does_not_cancel_other_callers():
+    batch_load = BatchLoad(delay=0.01)
+    loader = DataLoader(batch_load)
+
+    cancelled = asyncio.ensure_future(loader.load(1))
+    waiting = asyncio.ensure_future(loader.load(1))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    assert await waiting == "value1"
+    assert await loader.load(1) == "value1"
+    assert batch_load.calls == [[1]]
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+
+
+async def test_cancelled_batch_is_not_memoized():
+    batch_load = BatchLoad(delay=1)
+    loader = DataLoader(batch_load)
+
+    waiting = asyncio.ensure_future(loader.load(1))
+    await asyncio.sleep(0.01)
+    for task in loader._tasks:
+        task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+
+    batch_load.delay = 0
+    assert await loader.load(1) == "value1"
+    assert batch_load.calls == [[1], [1]]
+
+
+async def test_failed_batch_is_raised_for_every_key_and_retried():
+    batch_load = BatchLoad(error=ValueError("db is down"))
+    loader = DataLoader(batch_load)
+
+    results = await asyncio.gather(loader.load(1), loader.load(2), return_exceptions=True)
+    assert [type(result) for result in results] == [ValueError, ValueError]
+
+    batch_load.error = None
+    assert await loader.load(1) == "value1"
@@ -0,0 +1,51 @@
+import httpx
+import pytest
+
+from fastapi_core.gateways.streaming import RelayedResponse
+
+pytestmark = pytest.mark.anyio
+
+
+async def body():
+    yield b"chunk1"
+    yield b"chunk2"
+
+
+def upstream(request: httpx.Request) -> httpx.Response:
+    headers = [("set-cookie", "a=1"), ("set-cookie", "b=2"), ("connection", "x-trace"), ("x-trace", "1")]
+    return httpx.Response(200, headers=headers, content=body())
+
+
+async def get_streamed() -> httpx.Response:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(upstream))
+    return await client.send(client.build_request("GET", "http://upstream/report"), stream=True)
+
+
+async def receive() -> dict:
+    return {"type": "http.disconnect"}
+
+
+async def test_body_and_end_to_end_headers_are_relayed():
+    response = await get_streamed()
+    messages = []
+
+    async def send(message: dict):
+        messages.append(message)
+
+    await RelayedResponse(response, chunk_size=4)({"type": "http"}, receive, send)
+
+    assert messages[0]["headers"] == [(b"set-cookie", b"a=1"), (b"set-cookie", b"b=2")]
+    assert b"".join(message.get("body", b"") for message in messages[1:]) == b"chunk1chunk2"
+    assert response.is_closed
+
+
+async def test_upstream_is_closed_if_body_is_never_sent():
+    response = await get_streamed()
+
+    async def send(message: dict):
+        raise OSError("client is gone")
+
+    # raised in starlette task group, wrapped into exception group
+    with pytest.raises(Exception):
+        await RelayedResponse(response, chunk_size=4)({"type": "http"}, receive, send)
+    assert response.is_closed
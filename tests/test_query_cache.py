@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from fastapi_core.database.cache import MISSING, QueryCache, finish_session, get_cache_key
+from fastapi_core.repositories.base import BaseRepository
+from tests.conftest import Item
+
+pytestmark = pytest.mark.anyio
+
+
+class ItemRepository(BaseRepository[Item]):
+    pass
+
+
+@pytest.fixture
+def copied(monkeypatch) -> list[tuple]:
+    """
+    Records passed to asyncpg ``copy_records_to_table``, SQLite has no COPY
+    """
+    copied = []
+
+    async def copy_records_to_table(table_name, records, columns, schema_name):
+        copied.extend(records)
+
+    driver_connection = SimpleNamespace(copy_records_to_table=copy_records_to_table)
+
+    async def get_raw_connection(self):
+        return SimpleNamespace(driver_connection=driver_connection)
+
+    monkeypatch.setattr(AsyncConnection, "get_raw_connection", get_raw_connection)
+    return copied
+
+
+async def test_commit_invalidates_tables_written_by_flush(session):
+    cache = QueryCache()
+    key, tables = get_cache_key("items", select(Item))
+    await cache.set(key, [], tables)
+
+    session.add(Item(name="item"))
+    await session.flush()
+    # reads of session with uncommitted writes bypass the cache
+    assert await cache.get(key, session) is MISSING
+    await session.commit()
+    await finish_session(session, committed=True)
+
+    assert await cache.get(key) is MISSING
+
+
+async def test_copy_many_invalidates_cached_reads_on_commit(session, copied):
+    cache = QueryCache()
+    key, tables = get_cache_key("items", select(Item))
+    await cache.set(key, [], tables)
+
+    assert await ItemRepository(session).copy_many(Item, ({"id": i, "name": "item"} for i in range(3))) == 3
+    assert copied == [(0, "item"), (1, "item"), (2, "item")]
+    await session.commit()
+    await finish_session(session, committed=True)
+
+    assert await cache.get(key) is MISSING
+
+
+async def test_rollback_drops_entries_cached_by_session(session):
+    cache = QueryCache()
+    key, tables = get_cache_key("items", select(Item))
+    await cache.set(key, [], tables, session)
+
+    await session.rollback()
+    await finish_session(session, committed=False)
+
+    assert await cache.get(key) is MISSING
@@ -0,0 +1,160 @@
+import asyncio
+
+import httpx
+import pytest
+
+from fastapi_core.gateways import resilience
+from fastapi_core.gateways.exceptions import CircuitOpenException
+from fastapi_core.gateways.resilience import (
+    CIRCUIT_BREAKER_CALL,
+    CircuitBreaker,
+    ResilientTransport,
+    RetryBudget,
+    get_circuit_breaker,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+def circuit_breakers(monkeypatch):
+    # breakers are shared by host within process
+    monkeypatch.setattr(resilience, "_circuit_breakers", {})
+
+
+def open_breaker(**kwargs) -> CircuitBreaker:
+    breaker = CircuitBreaker("upstream", min_calls=2, open_duration=0, half_open_calls=2, **kwargs)
+    for _ in range(2):
+        breaker.record(breaker.acquire(), failed=True)
+    assert breaker.state == "open"
+    return breaker
+
+
+def test_breaker_opens_at_failure_rate():
+    breaker = CircuitBreaker("upstream", failure_rate=0.5, min_calls=4, open_duration=30)
+    for failed in (False, True, False):
+        breaker.record(breaker.acquire(), failed=failed)
+    assert breaker.state == "closed"
+
+    breaker.record(breaker.acquire(), failed=True)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenException):
+        breaker.acquire()
+    assert breaker.rejected == 1
+
+
+def test_half_open_breaker_limits_trial_calls():
+    breaker = open_breaker()
+    first, second = breaker.acquire(), breaker.acquire()
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenException):
+        breaker.acquire()
+
+    # released slot could be taken again, released calls are not counted as results
+    breaker.release(first)
+    third = breaker.acquire()
+    breaker.record(second, failed=False)
+    breaker.record(third, failed=False)
+    assert breaker.state == "closed"
+
+
+def test_half_open_breaker_opens_on_trial_failure():
+    breaker = open_breaker()
+    trial = breaker.acquire()
+    breaker.record(trial, failed=True)
+    assert breaker.state == "open"
+
+
+def test_half_open_breaker_ignores_calls_started_before_opening():
+    breaker = CircuitBreaker("upstream", min_calls=2, open_duration=0, half_open_calls=1)
+    stale = breaker.acquire()
+    for _ in range(2):
+        breaker.record(breaker.acquire(), failed=True)
+
+    trial = breaker.acquire()
+    breaker.record(stale, failed=True)
+    assert breaker.state == "half_open"
+    breaker.record(trial, failed=False)
+    assert breaker.state == "closed"
+
+
+def test_record_failure_marks_given_call():
+    breaker = CircuitBreaker("upstream", min_calls=10)
+    first, second = breaker.acquire(), breaker.acquire()
+    breaker.record(first, failed=False)
+    breaker.record(second, failed=False)
+
+    breaker.record_failure(first)
+    breaker.record_failure(first)
+    assert breaker.stats()["failure_rate"] == 0.5
+
+
+def test_retry_budget_is_exhausted():
+    budget = RetryBudget(ratio=0.5, min_per_second=0, ttl=10)
+    for _ in range(4):
+        budget.deposit()
+    assert [budget.withdraw() for _ in range(3)] == [True, True, False]
+    assert budget.stats() == {"requests": 4, "retries": 2, "exhausted": 1}
+
+
+class Upstream(httpx.AsyncBaseTransport):
+    def __init__(self, *outcomes: int | BaseException):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        outcome = self.outcomes.pop(0) if self.outcomes else 200
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return httpx.Response(outcome)
+
+
+def get_transport(upstream: Upstream, budget: RetryBudget | None = None, **breaker) -> ResilientTransport:
+    return ResilientTransport(
+        upstream,
+        circuit_breaker={"min_calls": 100, **breaker},
+        retries=2,
+        backoff=0,
+        budget=budget or RetryBudget(),
+    )
+
+
+async def send(transport: ResilientTransport, host: str, method: str = "GET") -> httpx.Response:
+    return await transport.handle_async_request(httpx.Request(method, f"http://{host}/"))
+
+
+async def test_failed_idempotent_requests_are_retried():
+    upstream = Upstream(httpx.ConnectError("refused"), 503)
+    transport = get_transport(upstream)
+
+    response = await send(transport, "retried")
+    assert response.status_code == 200 and upstream.calls == 3
+    assert response.extensions[CIRCUIT_BREAKER_CALL] == 3
+    assert get_circuit_breaker("retried").stats()["calls"] == 3
+
+
+async def test_unsafe_requests_and_exhausted_budget_are_not_retried():
+    upstream = Upstream(503, 503)
+    assert (await send(get_transport(upstream), "post", "POST")).status_code == 503
+
+    budget = RetryBudget(ratio=0, min_per_second=0)
+    assert (await send(get_transport(upstream, budget), "budget")).status_code == 503
+    assert upstream.calls == 2 and budget.exhausted == 1
+
+
+@pytest.mark.parametrize("error", [RuntimeError("broken transport"), asyncio.CancelledError()])
+async def test_trial_slot_is_released_on_any_exception(error):
+    host = "half-open"
+    upstream = Upstream(httpx.ConnectError("refused"), error)
+    transport = get_transport(upstream, min_calls=1, open_duration=0, half_open_calls=1)
+    transport.retries = 0
+
+    with pytest.raises(httpx.ConnectError):
+        await send(transport, host)
+    with pytest.raises(type(error)):
+        await send(transport, host)
+
+    # the only trial slot is free again
+    assert (await send(transport, host)).status_code == 200
+    assert get_circuit_breaker(host).state == "closed"